@@ -12,5 +12,47 @@ Battery Scores Package for Processing Qualtrics CSV Files
 
 
 """
-__all__ = ['reader', 'subjectid', 'bapq', 'barratt', 'bisbas', 'ddq', 'dospert', 'ncog',
-           'neoffi', 'poms', 'pss', 'qids', 'snaith', 'shipley', 'stai', 'tci', 'teps']
\ No newline at end of file
+import importlib
+import sys
+import types
+
+
+"""
+The modules of this package are only imported when you first use them, so `from batteryscores import *` (and every
+worker process that imports the package) costs a few milliseconds instead of loading every battery and pandas up front.
+Each name below stands in for its module until you use something in it, e.g. tci.tci(df, nonresp) imports tci.py
+the first time it is called. Setting a variable on a stand-in sets it on the real module too.
+"""
+
+__all__ = ['reader', 'cache', 'engine', 'scoreall', 'validate', 'columndict', 'registry', 'profiling', 'subjectid', 'bapq', 'barratt', 'bisbas', 'ddq', 'dospert', 'ncog',
+           'neoffi', 'poms', 'pss', 'qids', 'snaith', 'shipley', 'stai', 'tci', 'teps']
+
+
+class LazyModule(types.ModuleType):
+    # A module of this package that is imported the first time one of its functions or variables is used
+
+    def __getattr__(self, attribute):
+        return getattr(self._resolve(), attribute)
+
+    def __setattr__(self, attribute, value):
+        # Setting a variable on the stand-in sets it on the real module, where its functions look for it
+        setattr(self._resolve(), attribute, value)
+
+    def __delattr__(self, attribute):
+        delattr(self._resolve(), attribute)
+
+    def __dir__(self):
+        return dir(self._resolve())
+
+    def __repr__(self):
+        return '<lazy module %r>' % self.__name__
+
+    def _resolve(self):
+        # importing the real module also puts it in place of this stand-in in the package. The name starts with an
+        # underscore so it can never hide a function of the module, like cache.load
+        return sys.modules.get(self.__name__) or importlib.import_module(self.__name__)
+
+
+for _name in __all__:
+    globals()[_name] = LazyModule(__name__ + '.' + _name)
+del _name
@@ -0,0 +1,18 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import sys
+
+from .cli import main
+
+
+# python -m batteryscores score your_data.csv column_dictionary.csv -o scores.csv (see cli.py)
+sys.exit(main())
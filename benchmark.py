@@ -0,0 +1,220 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import scoreall
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc, so peak memory is left out of the results
+    tracemalloc = None
+
+try:
+    wall_clock = time.perf_counter
+except AttributeError:
+    # Python 2 has no perf_counter, time.time is the closest clock it has
+    wall_clock = time.time
+
+
+"""
+1. Times every battery function on made-up participants, so you can see how long each battery takes and catch a change
+that makes one slower. From the folder that holds the batteryscores package:
+
+    python -m batteryscores.benchmark
+    python -m batteryscores.benchmark --rows 1000,100000 --batteries tci,ddq
+    python -m batteryscores.benchmark --save baseline.json
+    python -m batteryscores.benchmark --compare baseline.json
+
+or from python:
+
+    results = benchmark.run_benchmarks(rows=[1000, 100000], batteries=['tci'])
+    print(benchmark.format_results(results))
+
+2. For every battery and number of rows, synthetic_answers makes a dataframe with the battery's questions (its plan's
+items) filled in with random answers in the battery's range, the same way the reader gives them with compact=True
+(small whole numbers with blanks). blank_rate of the answers are left blank and pna_rate are the Prefer Not To Answer
+choice, which is one above the highest answer (like in the column dictionary). The answers are made with a fixed seed,
+so every run scores exactly the same participants.
+
+3. Each battery function is run repeat times and the fastest run is kept (seconds and rows per second). Peak memory is
+the most memory the battery allocated in one extra run, measured with tracemalloc (Python 3 only, None on Python 2).
+
+4. --save writes the results to a .json file, together with the python, numpy and pandas versions. --compare runs the
+same benchmarks again and flags every battery that became more than --tolerance (default 25%) slower or uses that much
+more memory than in the saved file. The command then exits with 1, so it can stop an automatic build. Baselines only
+mean something on the machine they were saved on.
+
+5. 1,000,000 rows of the biggest batteries (tci has 144 questions) need a few GB of memory. Leave the biggest size out
+with --rows on small machines.
+"""
+
+ROWS = [1000, 100000, 1000000]
+
+# Answer ranges of the batteries that don't have one in their plan
+RANGES = {'ddq': (1, 2)}
+
+
+def run_benchmarks(rows=None, batteries=None, blank_rate=0.05, pna_rate=0.02, repeat=3, seed=0):
+    # Returns one result per battery and number of rows, see 3. above
+    rows = rows or ROWS
+    batteries = batteries or scoreall.battery_names()
+    results = []
+    for name in batteries:
+        for count in rows:
+            input, nonresp = synthetic_answers(name, count, blank_rate, pna_rate, seed)
+            results.append(time_battery(name, input, nonresp, repeat))
+            del input
+            gc.collect()
+    return results
+
+
+def synthetic_answers(name, rows, blank_rate=0.05, pna_rate=0.02, seed=0):
+    # A dataframe of random answers to every question of the battery, and the nonresp it is scored with (see 2. above)
+    plan = scoreall.battery_plan(name)
+    low, high, nonresp_key = answer_range(name, plan)
+    pna = high + 1
+    random = np.random.RandomState(seed)
+
+    columns = {}
+    for item in plan['items']:
+        answers = random.randint(low, high + 1, size=rows).astype(np.int8)
+        roll = random.random_sample(rows)
+        if nonresp_key is not None:
+            answers[roll < pna_rate] = pna
+        columns[item] = pd.arrays.IntegerArray(answers, roll >= 1.0 - blank_rate)
+    input = pd.DataFrame(columns, index=pd.RangeIndex(1, rows + 1), columns=plan['items'])
+
+    nonresp = {} if nonresp_key is None else {nonresp_key: pna}
+    return input, nonresp
+
+
+def answer_range(name, plan):
+    # The lowest and highest Qualtrics answer of the battery, and its key in nonresp (None if it has no PNA choice)
+    if name in RANGES:
+        low, high = RANGES[name]
+        return low, high, None
+    if 'spec' in plan:
+        spec = plan['spec']
+        low, high = spec['range']
+        if spec.get('recode'):
+            qualtrics_values = [qualtrics_value for qualtrics_value, scored_value in spec['recode']]
+            low, high = min(qualtrics_values), max(qualtrics_values)
+        return int(low), int(high), spec['nonresp']
+    low, high = plan['validation']['range']
+    return int(low), int(high), plan['validation']['nonresp']
+
+
+def time_battery(name, input, nonresp, repeat=3):
+    function = scoreall.battery_function(name)
+    times = []
+    for run in range(repeat):
+        gc.collect()
+        start = wall_clock()
+        function(input, nonresp)
+        times.append(wall_clock() - start)
+    seconds = min(times)
+    return {'battery': name, 'rows': len(input), 'seconds': seconds,
+            'rows_per_second': len(input) / seconds if seconds else None,
+            'peak_bytes': peak_memory(function, input, nonresp)}
+
+
+def peak_memory(function, input, nonresp):
+    # The most memory the battery function allocates while it runs, on top of what was already there
+    if tracemalloc is None:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function(input, nonresp)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def save_baseline(results, path):
+    with open(path, 'w') as outfile:
+        json.dump({'environment': environment(), 'results': results}, outfile, indent=1, sort_keys=True)
+
+
+def load_baseline(path):
+    with open(path) as infile:
+        return json.load(infile)
+
+
+def compare(results, baseline, tolerance=0.25):
+    # Every result that is more than tolerance slower, or uses more than tolerance more memory, than the same battery and
+    # number of rows in the baseline. Returns (battery, rows, what, baseline value, new value) for each of them.
+    saved = dict(((result['battery'], result['rows']), result) for result in baseline['results'])
+    regressions = []
+    for result in results:
+        before = saved.get((result['battery'], result['rows']))
+        if before is None:
+            continue
+        for what in ['seconds', 'peak_bytes']:
+            if before.get(what) and result.get(what) and result[what] > before[what] * (1.0 + tolerance):
+                regressions.append((result['battery'], result['rows'], what, before[what], result[what]))
+    return regressions
+
+
+def environment():
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'machine': platform.machine(), 'processor': platform.processor()}
+
+
+def format_results(results):
+    lines = ['%-10s %10s %12s %14s %12s' % ('battery', 'rows', 'seconds', 'rows/second', 'peak MB')]
+    for result in results:
+        peak = '-' if result['peak_bytes'] is None else '%.1f' % (result['peak_bytes'] / 1e6)
+        speed = '-' if result['rows_per_second'] is None else '%.0f' % result['rows_per_second']
+        lines.append('%-10s %10d %12.4f %14s %12s' % (result['battery'], result['rows'], result['seconds'], speed, peak))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='batteryscores.benchmark', description='Time every battery function.')
+    parser.add_argument('--rows', default=','.join(map(str, ROWS)), help='comma separated numbers of participants')
+    parser.add_argument('--batteries', default=None, help='comma separated batteries (default: all)')
+    parser.add_argument('--blank-rate', type=float, default=0.05)
+    parser.add_argument('--pna-rate', type=float, default=0.02)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--save', default=None, help='write the results to this .json baseline')
+    parser.add_argument('--compare', default=None, help='flag batteries that are slower than in this .json baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    batteries = args.batteries.split(',') if args.batteries else None
+    results = run_benchmarks([int(count) for count in args.rows.split(',')], batteries, args.blank_rate,
+                             args.pna_rate, args.repeat, args.seed)
+    print(format_results(results))
+    if args.save:
+        save_baseline(results, args.save)
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare), args.tolerance)
+        for name, rows, what, before, after in regressions:
+            print('SLOWER: %s with %d rows, %s went from %.4g to %.4g' % (name, rows, what, before, after))
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
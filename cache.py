@@ -0,0 +1,123 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+
+"""
+1. The reader uses these functions when you give it a cache folder (cache_dir). The first time a datafile is read, the
+renamed and compacted dataframe is saved in that folder as one numpy file per column plus a small manifest.json.
+
+2. The saved copy is found again with a fingerprint of the bytes in your datafile AND your column dictionary, so if you
+change either one (even by a single answer), the datafile is read again from scratch and saved under a new fingerprint.
+
+3. Loading a saved copy does not parse any csv. The numpy files are memory-mapped, so they are only read from disk
+when a function actually uses those columns.
+
+4. It is always safe to delete the cache folder.
+"""
+
+# Bump this whenever the layout of the saved files changes so that old copies are never read by mistake
+CACHE_VERSION = 1
+
+
+def cache_key(datafilepath, columndictionary):
+    # Fingerprint of the datafile and the column dictionary, read 1 MB at a time so big files never sit in memory
+    fingerprint = hashlib.sha1(('batteryscores cache v%d' % CACHE_VERSION).encode('ascii'))
+    for path in [datafilepath, columndictionary]:
+        with open(path, 'rb') as infile:
+            block = infile.read(1 << 20)
+            while block:
+                fingerprint.update(block)
+                block = infile.read(1 << 20)
+        # keeps the two files apart so moving bytes from one file to the other changes the fingerprint
+        fingerprint.update(b'\0')
+    return fingerprint.hexdigest()
+
+
+def load(cache_dir, key):
+    # Returns the saved dataframe, or None if this fingerprint has not been saved yet
+    folder = os.path.join(cache_dir, key)
+    manifest_path = os.path.join(folder, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as infile:
+        manifest = json.load(infile)
+    if manifest.get('version') != CACHE_VERSION:
+        return None
+
+    index = np.load(os.path.join(folder, 'index.npy'))
+    columns = {}
+    for position, column in enumerate(manifest['columns']):
+        values = np.load(os.path.join(folder, column['file']), mmap_mode='r')
+        if column['kind'] == 'integer':
+            mask = np.load(os.path.join(folder, column['mask']), mmap_mode='r')
+            columns[position] = pd.Series(pd.arrays.IntegerArray(values, mask), index=index)
+        elif column['kind'] == 'text':
+            mask = np.load(os.path.join(folder, column['mask']), mmap_mode='r')
+            columns[position] = pd.Series(values, index=index).where(~mask)
+        else:
+            columns[position] = pd.Series(values, index=index)
+
+    df = pd.DataFrame(columns, index=index, columns=range(len(manifest['columns'])))
+    df.columns = pd.Index([column['name'] for column in manifest['columns']], name=manifest['columns_name'])
+    return df
+
+
+def save(cache_dir, key, df):
+    # Everything is written to a temporary folder first and renamed at the end,
+    # so a run that gets killed half way never leaves a broken copy behind
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    folder = tempfile.mkdtemp(prefix='.' + key, dir=cache_dir)
+
+    try:
+        np.save(os.path.join(folder, 'index.npy'), np.asarray(df.index))
+        manifest = {'version': CACHE_VERSION, 'rows': len(df), 'columns_name': df.columns.name, 'columns': []}
+        for position in range(df.shape[1]):
+            answers = df.iloc[:, position]
+            column = {'name': df.columns[position], 'file': 'column%04d.npy' % position}
+            missing = np.asarray(answers.isnull())
+
+            if str(answers.dtype) in ('Int8', 'Int16', 'Int32', 'Int64'):
+                column['kind'] = 'integer'
+                values = np.asarray(answers.fillna(0).astype(str(answers.dtype).lower()))
+            elif answers.dtype.kind in 'iuf':
+                column['kind'] = 'number'
+                values = np.asarray(answers)
+            else:
+                column['kind'] = 'text'
+                values = np.array([u'' if gone else u'%s' % value for value, gone in zip(answers, missing)])
+
+            np.save(os.path.join(folder, column['file']), values)
+            if column['kind'] != 'number':
+                column['mask'] = 'mask%04d.npy' % position
+                np.save(os.path.join(folder, column['mask']), missing)
+            manifest['columns'].append(column)
+
+        with open(os.path.join(folder, 'manifest.json'), 'w') as outfile:
+            json.dump(manifest, outfile, indent=1)
+
+        final = os.path.join(cache_dir, key)
+        if os.path.exists(final):
+            shutil.rmtree(folder)
+        else:
+            os.rename(folder, final)
+    except Exception:
+        shutil.rmtree(folder, ignore_errors=True)
+        raise
@@ -0,0 +1,253 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import argparse
+import os
+import sys
+
+from . import profiling
+
+
+"""
+1. The command line version of the skeleton script, for scheduled batch jobs. Run it with the folder that holds the
+batteryscores package as your working directory (or on your PYTHONPATH):
+
+    python -m batteryscores score your_data.csv column_dictionary.csv -o scores.csv
+    python -m batteryscores score your_data.csv column_dictionary.csv --batteries neoffi,tci --jobs 4 -o scores.csv
+    python -m batteryscores score big_data.csv column_dictionary.csv --chunk-size 50000 --output-format jsonl > scores.jsonl
+    python -m batteryscores batteries
+
+2. Options of score:
+
+    -o, --output        file to write the scores to (default: the terminal, so you can pipe it)
+    --batteries         comma separated batteries to score, e.g. neoffi,tci. Only these are computed (default: all)
+    --jobs              how many batteries (or blocks of rows, see --pool) are scored at the same time (default: 1)
+    --pool              thread, process, or rows to split the participants over processes (see scoreall.py)
+    --chunk-size        read and score the datafile this many rows at a time (see chunked_reader in reader.py)
+    --output-format     csv, tsv or jsonl (one JSON object per participant per line)
+    --compact           read only the columns in your column dictionary, as small whole numbers (see reader.py)
+    --cache-dir         folder to save the read dataframe in for the next run (see cache.py), not with --chunk-size
+    --invalid           what to do with answers out of range: abort (default), null, drop or quarantine (see validate.py)
+    --rejects           file for the participants put aside by --invalid quarantine
+    --scales            .json/.toml scale specs, or folders of them, to register first (see registry.py). Folders in
+                        the BATTERYSCORES_SCALES environment variable are always registered
+    --use-dictionary    score the batteries the way your column dictionary describes them (see columndict.py)
+    --profile           write a report of where the run spent its time to this file, .json or a table (see profiling.py)
+    --profile-memory    also measure the memory every stage allocates in the --profile report (slows the run down)
+
+3. Nothing but the scores is written to the output. Messages go to stderr, and the exit code tells the scheduler what
+happened (see the EXIT_ numbers below). A battery you ask for with --batteries whose headers are missing from your
+datafile stops the job; when you score all batteries, it is left out with a warning. With --chunk-size a broken row
+in your datafile is only found when its chunk is read, so the scores of the chunks before it are already written.
+"""
+
+EXIT_OK = 0
+EXIT_USAGE = 2      # wrong options or unknown battery names (the same code argparse uses)
+EXIT_INPUT = 3      # the datafile, column dictionary or a scale spec is missing or can't be read
+EXIT_INVALID = 4    # answers out of range with --invalid abort
+EXIT_MISSING = 5    # the headers of a battery you asked for are not in the datafile
+EXIT_OUTPUT = 6     # the output or rejects file can't be written
+
+OUTPUT_FORMATS = ['csv', 'tsv', 'jsonl']
+INVALID_POLICIES = ['abort', 'null', 'drop', 'quarantine']
+
+
+def main(argv=None):
+    # Returns the exit code, so `python -m batteryscores` can sys.exit with it
+    args = build_parser().parse_args(argv)
+    if not getattr(args, 'profile', None):
+        return args.command(args)
+    profiling.enable(args.profile_memory)
+    try:
+        return args.command(args)
+    finally:
+        profiling.disable()
+        try:
+            profiling.write_report(args.profile)
+        except IOError as error:
+            warn("We could not write the profile report: %s" % error)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='batteryscores', description='Score self-report batteries in Qualtrics exports.')
+    commands = parser.add_subparsers(dest='command_name')
+    commands.required = True
+
+    score = commands.add_parser('score', help='score a datafile')
+    score.add_argument('datafile')
+    score.add_argument('columndictionary')
+    score.add_argument('-o', '--output', default='-')
+    score.add_argument('--batteries', default=None)
+    score.add_argument('--jobs', type=positive_number, default=1)
+    score.add_argument('--pool', choices=['thread', 'process', 'rows'], default='thread')
+    score.add_argument('--chunk-size', type=positive_number, default=None)
+    score.add_argument('--output-format', choices=OUTPUT_FORMATS, default='csv')
+    score.add_argument('--compact', action='store_true')
+    score.add_argument('--cache-dir', default=None)
+    score.add_argument('--invalid', choices=INVALID_POLICIES, default='abort')
+    score.add_argument('--rejects', default=None)
+    score.add_argument('--scales', action='append', default=[])
+    score.add_argument('--use-dictionary', action='store_true')
+    score.add_argument('--profile', default=None)
+    score.add_argument('--profile-memory', action='store_true')
+    score.set_defaults(command=score_command)
+
+    batteries = commands.add_parser('batteries', help='list the batteries that can be scored')
+    batteries.add_argument('--scales', action='append', default=[])
+    batteries.set_defaults(command=batteries_command)
+    return parser
+
+
+def positive_number(text):
+    number = int(text)
+    if number < 1:
+        raise argparse.ArgumentTypeError('%s is not a positive number' % text)
+    return number
+
+
+def batteries_command(args):
+    from . import scoreall
+    code = register_scales(args.scales)
+    if code:
+        return code
+    for name in scoreall.battery_names():
+        print(name)
+    return EXIT_OK
+
+
+def score_command(args):
+    # pandas and the batteries are imported here, so `batteries` and --help start quickly
+    from . import columndict
+    from . import reader
+    from . import scoreall
+    from . import validate
+
+    code = register_scales(args.scales)
+    if code:
+        return code
+    for path in [args.datafile, args.columndictionary]:
+        if not os.path.exists(path):
+            return fail(EXIT_INPUT, "%s does not exist. Please type in a valid pathname." % path)
+    if args.invalid == 'quarantine' and not args.rejects:
+        return fail(EXIT_USAGE, "--invalid quarantine needs a --rejects file for the participants that are put aside.")
+    if args.cache_dir and args.chunk_size:
+        return fail(EXIT_USAGE, "--cache-dir can't be used with --chunk-size, which never holds the whole dataframe to "
+                                "save.")
+
+    known = scoreall.battery_names()
+    asked = args.batteries is not None
+    batteries = [name.strip() for name in args.batteries.split(',') if name.strip()] if asked else known
+    unknown = [name for name in batteries if name not in known]
+    if unknown:
+        return fail(EXIT_USAGE, "We don't have a battery called %s. Please choose from: %s"
+                    % (', '.join(unknown), ', '.join(known)))
+
+    try:
+        plans = columndict.compile_plans(args.columndictionary) if args.use_dictionary else None
+        if args.chunk_size:
+            chunks, question_dict, nonresp = reader.chunked_reader(args.datafile, args.columndictionary,
+                                                                   args.chunk_size, args.compact)
+        else:
+            df, raw_data_frame, question_dict, nonresp = reader.reader(args.datafile, args.columndictionary,
+                                                                       args.compact, args.cache_dir)
+            chunks = [df]
+    except (IOError, ValueError) as error:
+        return fail(EXIT_INPUT, "We could not read your datafile or column dictionary: %s" % error)
+
+    plans = scoreall.battery_plans(batteries, plans)
+    output, rejects = None, None
+    # The battery functions print their messages, which must never end up between the scores
+    stdout, sys.stdout = sys.stdout, sys.stderr
+    try:
+        try:
+            output = stdout if args.output == '-' else open(args.output, 'w')
+            if args.rejects:
+                rejects = open(args.rejects, 'w')
+        except IOError as error:
+            return fail(EXIT_OUTPUT, "We could not open the output file: %s" % error)
+
+        first = True
+        chunks = iter(chunks)
+        while True:
+            # With --chunk-size the datafile is only read here, a chunk at a time, so a broken row is found here too
+            try:
+                chunk = next(chunks, None)
+            except (IOError, ValueError) as error:
+                return fail(EXIT_INPUT, "We could not read your datafile: %s" % error)
+            if chunk is None:
+                break
+            missing = [name for name in batteries if not all(item in chunk.columns for item in plans[name]['items'])]
+            if missing and asked:
+                return fail(EXIT_MISSING, "We could not find the headers of %s in your datafile. Please check your "
+                                          "column dictionary." % ', '.join(missing))
+            if missing and first:
+                warn("Left out because their headers are not in your datafile: %s" % ', '.join(missing))
+            scored = [name for name in batteries if name not in missing]
+
+            try:
+                if args.invalid == 'quarantine':
+                    chunk, rejected = validate.quarantine(chunk, nonresp, scored, plans)
+                    write_frame(rejected, rejects, args.output_format, first)
+                else:
+                    chunk, report = validate.validate(chunk, nonresp, scored, args.invalid, plans)
+                    if len(report):
+                        warn("%d answers out of range were handled with --invalid %s" % (len(report), args.invalid))
+                if args.pool == 'rows':
+                    result = scoreall.score_sharded(chunk, nonresp, scored, max(args.jobs, 2), plans=plans)
+                else:
+                    result = scoreall.score_all(chunk, nonresp, scored, args.jobs, args.pool, plans=plans)
+            except SystemExit as stop:
+                return fail(EXIT_INVALID, stop.code)
+
+            write_frame(result, output, args.output_format, first)
+            first = False
+        return EXIT_OK
+    finally:
+        sys.stdout = stdout
+        for handle in [output, rejects]:
+            if handle is not None and handle is not stdout:
+                handle.close()
+
+
+def register_scales(paths):
+    # The scales in --scales and in the folders of the BATTERYSCORES_SCALES environment variable
+    from . import registry
+    paths = [path for path in os.environ.get('BATTERYSCORES_SCALES', '').split(os.pathsep) if path] + list(paths)
+    try:
+        for path in paths:
+            if os.path.isdir(path):
+                registry.register_folder(path)
+            else:
+                registry.register_file(path)
+    except (IOError, ValueError, ImportError) as error:
+        return fail(EXIT_INPUT, "We could not register the scale in %s: %s" % (path, error))
+    return EXIT_OK
+
+
+def write_frame(frame, output, output_format, header):
+    # Writes one chunk of scores. The row index is written for csv and tsv like the skeleton script does, and left out of
+    # jsonl where SUBJ_ID identifies the participant.
+    with profiling.stage('cli.write', len(frame)):
+        if output_format == 'jsonl':
+            if len(frame):
+                output.write(frame.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+        else:
+            frame.to_csv(output, sep='\t' if output_format == 'tsv' else ',', header=header)
+        output.flush()
+
+
+def warn(message):
+    sys.stderr.write('batteryscores: %s\n' % message)
+
+
+def fail(code, message):
+    warn(message)
+    return code
@@ -0,0 +1,235 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import copy
+import functools
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from . import registry
+from . import scoreall
+from . import shipley
+
+
+"""
+1. Every battery's questions, subscales, reverse scored questions and ranges are written in the SPEC at the top of its
+.py file. compile_plans builds the scoring plans from your column dictionary instead, so a study that numbers or groups
+its questions differently can be scored without changing the package:
+
+    plans = columndict.compile_plans(question_dict)
+    result = scoreall.score_all(df, nonresp, plans=plans)
+    df, report = validate.validate(df, nonresp, plans=plans)
+
+question_dict is the column dictionary the reader gives back (or the pathname of the .csv). The plans are kept in
+memory by a hash of the dictionary's contents, so calling compile_plans again with the same dictionary costs nothing.
+
+2. These columns of the dictionary are used, for every battery that has questions in it:
+
+    SUBSCALE_NAME, SUBSCALE_NAME_2   the subscale (and second-order subscale, e.g. barratt) each question belongs to.
+                                     The names are matched with the subscales of the battery's SPEC, ignoring upper
+                                     case, spaces and punctuation ('harm-avoidance' is 'harmavoidance'). A SPEC
+                                     subscale with a 'label' key is matched with that name instead, e.g. 'prag language'
+                                     for bapq's 'pragmatic'. Questions named 'filler' are checked but never scored.
+                                     If none of a battery's questions have a subscale name, the SPEC's subscales are used.
+    Reverse_Scored                   optional: 1 for questions that are reverse scored, 0 for questions that are not.
+                                     Questions left blank here (or without the column) are reverse scored when the SPEC
+                                     reverse scores them.
+    Reverse_Coded_DuringCollection   1 (or yes/true) when Qualtrics already reversed the answers of the question, so
+                                     the package must not reverse them again (and reverses the forward ones instead).
+                                     Words like snaith's 'Reverse' are notes and change nothing.
+    Your_Scale_Min, Your_Scale_Max   the answer choices of the question. A Your_Scale_Max that is the Prefer Not To
+                                     Answer choice is left out. A range inside the battery's own range changes nothing;
+                                     a wider one (e.g. a 1-7 version of a 1-5 scale) replaces it, with reverse scored
+                                     answers subtracted from min + max.
+    PreferNotToAnswerSelection       the Prefer Not To Answer choice of every single question, instead of one per battery
+    Correct Answer                   the answer key of shipley
+
+3. Questions that are in the dictionary but not in the SPEC (custom item numbering, e.g. a tci_141) are scored in the
+subscale the dictionary puts them in. Subscale names the battery doesn't know stop compile_plans with a ValueError, unless
+every question with that name is a check question (tci's 'validitycheck'). So do questions that are not in the SPEC of a
+battery whose questions have no subscale names, since there is no subscale to score them in.
+
+4. qids and ddq are always scored as written in their .py files. A battery with no questions in the dictionary keeps the
+plan of its .py file. Scales registered with registry.py are compiled from the dictionary too (they are not kept in
+memory, since they can be registered again with a different spec).
+"""
+
+# The compiled plans of every dictionary seen so far, by the hash of its contents (see 1. above)
+COMPILED = {}
+
+# Answers in Reverse_Coded_DuringCollection and Reverse_Scored that mean yes
+YES = ['1', '1.0', 'yes', 'true', 'y']
+
+
+def compile_plans(question_dict):
+    # Returns {battery name: plan} for every battery in scoreall.BATTERIES, ready for score_all(plans=...)
+    if isinstance(question_dict, str):
+        question_dict = pd.read_csv(question_dict)
+    key = dictionary_hash(question_dict)
+    if key not in COMPILED:
+        plans = {}
+        for name, takes_nonresp in scoreall.BATTERIES:
+            module = scoreall.battery_module(name)
+            if hasattr(module, 'SPEC'):
+                plans[name] = compile_battery(module.SPEC, question_dict)
+            elif name == 'shipley':
+                plans[name] = shipley_plan(question_dict)
+            else:
+                plans[name] = module.PLAN
+        COMPILED[key] = plans
+    if not registry.SCALES:
+        return COMPILED[key]
+    plans = dict(COMPILED[key])
+    for name in registry.names():
+        plans[name] = compile_battery(registry.SCALES[name]['spec'], question_dict)
+    return plans
+
+
+def dictionary_hash(question_dict):
+    # The same dictionary always gives the same hash, wherever it was read from
+    return hashlib.sha1(question_dict.to_csv(index=False).encode('utf-8')).hexdigest()
+
+
+def compile_battery(spec, question_dict):
+    rows = battery_rows(spec, question_dict)
+    if not len(rows):
+        return engine.compile_spec(spec)
+    spec = copy.deepcopy(spec)
+
+    # Which questions are reverse scored: the Reverse_Scored column where it is filled in, otherwise the SPEC
+    spec_reverse = set(item for subscale in spec['subscales'] for item in subscale.get('reverse', []))
+    reverse = {}
+    for question, reverse_scored, collected in zip(rows['QUESTION_NAME'], column(rows, 'Reverse_Scored'),
+                                                   column(rows, 'Reverse_Coded_DuringCollection')):
+        reversed_question = is_yes(reverse_scored) if pd.notnull(reverse_scored) else question in spec_reverse
+        reverse[question] = reversed_question != is_yes(collected)
+
+    labels = [label for label in list(column(rows, 'SUBSCALE_NAME')) + list(column(rows, 'SUBSCALE_NAME_2'))
+              if pd.notnull(label)]
+    if labels:
+        spec['subscales'], fillers = dictionary_subscales(spec, rows)
+        if fillers or 'fillers' in spec:
+            spec['fillers'] = fillers
+    else:
+        # Without subscale names there is no telling where questions that are not in the SPEC belong
+        known = set(engine.compile_spec(spec)['items'])
+        unmapped = [question for question in rows['QUESTION_NAME'] if question not in known]
+        if unmapped:
+            raise ValueError("Your column dictionary has %s questions that are not in the %s script: %s. Please put "
+                             "them in a subscale with the SUBSCALE_NAME column." % (spec['name'], spec['script'],
+                                                                                   ', '.join(map(str, unmapped))))
+    for subscale in spec['subscales']:
+        items = subscale.get('forward', []) + subscale.get('reverse', [])
+        subscale['forward'] = [item for item in items if not reverse.get(item, item in spec_reverse)]
+        subscale['reverse'] = [item for item in items if reverse.get(item, item in spec_reverse)]
+
+    dictionary_range(spec, rows)
+    plan = engine.compile_spec(spec)
+
+    # One Prefer Not To Answer choice per question, NaN for questions without one
+    pna = dict(zip(rows['QUESTION_NAME'], pd.to_numeric(rows['PreferNotToAnswerSelection'], errors='coerce')))
+    if any(pd.notnull(value) for value in pna.values()):
+        plan['pna'] = np.array([pna.get(item, np.nan) for item in plan['items']], dtype=np.float64)
+    return plan
+
+
+def battery_rows(spec, question_dict):
+    # The rows of the dictionary that belong to the battery: the questions starting with the same name as the SPEC's
+    prefixes = set(item.split('_')[0] for item in engine.compile_spec(spec)['items'])
+    names = question_dict['QUESTION_NAME'].astype(str)
+    return question_dict[names.str.split('_').str[0].isin(prefixes) & question_dict['COLUMN_NAME'].notnull()]
+
+
+def dictionary_subscales(spec, rows):
+    # The SPEC's subscales with the questions the dictionary puts in them, and the filler questions
+    names = dict((normalized(subscale.get('label', subscale['name'])), position)
+                 for position, subscale in enumerate(spec['subscales']))
+    checked = set(item for item, right_answer in spec.get('checks', {}).get('answers', []))
+    members = [[] for subscale in spec['subscales']]
+    fillers, unknown = [], {}
+    for question, first, second in zip(rows['QUESTION_NAME'], column(rows, 'SUBSCALE_NAME'),
+                                       column(rows, 'SUBSCALE_NAME_2')):
+        for label in [first, second]:
+            if pd.isnull(label):
+                continue
+            if normalized(label) in names:
+                members[names[normalized(label)]].append(question)
+            elif normalized(label) in ['filler', 'fillers']:
+                fillers.append(question)
+            elif question not in checked:
+                unknown.setdefault(label, []).append(question)
+    if unknown:
+        raise ValueError("We don't know the %s subscales %s in your column dictionary. Please use the subscale names "
+                         "in the %s script." % (spec['name'], ', '.join(sorted(map(str, unknown))), spec['script']))
+
+    subscales = []
+    for subscale, items in zip(spec['subscales'], members):
+        if not items:
+            raise ValueError("Your column dictionary has no questions for the %s subscale %s. Please check its "
+                             "SUBSCALE_NAME column." % (spec['name'], subscale.get('label', subscale['name'])))
+        subscale = dict(subscale)
+        subscale['forward'], subscale['reverse'] = items, []
+        subscales.append(subscale)
+    return subscales, fillers
+
+
+def dictionary_range(spec, rows):
+    # Widens the SPEC's range to the answer choices in the dictionary, see 2. above
+    low = pd.to_numeric(column(rows, 'Your_Scale_Min'), errors='coerce')
+    high = pd.to_numeric(column(rows, 'Your_Scale_Max'), errors='coerce')
+    if low.isnull().all() or high.isnull().all():
+        return
+    pna = pd.to_numeric(rows['PreferNotToAnswerSelection'], errors='coerce')
+    low, high = low.min(), high.where(high != pna, high - 1).max()
+
+    if spec.get('recode'):
+        qualtrics_values = [qualtrics_value for qualtrics_value, scored_value in spec['recode']]
+        spec_low, spec_high = min(qualtrics_values), max(qualtrics_values)
+    else:
+        spec_low, spec_high = spec['range']
+    if low >= spec_low and high <= spec_high:
+        return
+    if spec.get('recode'):
+        raise ValueError("Your column dictionary has %s answers from %d-%d, but the %s script only knows how to recode "
+                         "%d-%d." % (spec['name'], low, high, spec['script'], spec_low, spec_high))
+    spec['range'] = (int(low), int(high))
+    spec['reverse'] = int(low) + int(high)
+
+
+def shipley_plan(question_dict):
+    # Shipley scored with the Correct Answer column, when the dictionary has an answer for every question
+    if 'Correct Answer' not in question_dict.columns:
+        return shipley.PLAN
+    answers = dict(zip(question_dict['QUESTION_NAME'], question_dict['Correct Answer']))
+    if not all(pd.notnull(answers.get(key)) for key in shipley.SHIPLEY_KEYS):
+        return shipley.PLAN
+    return engine.custom_plan(shipley.SHIPLEY_KEYS,
+                              functools.partial(shipley.score_items, answer_key=shipley.answer_key(question_dict)),
+                              range=(1, 4), name='shipley')
+
+
+def column(rows, name):
+    # A column of the dictionary, or blanks if your dictionary doesn't have it
+    if name in rows.columns:
+        return rows[name]
+    return pd.Series([np.nan] * len(rows), index=rows.index)
+
+
+def normalized(label):
+    return re.sub('[^a-z0-9]', '', str(label).lower())
+
+
+def is_yes(answer):
+    return pd.notnull(answer) and str(answer).strip().lower() in YES
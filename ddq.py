@@ -9,13 +9,34 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
+import numpy as np
 import pandas as pd
-from math import log
-import sys
+
+from . import engine
 
 # input = the data you are using with with the keys listed below as headers
 
 
+# ------------------------------------------------------------------------------
+# These keys are ordered by indifference k in ascending order.
+smalldr_keys = ['DDQ_13', 'DDQ_20', 'DDQ_26', 'DDQ_22', 'DDQ_3', 'DDQ_18', 'DDQ_5', 'DDQ_7', 'DDQ_11']
+mediumdr_keys = ['DDQ_1', 'DDQ_6', 'DDQ_24', 'DDQ_16', 'DDQ_10', 'DDQ_21', 'DDQ_14', 'DDQ_8', 'DDQ_27']
+largedr_keys = ['DDQ_9', 'DDQ_17', 'DDQ_12', 'DDQ_15', 'DDQ_2', 'DDQ_25', 'DDQ_23', 'DDQ_19', 'DDQ_4']
+
+DDQ_KEYS = smalldr_keys + mediumdr_keys + largedr_keys
+
+# (V, A, D) of every question: the immediate reward, the delayed reward, and the days delayed (Kirby et al. 1999)
+CHOICE_VALUES = {
+    'DDQ_1': (54, 55, 117), 'DDQ_2': (55, 75, 61), 'DDQ_3': (19, 25, 53), 'DDQ_4': (31, 85, 7),
+    'DDQ_5': (14, 25, 19), 'DDQ_6': (47, 50, 160), 'DDQ_7': (15, 35, 13), 'DDQ_8': (25, 60, 14),
+    'DDQ_9': (78, 80, 192), 'DDQ_10': (40, 55, 62), 'DDQ_11': (11, 30, 7), 'DDQ_12': (67, 75, 119),
+    'DDQ_13': (34, 35, 186), 'DDQ_14': (27, 50, 21), 'DDQ_15': (69, 85, 91), 'DDQ_16': (49, 60, 89),
+    'DDQ_17': (80, 85, 157), 'DDQ_18': (24, 35, 29), 'DDQ_19': (33, 80, 14), 'DDQ_20': (28, 30, 179),
+    'DDQ_21': (34, 50, 30), 'DDQ_22': (25, 30, 80), 'DDQ_23': (41, 75, 20), 'DDQ_24': (54, 60, 111),
+    'DDQ_25': (54, 80, 30), 'DDQ_26': (22, 25, 136), 'DDQ_27': (20, 55, 7),
+}
+
+
 def ddq(input):
     # DELAY DISCOUNTING QUESTIONNAIRE
 
@@ -117,166 +138,233 @@ def ddq(input):
     This is just an estimate (Kirby, Petry, & Bickel 1999).
 
 
-    11. TOTAL K-VALUE PENDING. PLAN IS TO TAKE THE GEOMETRIC MEAN OF THE SMALL, MEDIUM, and LARGE REWARD K-BINS.
-
-    """
-    try:
-        # ------------------------------------------------------------------------------
-        # These keys are ordered by indifference k in ascending order.
-        smalldr_keys = ['DDQ_13', 'DDQ_20', 'DDQ_26', 'DDQ_22', 'DDQ_3', 'DDQ_18', 'DDQ_5', 'DDQ_7', 'DDQ_11']
-        mediumdr_keys = ['DDQ_1', 'DDQ_6', 'DDQ_24', 'DDQ_16', 'DDQ_10', 'DDQ_21', 'DDQ_14', 'DDQ_8', 'DDQ_27']
-        largedr_keys = ['DDQ_9', 'DDQ_17', 'DDQ_12', 'DDQ_15', 'DDQ_2', 'DDQ_25', 'DDQ_23', 'DDQ_19', 'DDQ_4']
-
+    11. TOTAL K-VALUE. THE GEOMETRIC MEAN OF THE SMALL, MEDIUM, and LARGE REWARD K-BINS.
 
+    12. A k-value that can't be binned because questions were skipped is left blank (NaN) together with its log10, and
+    so are the total k-value and total discount rate. DDQ_Discarded is 1 for those participants.
 
-        # these k bin assignments are the geometric mean of two values with two endpoints being 0.00016 and 0.2500.
-        kbins = [0.00016, 0.00025, 0.00063, 0.00158, 0.00387, 0.0098, 0.02561, 0.06403, 0.15811, 0.2500]
+    13. For each reward magnitude, Consistency is the Kirby consistency: the highest percentage of answered questions
+    that agree with switching from the delayed to the immediate reward at one point, and Switch_k-value is the k-bin of
+    that switch point (the geometric mean of the k-bins if several switch points agree equally well).
+    There are only 3^9 ways to answer the 9 questions of a magnitude (immediate, delayed or skipped), so all of these
+    values are worked out once for every possible way when the package is imported and simply looked up.
 
-        # -----------------------------------------------------------------------------------------------------------------#
+    """
+    try:
         # Converts keys to numeric values
-        smalldr = input[smalldr_keys].apply(pd.to_numeric, args=('raise',))
-
-        # Counts the number of delayed reward choices and immediate choices among the small delayed reward keys
-        smalldr_delayedreward = smalldr[smalldr[smalldr_keys] == 2].count(axis=1)
-        smalldr_didnotdelay = smalldr[smalldr[smalldr_keys] == 1].count(axis=1)
-
-        # Totals the number of total rewards chosen
-        totalsmalldr = smalldr_didnotdelay + smalldr_delayedreward
-
-        # Creates a percentage of immediate choices to total choices given
-        smalldrimmediatepercentage = smalldr_didnotdelay / totalsmalldr * 100
-
-        # Fills any N/A values to 99999
-        smalldrimmediatepercentage.fillna(value=99999)
-
-
-        # List Comprehension bins each person into their appropriate k-value (see kbins) based
-        # on their percentage of immediate choices to total choices.
-        # This will put a 0 on all other percentages.
-        # Any other percentage than the ones below means a participant skipped a question.
-        smallrewards = [kbins[0] if x ==0.0
-        else kbins[1] if x>=11 and x<=12
-        else kbins[2] if x>=22 and x<=23
-        else kbins[3] if x>=33 and x<=34
-        else kbins[4] if x>=44 and x<=45
-        else kbins[5] if x>=55 and x<=56
-        else kbins[6] if x>=66 and x<=67
-        else kbins[7] if x>=77 and x<=78
-        else kbins[8] if x>=88 and x<=89
-        else kbins[9] if x == 100
-        else 0 for x in smalldrimmediatepercentage]
-
-
-        # Drops the 0 values because it means that the participant skipped at least 1 question.
-        smallrewardks = ['DISCARD' if x == 0 else x for x in smallrewards]
-        # List Comprehension that takes the log10 of each k-bin value and rounds to the 5th decimal place.
-        # This also drops any discount rate where a 0 value is given
-        smalllogdiscountrate = [round(log(y, 10), 5) if y > 0 and y <= 1 else 'DISCARD' for y in smallrewards]
-
-        # Puts the k-values into a dataframe
-        smallldr = pd.DataFrame(
-            {'Small_Reward_k-value': smallrewardks, 'Log10_Small_DiscountRate': smalllogdiscountrate})
-        smallldr.index +=1
-
-        # -----------------------------------------------------------------------------------------------------------------#
-        # see smalldr comments. Exact same computation.
-        mediumdr = input[mediumdr_keys].apply(pd.to_numeric, args=('raise',))
-
-        mediumdr_delayedreward = mediumdr[mediumdr[mediumdr_keys] == 2].count(axis=1)
-        mediumdr_didnotdelay = mediumdr[mediumdr[mediumdr_keys] == 1].count(axis=1)
-
-        totalmediumdr = mediumdr_didnotdelay + mediumdr_delayedreward
-
-        mediumdrimmediatepercentage = mediumdr_didnotdelay / totalmediumdr * 100
-        mediumdrimmediatepercentage.fillna(value=99999)
-
-        mediumrewards = [kbins[0] if x == 0.0
-        else kbins[1] if x >= 11 and x <= 12
-        else kbins[2] if x>=22 and x<=23
-        else kbins[3] if x>=33 and x<=34
-        else kbins[4] if x>=44 and x<=45
-        else kbins[5] if x>=55 and x<=56
-        else kbins[6] if x>=66 and x<=67
-        else kbins[7] if x>=77 and x<=78
-        else kbins[8] if x>=88 and x<=89
-        else kbins[9] if x == 100
-        else 0 for x in mediumdrimmediatepercentage]
-
-        mediumrewardks = ['DISCARD' if x == 0 else x for x in mediumrewards]
-        midlogdiscountrate = [round(log(y, 10), 5) if y > 0 and y <= 1 else 'DISCARD' for y in mediumrewards]
-
-        mediumldr = pd.DataFrame(
-            {'Medium_Reward_k-value': mediumrewardks, 'Log10_Medium_DiscountRate': midlogdiscountrate})
-        mediumldr.index +=1
-
-        # -----------------------------------------------------------------------------------------------------------------#
-        # see smalldr comments. Exact same computation.
-        largedr = input[largedr_keys].apply(pd.to_numeric, args=('raise',))
-
-        largedr_delayedreward = largedr[largedr[largedr_keys] == 2].count(axis=1)
-        largedr_didnotdelay = largedr[largedr[largedr_keys] == 1].count(axis=1)
-
-
-        totallargedr = largedr_didnotdelay + largedr_delayedreward
-
-        largedrimmediatepercentage = largedr_didnotdelay / totallargedr * 100
-        largedrimmediatepercentage.fillna(value=99999)
-
-        largerewards = [kbins[0] if x == 0.0
-        else kbins[1] if x >= 11 and x <= 12
-        else kbins[2] if x>=22 and x<=23
-        else kbins[3] if x>=33 and x<=34
-        else kbins[4] if x>=44 and x<=45
-        else kbins[5] if x>=55 and x<=56
-        else kbins[6] if x>=66 and x<=67
-        else kbins[7] if x>=77 and x<=78
-        else kbins[8] if x>=88 and x<=89
-        else kbins[9] if x == 100
-        else 0 for x in largedrimmediatepercentage]
-
-
-
-        largerewardks = ['DISCARD' if x==0 else x for x in largerewards]
-        largelogdiscountrate = [round(log(y, 10), 5) if y > 0 and y <= 1 else 'DISCARD' for y in largerewards]
-
-        largeldr = pd.DataFrame(
-            {'Large_Reward_k-value': largerewardks, 'Log10_Large_DiscountRate': largelogdiscountrate})
-        largeldr.index +=1
-        # -----------------------------------------------------------------------------------------------------------------#
-        # THIS COMPUTES THE TOTAL K-VALUE BY COMBINING ALL 3 SCORES
-
-        # Converts each k-bin set to pandas dataframe
-        small = pd.DataFrame(smallrewards)
-        medium = pd.DataFrame(mediumrewards)
-        large = pd.DataFrame(largerewards)
-
-        # puts the bins into one variable
-        kframes = [small, medium, large]
-
-        # function for calculating the geometric mean of a set of data
-        geomean = lambda n: reduce(lambda x, y: x * y, n) ** (1.0 / len(n))
-
-        # creates a variable for calculating the geometric mean of the k-bin set across rows
-        # make sure you have no missing questions in your data.
-        totalk = geomean(kframes)
-
-        # renames the column in pandas dataframe from 0 to Total_k-value
-        totalk = totalk.rename(columns = {0: 'Total_k-value'})
-        totalk.index+=1
+        return score_items(engine.numeric_block(input, DDQ_KEYS), input.index, None)
+    except KeyError:
+        print("We could not find the DDQ headers in your dataset. "
+              "Please look at the ddq function in this package and put in the correct keys.")
+    except ValueError:
+        print("We found strings in your DDQ dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
 
-        # gets the log10 and rounds if the values in the dataframe are between 0 and less than or equal to 1.
-        # Otherwise, if the value is 0 or greater than 1, the value, and therefore, the participant, is dropped.
-        totallogdiscountrate = [round(log(y, 10), 5) if y > 0 and y <= 1 else 'DISCARD' for y in totalk['Total_k-value']]
-        totaldiscountrate = pd.DataFrame({'Total_Discount_Rate': totallogdiscountrate})
-        totaldiscountrate.index += 1
 
-        # -----------------------------------------------------------------------------------------------------------------#
+def ddq_ml(input):
+    # DELAY DISCOUNTING QUESTIONNAIRE - MAXIMUM LIKELIHOOD K-VALUE
 
-        frames = [smallldr, mediumldr, largeldr, totalk, totaldiscountrate]
-        result = pd.concat(frames, axis=1)
-        return result
+    """
+    1. The k-bins of the ddq function above come from the percentage of immediate choices, which is only an estimate of
+    the point at which a participant switches from delayed to immediate rewards. This function fits one continuous k
+    to all 27 choices of each participant instead.
+
+    2. The choice model is the logistic model of Wileyto et al. (2004):
+    log odds of choosing the delayed reward = b1 * (A/V - 1) - b2 * D
+    A participant is indifferent when A/V - 1 = kD (see V = A/(1+kD) in the ddq function), so k = b2 / b1.
+
+    3. b1 and b2 are found for all participants at once with Newton steps (see fit_choices). A small penalty keeps them
+    finite for participants who never switch. Both are penalized on the same footing: the gains (0.02-1.75) and delays
+    (7-192 days) are put on the same scale before fitting. The k-value is kept between the lowest and highest
+    indifference k of the questions (0.00013-0.25), the range the 27 questions can tell apart.
+
+    4. ML_Consistency = percentage of answered questions that were chosen the way the fitted k-value predicts
+    (delayed when k is lower than the question's indifference k, immediate otherwise).
+
+    5. Participants who switch once and never go back (delayed for every question above some indifference k, immediate
+    for every question below it) are perfectly consistent. The fit can't settle on one k for them, so they get the
+    geometric middle of the indifference k's on either side of their switch, with a consistency of 100. Participants who
+    always pick the delayed reward get the lowest k and those who never do get the highest one, also with a consistency
+    of 100. Participants who answered no questions, or whose choices go the wrong way (they pick the delayed reward more
+    often when it is worth less), get NaN.
+    """
+    try:
+        return ml_items(engine.numeric_block(input, DDQ_KEYS), input.index, None)
     except KeyError:
         print("We could not find the DDQ headers in your dataset. "
               "Please look at the ddq function in this package and put in the correct keys.")
     except ValueError:
-        print("We found strings in your DDQ dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
\ No newline at end of file
+        print("We found strings in your DDQ dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
+
+
+def ml_items(ddq_answers, index, nonresp):
+    # ddq_answers = the DDQ_KEYS answers as numeric floats, index = the row index of your dataframe
+    answered = (ddq_answers == 1) | (ddq_answers == 2)
+    delayed = ddq_answers == 2
+    b1, b2 = fit_choices(delayed, answered)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        k = b2 / b1
+        k[~(b1 > 0)] = np.nan
+        # Participants who always wait have a k below every question's indifference k, and those who never wait have
+        # one above all of them. The model has no finite answer for them, so they go to the ends of the range.
+        k[~(delayed != answered).any(axis=1)] = 0.0
+        k[~delayed.any(axis=1)] = np.inf
+        # Participants who switch once: the highest indifference k they turned down is below the lowest one they waited
+        # for, and any k in between explains every choice (see 5. above)
+        lower = np.where(answered & ~delayed, INDIFFERENCE_K, 0.0).max(axis=1)
+        upper = np.where(delayed, INDIFFERENCE_K, np.inf).min(axis=1)
+        switched = (lower > 0) & (upper < np.inf) & (lower < upper)
+        k[switched] = np.sqrt(lower[switched] * upper[switched])
+        k[~answered.any(axis=1)] = np.nan
+
+        predicted = k[:, np.newaxis] < INDIFFERENCE_K
+        consistency = ((predicted == delayed) & answered).sum(axis=1) / answered.sum(axis=1).astype(np.float64) * 100
+        consistency[np.isnan(k)] = np.nan
+        k = np.clip(k, INDIFFERENCE_K.min(), INDIFFERENCE_K.max())
+
+    return pd.DataFrame({'ML_k-value': k, 'Log10_ML_DiscountRate': np.round(np.log10(k), 5),
+                         'ML_Consistency': consistency}, index=index,
+                        columns=['ML_k-value', 'Log10_ML_DiscountRate', 'ML_Consistency'])
+
+
+def fit_choices(delayed, answered, penalty=0.01, steps=50):
+    # Penalized logistic regression without an intercept, one per participant, all fitted together:
+    # log odds of delayed = b1 * GAIN - b2 * DELAY, only counting answered questions.
+    # Each Newton step solves every participant's 2x2 system at once. Both features are divided by their root mean square
+    # so the penalty pulls on b1 and b2 equally, and the coefficients are scaled back at the end.
+    features = np.column_stack([GAIN, -DELAY])
+    scale = np.sqrt((features ** 2).mean(axis=0))
+    features = features / scale
+    weights = answered.astype(np.float64)
+    choices = delayed.astype(np.float64)
+    b = np.zeros((len(choices), 2))
+    for step in range(steps):
+        with np.errstate(over='ignore'):
+            p = 1.0 / (1.0 + np.exp(-np.dot(b, features.T)))
+        gradient = np.dot(weights * (choices - p), features) - penalty * b
+        curvature = weights * p * (1.0 - p)
+        h11 = np.dot(curvature, features[:, 0] ** 2) + penalty
+        h12 = np.dot(curvature, features[:, 0] * features[:, 1])
+        h22 = np.dot(curvature, features[:, 1] ** 2) + penalty
+        determinant = h11 * h22 - h12 * h12
+        move = np.column_stack([h22 * gradient[:, 0] - h12 * gradient[:, 1],
+                                h11 * gradient[:, 1] - h12 * gradient[:, 0]]) / determinant[:, np.newaxis]
+        b = b + move
+        if np.abs(move).max() < 1e-8:
+            break
+    return b[:, 0] / scale[0], b[:, 1] / scale[1]
+
+
+def score_items(ddq_answers, index, nonresp):
+    # ddq_answers = the DDQ_KEYS answers as numeric floats, index = the row index of your dataframe
+
+    # -----------------------------------------------------------------------------------------------------------------#
+    # Turns the 9 answers of every reward magnitude into one pattern number (see pattern_codes), and looks up the
+    # k-bin, consistency and switch point of that pattern. -1 means the participant skipped questions and the k-bin
+    # is discarded.
+    patterns = pattern_codes(ddq_answers)
+    bins = PATTERN_KBIN[patterns]
+    discarded = bins < 0
+    rewardks = np.where(discarded, np.nan, KBINS[bins])
+    consistency = PATTERN_CONSISTENCY[patterns]
+    switchks = PATTERN_SWITCH_K[patterns]
+    with np.errstate(invalid='ignore'):
+        logks = np.log10(rewardks)
+
+    # THIS COMPUTES THE TOTAL K-VALUE BY COMBINING ALL 3 SCORES
+    # The geometric mean of the 3 k-bins is the mean of their logs, so it is taken in log space.
+    # Any discarded reward magnitude discards the total as well.
+    totallogk = logks.mean(axis=1)
+    totalk = 10 ** totallogk
+
+    # -----------------------------------------------------------------------------------------------------------------#
+    # Discarded values are NaN, so every column stays a number. DDQ_Discarded is 1 for participants with a discarded
+    # k-value and 0 otherwise.
+    smallldr = pd.DataFrame({'Small_Reward_k-value': rewardks[:, 0], 'Log10_Small_DiscountRate': np.round(logks[:, 0], 5)},
+                            index=index)
+    mediumldr = pd.DataFrame({'Medium_Reward_k-value': rewardks[:, 1],
+                              'Log10_Medium_DiscountRate': np.round(logks[:, 1], 5)}, index=index)
+    largeldr = pd.DataFrame({'Large_Reward_k-value': rewardks[:, 2], 'Log10_Large_DiscountRate': np.round(logks[:, 2], 5)},
+                            index=index)
+    total = pd.DataFrame({'Total_k-value': totalk}, index=index)
+    totaldiscountrate = pd.DataFrame({'Total_Discount_Rate': np.round(totallogk, 5)}, index=index)
+    flag = pd.DataFrame({'DDQ_Discarded': discarded.any(axis=1).astype(np.int64)}, index=index)
+
+    # Kirby consistency and switch point of every reward magnitude
+    kirby = pd.DataFrame(index=index)
+    for column, reward in enumerate(['Small', 'Medium', 'Large']):
+        kirby[reward + '_Reward_Consistency'] = consistency[:, column]
+        kirby[reward + '_Reward_Switch_k-value'] = switchks[:, column]
+
+    frames = [smallldr, mediumldr, largeldr, total, totaldiscountrate, flag, kirby]
+    result = pd.concat(frames, axis=1)
+    return result
+
+
+def kbin_lookup():
+    # KBIN_LOOKUP[immediate choices, choices made] is the k-bin (0-9) of a reward magnitude, or -1 if it is discarded.
+    # The percentage of immediate choices to total choices is binned like it always has been: 0% is bin 0, 11-12% is
+    # bin 1, 22-23% is bin 2, ..., 88-89% is bin 8 and 100% is bin 9. Any other percentage means the participant
+    # skipped a question, and so does making no choice at all.
+    lookup = np.full((10, 10), -1, dtype=np.intp)
+    for made in range(1, 10):
+        for immediate in range(made + 1):
+            percentage = float(immediate) / made * 100
+            if percentage == 0.0:
+                lookup[immediate, made] = 0
+            elif percentage == 100:
+                lookup[immediate, made] = 9
+            else:
+                for kbin in range(1, 9):
+                    if 11 * kbin <= percentage <= 11 * kbin + 1:
+                        lookup[immediate, made] = kbin
+    return lookup
+
+
+# these k bin assignments are the geometric mean of two values with two endpoints being 0.00016 and 0.2500.
+KBINS = np.array([0.00016, 0.00025, 0.00063, 0.00158, 0.00387, 0.0098, 0.02561, 0.06403, 0.15811, 0.2500])
+KBIN_LOOKUP = kbin_lookup()
+
+def pattern_codes(ddq_answers):
+    # Every answer is one digit: 0 = skipped (or anything other than 1 or 2), 1 = immediate and 2 = delayed.
+    # The 9 digits of a reward magnitude, in the order of its keys (ascending indifference k), make one number in base 3,
+    # so every participant gets 3 numbers between 0 and 3^9 - 1.
+    digits = np.where(ddq_answers == 1, 1, np.where(ddq_answers == 2, 2, 0))
+    return np.dot(digits.reshape(len(digits), 3, 9), PLACES)
+
+
+def pattern_tables():
+    # k-bin, Kirby consistency and switch point k of every one of the 3^9 answer patterns of a reward magnitude.
+    # A participant who switches from delayed to immediate rewards after question s (0-9) of a magnitude picks the
+    # immediate reward on the first s questions and the delayed reward on the rest, and has the k-bin KBINS[s].
+    # Consistency = the highest percentage of answered questions that agree with one switch point. If several switch
+    # points agree equally well, the switch point k is the geometric mean of their k-bins (Kirby et al. 1999).
+    digits = (np.arange(3 ** 9)[:, np.newaxis] // PLACES) % 3
+    immediate = (digits == 1).astype(np.float64)
+    delayed = (digits == 2).astype(np.float64)
+    made = immediate.sum(axis=1) + delayed.sum(axis=1)
+
+    kbin = KBIN_LOOKUP[immediate.sum(axis=1).astype(np.intp), made.astype(np.intp)]
+
+    switch_delayed = (np.arange(9)[np.newaxis, :] >= np.arange(10)[:, np.newaxis]).astype(np.float64)
+    agree = np.dot(delayed, switch_delayed.T) + np.dot(immediate, 1.0 - switch_delayed.T)
+    best = agree.max(axis=1)
+    tied = agree == best[:, np.newaxis]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        consistency = np.where(made > 0, best / made * 100, np.nan)
+        switchk = 10 ** (np.dot(tied, np.log10(KBINS)) / tied.sum(axis=1))
+    switchk[made == 0] = np.nan
+    return kbin, consistency, switchk
+
+
+# What each question tells about k: the relative gain of waiting (A/V - 1), the delay in days (D), and the
+# indifference k at which both rewards are worth the same, ((A/V) - 1) / D
+GAIN = np.array([float(CHOICE_VALUES[key][1]) / CHOICE_VALUES[key][0] - 1 for key in DDQ_KEYS])
+DELAY = np.array([float(CHOICE_VALUES[key][2]) for key in DDQ_KEYS])
+INDIFFERENCE_K = GAIN / DELAY
+
+PLACES = 3 ** np.arange(9)
+PATTERN_KBIN, PATTERN_CONSISTENCY, PATTERN_SWITCH_K = pattern_tables()
+
+
+PLAN = engine.custom_plan(DDQ_KEYS, score_items, name='ddq')
@@ -0,0 +1,401 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import sys
+
+import numpy as np
+
+from . import profiling
+
+
+"""
+1. This is the scoring engine the self-report functions share. Each battery describes itself once in a SPEC dictionary
+at the top of its .py file, and compile_spec turns that description into lists of column positions when the battery
+is imported. Scoring a dataframe is then one numeric conversion of the battery's item block and a few array operations.
+
+2. A SPEC has the following keys:
+
+    'name'       the battery name used in error messages, e.g. 'BARRATT'
+    'script'     the .py file to look at, e.g. 'barratt'
+    'nonresp'    the key of the battery's Prefer Not To Answer choice in the reader's nonresponse dictionary,
+                 or None if the battery has no Prefer Not To Answer choice
+    'range'      (min, max) of a scored answer, after recoding
+    'recode'     optional list of (qualtrics value, scored value) pairs, e.g. [(1, 0), (2, 1), (3, 2), (4, 3), (5, 4)]
+    'reverse'    the number a reverse scored answer is subtracted from, e.g. 5 for a 1-4 scale
+    'fillers'    optional items that are checked for values out of range but never scored
+    'subscales'  list of subscales, each a dictionary with
+                     'name'      short name the totals below refer to
+                     'label'     optional name of the subscale in the column dictionary's SUBSCALE_NAME, if it is
+                                 not the same as 'name' (see columndict.py)
+                     'forward'   items that are scored as answered
+                     'reverse'   items that are reverse scored
+                     'missing'   what to do with missing answers (left blank or prefer not to answer):
+                                 'prorate' - add the subscale average for every missing answer (default)
+                                 'prorate_items' - add the sum divided by the number of items in the subscale for
+                                             every missing answer, like NCOG and POMS Tension/Anxiety always have
+                                 'mean'    - divide the sum by the number of items in the subscale
+                                 'sum'     - keep the plain sum
+                     'columns'   output column names for 'score', 'blank' (left blank) and 'pna' (prefer not to answer).
+                                 Leave a name out and that column is not put in the output. Leave 'columns' out and
+                                 the subscale is only used for the totals
+    'totals'     optional list of scores made from the subscales, each a dictionary with
+                     'of'        list of (subscale name, weight) pairs that are added up
+                     'divisor'   optional number the weighted sum is divided by
+                     'columns'   same as for subscales. Left blank and prefer not to answer are added up
+    'checks'     optional check questions, a dictionary with
+                     'column'    output column name
+                     'answers'   list of (item, right answer) pairs. Use 'nonresp' for the Prefer Not To Answer choice.
+                                 Wrong and blank answers are both counted.
+
+3. Missing answers are counted per subscale, and any answer that is not blank, not the Prefer Not To Answer choice, and
+outside 'range' stops the program so you can fix your dataset, just like the single battery scripts always have.
+
+4. Left blank, prefer not to answer and out of range answers are counted by count_missing for every subscale at once:
+each kind of answer is marked True/False per question and multiplied by a membership matrix (one row per question,
+one column per subscale, 1 where the question belongs to the subscale). qids, shipley and ddq use the same functions
+for their own counts.
+
+5. The subscale sums work the same way. compile_spec builds a weight matrix with +1 for forward and -1 for reverse
+questions (plus the reverse offset for every answered reverse question), so all subscales of a battery are summed
+with one matrix product, no matter how many subscales there are.
+
+6. A 'recode' is compiled into a small lookup table (lookup_table) with one entry per whole number between the lowest
+and highest Qualtrics value, and applied to the whole block of answers with one take (lookup). Reverse scoring is
+not part of the table, it is done by the weight matrix above. The Prefer Not To Answer choice and blanks are outside
+the table and go through unchanged, so they are still counted as such.
+
+7. pandas is only imported once a dataframe is read or made (numeric_block, score), so importing a battery and scoring
+single participants with score_participant stays light:
+
+    tci.PLAN and engine.score_participant(tci.PLAN, {'tci_1': 3, 'tci_2': 5, ...}, nonresp)
+
+give {output column: score} for one participant, the same numbers as one row of tci.tci(df, nonresp). Blank answers
+can be left out of the dictionary. qids, shipley and ddq still use pandas for this.
+
+8. Plans compiled from a column dictionary (columndict.py) have a 'pna' array with the Prefer Not To Answer choice of
+every single item (NaN for items without one). It is used instead of the battery's value in nonresp.
+
+9. With profiling on (profiling.enable()), score records every battery and score_blocks every step inside a SPEC
+battery, named after the battery's 'script' (see profiling.py).
+"""
+
+
+def compile_spec(spec):
+    # Every item the battery needs, in the order the subscales first use them, followed by fillers and check items
+    items = []
+    for subscale in spec['subscales']:
+        for item in subscale.get('forward', []) + subscale.get('reverse', []):
+            if item not in items:
+                items.append(item)
+    for item in spec.get('fillers', []):
+        if item not in items:
+            items.append(item)
+    scored_items = len(items)
+    checks = spec.get('checks')
+    if checks:
+        for item, right_answer in checks['answers']:
+            if item not in items:
+                items.append(item)
+
+    position = dict((item, idx) for idx, item in enumerate(items))
+
+    def positions(keys):
+        return np.array([position[key] for key in keys], dtype=np.intp)
+
+    # one membership column per subscale, plus a last column with every question that is checked for values out of range
+    groups = [subscale.get('forward', []) + subscale.get('reverse', []) for subscale in spec['subscales']]
+    plan = {'spec': spec, 'items': items, 'membership': membership_matrix(items, groups + [items[:scored_items]]),
+            'subscales': [], 'totals': [], 'checks': None,
+            'validation': {'range': spec['range'], 'nonresp': spec['nonresp'], 'columns': scored_items},
+            'lookup': lookup_table(spec['recode']) if spec.get('recode') else None, 'pna': None}
+
+    # Every subscale sum comes from one matrix product: [answers | answered] x weights.
+    # The top half of the weights is +1 for forward and -1 for reverse questions, and the bottom half adds spec['reverse']
+    # once for every reverse question that was answered, so each reverse answer counts as spec['reverse'] - answer.
+    weights = np.zeros((2 * len(items), len(spec['subscales'])))
+    for column, subscale in enumerate(spec['subscales']):
+        for item in subscale.get('forward', []):
+            weights[position[item], column] = 1.0
+        for item in subscale.get('reverse', []):
+            weights[position[item], column] = -1.0
+            weights[len(items) + position[item], column] = spec['reverse']
+        plan['subscales'].append({'name': subscale['name'], 'columns': subscale.get('columns', {})})
+
+    missing = [subscale.get('missing', 'prorate') for subscale in spec['subscales']]
+    plan['weights'] = weights
+    plan['n'] = np.array([len(group) for group in groups], dtype=np.float64)
+    plan['prorated'] = np.array([rule == 'prorate' for rule in missing], dtype=bool)
+    plan['averaged'] = np.array([rule == 'mean' for rule in missing], dtype=bool)
+    plan['prorated_items'] = np.array([rule == 'prorate_items' for rule in missing], dtype=bool)
+
+    names = [subscale['name'] for subscale in spec['subscales']]
+    for total in spec.get('totals', []):
+        plan['totals'].append({'of': [(names.index(name), weight) for name, weight in total['of']],
+                               'divisor': total.get('divisor'),
+                               'columns': total['columns']})
+
+    if checks:
+        plan['checks'] = {'column': checks['column'],
+                          'positions': positions([item for item, right_answer in checks['answers']]),
+                          'answers': [right_answer for item, right_answer in checks['answers']]}
+
+    return plan
+
+
+def custom_plan(items, scorer, range=None, nonresp=None, name=None):
+    # For batteries that are not scored from a SPEC (ddq, qids, shipley). scorer(values, index, nonresp) is called with
+    # numeric_block(input, items), so these batteries can be scored from the same converted answers as all the others.
+    # range and nonresp mean the same as in a SPEC and tell invalid_cells which answers the scorer would stop on.
+    # name = the battery's .py file, like 'script' in a SPEC
+    plan = {'items': list(items), 'scorer': scorer, 'validation': None, 'name': name}
+    if range is not None:
+        plan['validation'] = {'range': range, 'nonresp': nonresp, 'columns': len(items)}
+    return plan
+
+
+def membership_matrix(items, groups):
+    # One row per item and one column per group of items, with a 1 where the item belongs to the group
+    position = dict((item, idx) for idx, item in enumerate(items))
+    membership = np.zeros((len(items), len(groups)))
+    for column, group in enumerate(groups):
+        for item in group:
+            membership[position[item], column] = 1.0
+    return membership
+
+
+def count_cells(flags, membership):
+    # flags = one or more True/False arrays (participants x items) stacked on top of each other.
+    # Returns how many cells are True for every participant in every group of the membership matrix,
+    # for all the stacked arrays with one matrix product.
+    flags = np.asarray(flags)
+    counts = np.dot(flags.reshape(-1, flags.shape[-1]).astype(np.float64), membership)
+    return counts.round().astype(np.int64).reshape(flags.shape[:-1] + (membership.shape[1],))
+
+
+def count_missing(values, membership, nonresval, low, high):
+    # Counts, for every participant and every group of items, the answers that were
+    #   left blank
+    #   the Prefer Not To Answer choice (nonresval, None if the battery has no such choice)
+    #   out of range: below low, or above high without being the Prefer Not To Answer choice
+    return tuple(count_cells(mark_cells(values, nonresval, low, high), membership))
+
+
+def mark_cells(values, nonresval, low, high):
+    # True/False arrays the same shape as values for left blank, prefer not to answer and out of range answers
+    with np.errstate(invalid='ignore'):
+        leftblank = np.isnan(values)
+        if nonresval is not None:
+            prefernotanswer = values == nonresval
+        else:
+            prefernotanswer = np.zeros(values.shape, dtype=bool)
+        nofit = (values < low) | ((values > high) & ~prefernotanswer)
+    return leftblank, prefernotanswer, nofit
+
+
+def invalid_cells(plan, values, nonresp):
+    # True for every answer that would make score() stop the program (out of range and not the Prefer Not To Answer
+    # choice), so those answers can be found and dealt with before scoring. All False for batteries that never stop.
+    validation = plan['validation']
+    invalid = np.zeros(values.shape, dtype=bool)
+    if validation is None:
+        return invalid
+    nonresval = nonresponse_value(plan, nonresp, validation['nonresp'])
+    if 'spec' in plan:
+        values = recode(plan, values)
+    low, high = validation['range']
+    checked = validation['columns']
+    if isinstance(nonresval, np.ndarray):
+        nonresval = nonresval[:checked]
+    invalid[:, :checked] = mark_cells(values[:, :checked], nonresval, low, high)[2]
+    return invalid
+
+
+def nonresponse_value(plan, nonresp, key):
+    # The Prefer Not To Answer choice of every item if the plan has one (see 8. above), otherwise the battery's value in
+    # nonresp, or None if the battery has no Prefer Not To Answer choice
+    if plan.get('pna') is not None:
+        return plan['pna']
+    return nonresp[key] if key is not None else None
+
+
+def numeric_block(input, items):
+    # Pull the battery's columns out of the dataframe and turn them into one 2D array of floats, with NaN for blanks.
+    # Text columns go through pd.to_numeric so strings in your dataset still raise a ValueError.
+    import pandas as pd
+    block = input[items]
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in block.dtypes):
+        block = block.apply(pd.to_numeric, args=('raise',))
+    return block.astype('float64').values
+
+
+def recode(plan, values):
+    # Replace the Qualtrics values with the scored values, e.g. 1-5 with 0-4, with the lookup table compile_spec made
+    if plan['lookup'] is None:
+        return values
+    return lookup(plan['lookup'], values)
+
+
+def lookup_table(pairs, other=None):
+    # Turns (qualtrics value, scored value) pairs into a lookup table: one scored value for every whole number from the
+    # lowest to the highest qualtrics value. Whole numbers in between that have no pair become other, or stay as they
+    # are if other is None. Blanks, the Prefer Not To Answer choice and anything else outside the table go through
+    # lookup unchanged when other is None, and become other when it is not.
+    qualtrics_values = [qualtrics_value for qualtrics_value, scored_value in pairs]
+    low, high = int(min(qualtrics_values)), int(max(qualtrics_values))
+    if other is None:
+        table = np.arange(low, high + 1, dtype=np.float64)
+    else:
+        table = np.full(high - low + 1, other, dtype=np.float64)
+    for qualtrics_value, scored_value in pairs:
+        table[int(qualtrics_value) - low] = scored_value
+    return {'low': low, 'table': table, 'other': other}
+
+
+def lookup(table, values):
+    # Recodes a whole block of answers with one take from the lookup table. All pairs are applied at once,
+    # so (1, 0), (2, 1) never turns a 2 into a 0.
+    with np.errstate(invalid='ignore'):
+        position = values - table['low']
+        inside = (position >= 0) & (position < len(table['table'])) & (position == np.floor(position))
+    recoded = values.copy() if table['other'] is None else np.full(values.shape, table['other'])
+    recoded[inside] = table['table'].take(position[inside].astype(np.intp))
+    return recoded
+
+
+def score(plan, values, index, nonresp):
+    # values = numeric_block(input, plan['items'])
+    # index = the row index of your dataframe, so the scores line up with the subject ids
+    name = plan_name(plan)
+    with profiling.stage(name, len(values)):
+        if 'scorer' in plan:
+            return plan['scorer'](values, index, nonresp)
+        # pandas is imported here instead of at the top, see 7. above
+        import pandas as pd
+        blocks = score_blocks(plan, values, nonresp)
+        with profiling.stage(name + '/output', len(values)):
+            return pd.concat([pd.DataFrame(block, index=index) for block in blocks], axis=1)
+
+
+def plan_name(plan):
+    # The battery's .py file (or registered scale name), which its profiling stages are called after
+    if 'spec' in plan:
+        return plan['spec']['script']
+    return plan.get('name') or 'custom'
+
+
+def score_participant(plan, answers, nonresp=None):
+    # Scores one participant from {item: answer}, see 7. above. Returns {output column: score}.
+    values = np.array([[answers.get(item, np.nan) for item in plan['items']]], dtype=np.float64)
+    if 'scorer' in plan:
+        frame = plan['scorer'](values, [0], nonresp)
+        return dict((column, frame[column].values[0].item()) for column in frame.columns)
+    scores = {}
+    for block in score_blocks(plan, values, nonresp):
+        for column, value in block.items():
+            scores[column] = np.asarray(value)[0].item()
+    return scores
+
+
+def score_blocks(plan, values, nonresp):
+    # The scores of a SPEC battery as a list of {output column: array with one score per participant}, one per subscale,
+    # total and check column, in the order they are put in the output
+    spec = plan['spec']
+    name, rows = spec['script'], len(values)
+    nonresval = nonresponse_value(plan, nonresp, spec['nonresp'])
+    low, high = spec['range']
+    raw = values
+    with profiling.stage(name + '/recode', rows):
+        values = recode(plan, values)
+
+    # Left blank, prefer not to answer and values that don't fit in the value parameters, per subscale
+    with profiling.stage(name + '/missing', rows):
+        leftblank, prefernotanswer, nofit = count_missing(values, plan['membership'], nonresval, low, high)
+
+    # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
+    if nofit[:, -1].any():
+        sys.exit(nofit_message(spec))
+
+    leftblank, prefernotanswer = leftblank[:, :-1], prefernotanswer[:, :-1]
+    unanswered = leftblank + prefernotanswer
+
+    with np.errstate(invalid='ignore', divide='ignore'), profiling.stage(name + '/subscales', rows):
+        # forward answers count as they are, reverse answers are subtracted from spec['reverse'],
+        # and anything outside the range (blank or prefer not to answer) adds nothing
+        answered = (values >= low) & (values <= high)
+        scores = np.dot(np.hstack([np.where(answered, values, 0.0), answered]), plan['weights'])
+
+        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
+        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
+        # Add all of this to to the original score.
+        prorated = plan['prorated']
+        scores[:, prorated] = scores[:, prorated] + (unanswered[:, prorated] * scores[:, prorated] /
+                                                     (plan['n'][prorated] - unanswered[:, prorated]))
+        averaged = plan['averaged']
+        scores[:, averaged] = scores[:, averaged] / plan['n'][averaged]
+        prorated = plan['prorated_items']
+        scores[:, prorated] = scores[:, prorated] + unanswered[:, prorated] * scores[:, prorated] / plan['n'][prorated]
+
+    subscores = [(scores[:, column], leftblank[:, column], prefernotanswer[:, column])
+                 for column in range(len(plan['subscales']))]
+
+    blocks = []
+    for subscale, subscore in zip(plan['subscales'], subscores):
+        if subscale['columns']:
+            blocks.append(score_block(subscale['columns'], subscore))
+
+    if plan['totals']:
+        with profiling.stage(name + '/totals', rows):
+            for total in plan['totals']:
+                total_score, total_leftblank, total_prefernotanswer = None, 0, 0
+                for position, weight in total['of']:
+                    subscale_score, subscale_leftblank, subscale_prefernotanswer = subscores[position]
+                    weighted = subscale_score if weight == 1 else weight * subscale_score
+                    total_score = weighted if total_score is None else total_score + weighted
+                    total_leftblank = total_leftblank + subscale_leftblank
+                    total_prefernotanswer = total_prefernotanswer + subscale_prefernotanswer
+                if total['divisor']:
+                    total_score = total_score / float(total['divisor'])
+                blocks.append(score_block(total['columns'], (total_score, total_leftblank, total_prefernotanswer)))
+
+    if plan['checks']:
+        # Wrong and blank check answers are both counted
+        with profiling.stage(name + '/checks', rows):
+            checks = plan['checks']
+            wrong = np.zeros(len(raw), dtype=np.int64)
+            for position, right_answer in zip(checks['positions'], checks['answers']):
+                if right_answer == 'nonresp':
+                    right_answer = nonresval[position] if isinstance(nonresval, np.ndarray) else nonresval
+                wrong += ~(raw[:, position] == right_answer)
+            blocks.append({checks['column']: wrong})
+
+    return blocks
+
+
+def score_block(columns, subscore):
+    # The columns the battery asked for of one subscale or total, in the order they are written in the SPEC
+    subscale_score, subscale_leftblank, subscale_prefernotanswer = subscore
+    values = {'score': subscale_score, 'blank': subscale_leftblank, 'pna': subscale_prefernotanswer}
+    block = {}
+    for kind, column in columns.items():
+        block[column] = values[kind]
+    return block
+
+
+def nofit_message(spec):
+    low, high = spec['range']
+    if spec.get('recode'):
+        qualtrics_values = [qualtrics_value for qualtrics_value, scored_value in spec['recode']]
+        low, high = min(qualtrics_values), max(qualtrics_values)
+    message = ("We found values that don't match parameter values for calculation in your %s dataset. "
+               "Please make sure your values range from %d-%d (see %s script)" % (spec['name'], low, high, spec['script']))
+    if spec['nonresp'] is not None:
+        return message + " and have only ONE prefer not to answer value."
+    return message + "."
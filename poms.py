@@ -9,13 +9,62 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
-import pandas as pd
-import sys
+from . import engine
 
 # input = the data you are using with with the keys listed below as headers
 # nonresval = the Prefer Not To Answer Choice on your Questionnaire
 
 
+# NOT AT ALL - A LITTLE - MODERATELY - QUITE A BIT - EXTREMELY - PREFER NOT TO ANSWER
+#     0            1          2             3           4           YOUR CHOICE
+# ------------------------------------------------------------------------------
+# Your 1-5 Qualtrics values are replaced with 0-4 before scoring. ALL FORWARD NO REVERSE
+# TOTAL MOOD DISTURBANCE SCORE
+# (T + D + A + F + C) - V
+# (TENSION + DEPRESSION + ANGER + FATIGUE + CONFUSION) - VIGOR
+# Missing Tension/Anxiety answers are prorated with all 5 items (score + unanswered * score / 5), the other subscales
+# with the answered items
+SPEC = {
+    'name': 'POMS',
+    'script': 'poms',
+    'nonresp': 'poms',
+    'range': (0, 4),
+    'recode': [(1, 0), (2, 1), (3, 2), (4, 3), (5, 4)],
+    'subscales': [
+        {'name': 'tension', 'label': 'tension/anxiety',
+         'forward': ['poms_1', 'poms_6', 'poms_12', 'poms_16', 'poms_20'], 'missing': 'prorate_items',
+         'columns': {'score': 'POMS_Tension/Anxiety_Score', 'blank': 'POMS_Tension/Anxiety_Left_Blank',
+                     'pna': 'POMS_Tension/Anxiety_Prefer_Not_to_Answer'}},
+        {'name': 'depression', 'label': 'depression/dejection',
+         'forward': ['poms_7', 'poms_11', 'poms_15', 'poms_17', 'poms_21'],
+         'columns': {'score': 'POMS_Depresssion/Dejection_Score', 'blank': 'POMS_Depresssion/Dejection_Left_Blank',
+                     'pna': 'POMS_Depresssion/Dejection_Prefer_Not_to_Answer'}},
+        {'name': 'anger', 'label': 'anger/hostility',
+         'forward': ['poms_2', 'poms_9', 'poms_14', 'poms_25', 'poms_28'],
+         'columns': {'score': 'POMS_Anger/Hostility_Score', 'blank': 'POMS_Anger/Hostility_Left_Blank',
+                     'pna': 'POMS_Anger/Hostility_Prefer_Not_to_Answer'}},
+        {'name': 'vigor', 'label': 'vigor/activity',
+         'forward': ['poms_4', 'poms_8', 'poms_10', 'poms_27', 'poms_30'],
+         'columns': {'score': 'POMS_Vigor/Activity_Score', 'blank': 'POMS_Vigor/Activity_Left_Blank',
+                     'pna': 'POMS_Vigor/Activity_Prefer_Not_to_Answer'}},
+        {'name': 'fatigue', 'label': 'fatigue/inertia',
+         'forward': ['poms_3', 'poms_13', 'poms_19', 'poms_22', 'poms_23'],
+         'columns': {'score': 'POMS_Fatigue/Inertia_Score', 'blank': 'POMS_Fatigue/Inertia_Left_Blank',
+                     'pna': 'POMS_Fatigue/Inertia_Prefer_Not_to_Answer'}},
+        {'name': 'confusion', 'label': 'confusion/bewilderment',
+         'forward': ['poms_5', 'poms_18', 'poms_24', 'poms_26', 'poms_29'],
+         'columns': {'score': 'POMS_Confusion/Bewilderment_Score', 'blank': 'POMS_Confusion/Bewilderment_Left_Blank',
+                     'pna': 'POMS_Confusion/Bewilderment_Prefer_Not_to_Answer'}},
+    ],
+    'totals': [
+        {'of': [('tension', 1), ('depression', 1), ('anger', 1), ('fatigue', 1), ('confusion', 1), ('vigor', -1)],
+         'columns': {'score': 'POMS_Total_Mood_Disturbance'}},
+    ],
+}
+
+PLAN = engine.compile_spec(SPEC)
+
+
 def poms(input, nonresp):
     # PROFILE OF MOOD STATES
 
@@ -36,255 +85,8 @@ def poms(input, nonresp):
 
     """
     try:
-        # NOT AT ALL - A LITTLE - MODERATELY - QUITE A BIT - EXTREMELY - PREFER NOT TO ANSWER
-        #     0            1          2             3           4           YOUR CHOICE
-        # ------------------------------------------------------------------------------
-        tension_anxiety_keys = ['poms_1', 'poms_6', 'poms_12', 'poms_16', 'poms_20']
-        depression_dejection_keys = ['poms_7', 'poms_11', 'poms_15', 'poms_17', 'poms_21']
-        anger_hostility_keys = ['poms_2', 'poms_9', 'poms_14', 'poms_25', 'poms_28']
-        vigor_activity_keys = ['poms_4', 'poms_8', 'poms_10', 'poms_27', 'poms_30']
-        fatigue_inertia_keys = ['poms_3', 'poms_13', 'poms_19', 'poms_22', 'poms_23']
-        confusion_bewilderment_keys = ['poms_5', 'poms_18', 'poms_24', 'poms_26', 'poms_29']
-
-
-        # ------------------------------------------------------------------------------
-        # TENSION / ANXIETY SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        tension_anxiety = input[tension_anxiety_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        tension_anxiety_nofit = tension_anxiety[(tension_anxiety[tension_anxiety_keys] != nonresp['poms']) &
-                                  (tension_anxiety[tension_anxiety_keys] > 4) |
-                                  (tension_anxiety[tension_anxiety_keys] < 0)].count(axis=1)
-
-        tension_leftblank = tension_anxiety.apply(lambda x: sum(x.isnull().values), axis=1)
-        tension_prefernotanswer = tension_anxiety[tension_anxiety[tension_anxiety_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        tension_anxiety_unanswered = tension_leftblank + tension_prefernotanswer
-
-        # Total SCORE
-        tension_anxiety_score = tension_anxiety[(tension_anxiety[tension_anxiety_keys] >=0) &
-                                                (tension_anxiety[tension_anxiety_keys] <=4)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        tension_anxiety_score = tension_anxiety_score + (tension_anxiety_unanswered * tension_anxiety_score / (len(tension_anxiety_keys)))
-
-        # ------------------------------------------------------------------------------
-        # DEPRESSION / DEJECTION SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        depression_dejection = input[depression_dejection_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        depression_dejection_nofit = depression_dejection[(depression_dejection[depression_dejection_keys] != nonresp['poms']) &
-                                                (depression_dejection[depression_dejection_keys] > 4) |
-                                                (depression_dejection[depression_dejection_keys] < 0)].count(axis=1)
-
-        depression_dejection_leftblank = depression_dejection.apply(lambda x: sum(x.isnull().values), axis=1)
-        depression_dejection_prefernotanswer = depression_dejection[depression_dejection[depression_dejection_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        depression_dejection_unanswered = depression_dejection_leftblank + depression_dejection_prefernotanswer
-
-        # Total SCORE
-        depression_dejection_score = depression_dejection[(depression_dejection[depression_dejection_keys] >= 0) &
-                                                          (depression_dejection[depression_dejection_keys] <= 4)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        depression_dejection_score = depression_dejection_score + (depression_dejection_unanswered * depression_dejection_score /
-                                                                   (len(depression_dejection_keys)-depression_dejection_unanswered))
-
-
-        # ------------------------------------------------------------------------------
-        # ANGER / HOSTILITY SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        anger_hostility = input[anger_hostility_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        anger_hostility_nofit = anger_hostility[(anger_hostility[anger_hostility_keys] != nonresp['poms']) &
-                                                (anger_hostility[anger_hostility_keys] > 4) |
-                                                (anger_hostility[anger_hostility_keys] < 0)].count(axis=1)
-
-
-        anger_hostility_leftblank = anger_hostility.apply(lambda x: sum(x.isnull().values), axis=1)
-        anger_hostility_prefernotanswer = anger_hostility[anger_hostility[anger_hostility_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        anger_hostility_unanswered = anger_hostility_leftblank + anger_hostility_prefernotanswer
-
-        # Total SCORE
-        anger_hostility_score = anger_hostility[(anger_hostility[anger_hostility_keys] >= 0) &
-                                                (anger_hostility[anger_hostility_keys] <= 4)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        anger_hostility_score = anger_hostility_score + (anger_hostility_unanswered * anger_hostility_score /
-                                                         (len(anger_hostility_keys)-anger_hostility_unanswered))
-
-        # ------------------------------------------------------------------------------
-        # VIGOR / ACTIVITY SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        vigor_activity = input[vigor_activity_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        vigor_activity_nofit = vigor_activity[(vigor_activity[vigor_activity_keys] != nonresp['poms']) &
-                                                (vigor_activity[vigor_activity_keys] > 4) |
-                                                (vigor_activity[vigor_activity_keys] < 0)].count(axis=1)
-
-        vigor_activity_leftblank = vigor_activity.apply(lambda x: sum(x.isnull().values), axis=1)
-        vigor_activity_prefernotanswer = vigor_activity[vigor_activity[vigor_activity_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        vigor_activity_unanswered = vigor_activity_leftblank + vigor_activity_prefernotanswer
-
-        # Total SCORE
-        vigor_activity_score = vigor_activity[(vigor_activity[vigor_activity_keys] >= 0) &
-                                              (vigor_activity[vigor_activity_keys] <= 4)].sum(axis=1)
-
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        vigor_activity_score = vigor_activity_score + (vigor_activity_unanswered * vigor_activity_score /
-                                                       (len(vigor_activity_keys)-vigor_activity_unanswered))
-
-        # ------------------------------------------------------------------------------
-        # FATIGUE / INERTIA SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        fatigue_inertia = input[fatigue_inertia_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        fatigue_inertia_nofit = fatigue_inertia[(fatigue_inertia[fatigue_inertia_keys] != nonresp['poms']) &
-                                                (fatigue_inertia[fatigue_inertia_keys] > 4) |
-                                                (fatigue_inertia[fatigue_inertia_keys] < 0)].count(axis=1)
-
-        fatigue_inertia_leftblank = fatigue_inertia.apply(lambda x: sum(x.isnull().values), axis=1)
-        fatigue_inertia_prefernotanswer = fatigue_inertia[fatigue_inertia[fatigue_inertia_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        fatigue_inertia_unanswered = fatigue_inertia_leftblank + fatigue_inertia_prefernotanswer
-
-        # Total SCORE
-        fatigue_inertia_score = fatigue_inertia[(fatigue_inertia[fatigue_inertia_keys] >= 0) &
-                                                (fatigue_inertia[fatigue_inertia_keys] <= 4)].sum(axis=1)
-
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        fatigue_inertia_score = fatigue_inertia_score + (fatigue_inertia_unanswered * fatigue_inertia_score /
-                                                         (len(fatigue_inertia_keys)-fatigue_inertia_unanswered))
-
-        # ------------------------------------------------------------------------------
-        # CONFUSION / BEWILDERMENT SCORE - ALL FORWARD NO REVERSE
-
-        # SCORES AND QUESTIONS UNANSWERED
-        confusion_bewilderment = input[confusion_bewilderment_keys].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        confusion_bewilderment_nofit = confusion_bewilderment[(confusion_bewilderment[confusion_bewilderment_keys] != nonresp['poms']) &
-                                                (confusion_bewilderment[confusion_bewilderment_keys] > 4) |
-                                                (confusion_bewilderment[confusion_bewilderment_keys] < 0)].count(axis=1)
-
-        confusion_bewilderment_leftblank = confusion_bewilderment.apply(lambda x: sum(x.isnull().values), axis=1)
-        confusion_bewilderment_prefernotanswer = confusion_bewilderment[confusion_bewilderment[confusion_bewilderment_keys] == nonresp['poms']].count(axis=1)
-
-        # TOTAL ANSWERS UNANSWERED
-        confusion_bewilderment_unanswered = confusion_bewilderment_leftblank + confusion_bewilderment_prefernotanswer
-
-        # Total SCORE
-        confusion_bewilderment_score = confusion_bewilderment[(confusion_bewilderment[confusion_bewilderment_keys] >= 0) &
-                                                              (confusion_bewilderment[confusion_bewilderment_keys] <= 4)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        confusion_bewilderment_score = confusion_bewilderment_score + (confusion_bewilderment_unanswered * confusion_bewilderment_score /
-                                                                       (len(confusion_bewilderment_keys)-confusion_bewilderment_unanswered))
-
-        # ------------------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = tension_anxiety_nofit + depression_dejection_nofit + anger_hostility_nofit + vigor_activity_nofit + fatigue_inertia_nofit + confusion_bewilderment_nofit
-
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your POMS dataset. "
-                         "Please make sure your values range from 1-5 (see poms script) and have only ONE prefer not to answer value.")
-
-
-        # ------------------------------------------------------------------------------
-        # TOTAL MOOD DISTURBANCE SCORE
-        # (T + D + A + F + C) - V
-        # (TENSION + DEPRESSION + ANGER + FATIGUE + CONFUSION) - VIGOR
-
-        totalmoodscore = (tension_anxiety_score + depression_dejection_score +
-                          anger_hostility_score + fatigue_inertia_score +
-                          confusion_bewilderment_score) - vigor_activity_score
-
-        # Discard any value below -20 and above 100
-        # totalmoodscore = ['Discard' if x < -20
-        #                else 'Discard' if x > 100 else x for x in totalmoodscore]
-
-
-        totalmoodscore = pd.DataFrame({'POMS_Total_Mood_Disturbance': totalmoodscore})
-
-        # ------------------------------------------------------------------------------
-        # POMS SCORES
-
-        # Discard any value below 0 and above 20
-        # tension_anxiety_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in tension_anxiety_score]
-        tenanxall = pd.DataFrame(
-            {'POMS_Tension/Anxiety_Score': tension_anxiety_score, 'POMS_Tension/Anxiety_Left_Blank': tension_leftblank,
-             'POMS_Tension/Anxiety_Prefer_Not_to_Answer': tension_prefernotanswer})
-
-
-        # Discard any value below 0 and above 20
-        # depression_dejection_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in depression_dejection_score]
-        depdejall = pd.DataFrame(
-            {'POMS_Depresssion/Dejection_Score': depression_dejection_score, 'POMS_Depresssion/Dejection_Left_Blank': depression_dejection_leftblank,
-             'POMS_Depresssion/Dejection_Prefer_Not_to_Answer': depression_dejection_prefernotanswer})
-
-
-        # Discard any value below 0 and above 20
-        # anger_hostility_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in anger_hostility_score]
-        anghosall = pd.DataFrame(
-            {'POMS_Anger/Hostility_Score': anger_hostility_score, 'POMS_Anger/Hostility_Left_Blank': anger_hostility_leftblank,
-             'POMS_Anger/Hostility_Prefer_Not_to_Answer': anger_hostility_prefernotanswer})
-
-        # Discard any value below 0 and above 20
-        # vigor_activity_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in vigor_activity_score]
-        vigactall = pd.DataFrame(
-            {'POMS_Vigor/Activity_Score': vigor_activity_score, 'POMS_Vigor/Activity_Left_Blank': vigor_activity_leftblank,
-             'POMS_Vigor/Activity_Prefer_Not_to_Answer': vigor_activity_prefernotanswer})
-
-        # Discard any value below 0 and above 20
-        # fatigue_inertia_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in fatigue_inertia_score]
-        fatinertall = pd.DataFrame(
-            {'POMS_Fatigue/Inertia_Score': fatigue_inertia_score, 'POMS_Fatigue/Inertia_Left_Blank': fatigue_inertia_leftblank,
-             'POMS_Fatigue/Inertia_Prefer_Not_to_Answer': fatigue_inertia_prefernotanswer})
-
-        # Discard any value below 0 and above 20
-        # confusion_bewilderment_score = ['Discard' if x < 0 else 'Discard' if x > 20 else x for x in confusion_bewilderment_score]
-        confbewildall = pd.DataFrame(
-            {'POMS_Confusion/Bewilderment_Score': confusion_bewilderment_score, 'POMS_Confusion/Bewilderment_Left_Blank': confusion_bewilderment_leftblank,
-             'POMS_Confusion/Bewilderment_Prefer_Not_to_Answer': confusion_bewilderment_prefernotanswer})
-
-        # ------------------------------------------------------------------------------
-        # Put the scores into one frame
-        frames = [tenanxall, depdejall, anghosall, vigactall, fatinertall, confbewildall, totalmoodscore]
-        result = pd.concat(frames, axis=1)
-        return result
+        # The subscales are described in SPEC above
+        return engine.score(PLAN, engine.numeric_block(input, PLAN['items']), input.index, nonresp)
     except KeyError:
         print("We could not find the POMS headers in your dataset. Please look at the poms function in this package and put in the correct keys.")
     except ValueError:
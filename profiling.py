@@ -0,0 +1,256 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import json
+import platform
+import threading
+import time
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2 has no tracemalloc, so allocated bytes are left out of the report
+    tracemalloc = None
+
+
+"""
+1. Finds out where a run spends its time. Profiling is off unless you turn it on, and then every stage of the run is
+recorded: reading the datafile, every battery, the steps inside every battery and putting the scores together.
+
+    profiling.enable()
+    df, raw_data_frame, question_dict, nonresp = reader.reader(your_raw_data_path, column_dictionary_path)
+    result = scoreall.score_all(df, nonresp)
+    profiling.write_report('profile.json')     # or 'profile.txt' for a table
+    profiling.disable()
+
+or from the command line:
+
+    python -m batteryscores score your_data.csv column_dictionary.csv -o scores.csv --profile profile.txt
+
+2. For every stage the report has the number of calls, wall time (seconds on the clock), CPU time (seconds the
+processor worked for this process), the number of rows and rows per second. enable(memory=True) also measures the
+allocated bytes of every stage (the most memory it held on top of what was there when it started) with tracemalloc,
+which makes the run itself a lot slower (Python 3 only, None on Python 2).
+
+3. The stages are called:
+
+    reader.reader, reader.chunked_reader       reading the datafile (chunked_reader once per chunk)
+    scoreall.numeric_block                     turning the answers of all batteries into numbers once
+    tci, barratt, ...                          scoring one battery (engine.score)
+    tci/recode, tci/missing, tci/subscales,    the steps inside a SPEC battery: recoding the answers, counting blank,
+    tci/totals, tci/checks, tci/output         prefer not to answer and out of range answers, the subscale sums (all
+                                               subscales in one matrix product), the totals, the check questions and
+                                               making the dataframe
+    scoreall.concat                            putting the scores of all batteries together
+    cli.write                                  writing the scores (command line only)
+
+4. Batteries scored in other processes (pool='process', score_sharded) are not recorded, only the stages around them.
+With threads (pool='thread') the batteries overlap, so their wall times add up to more than the run took and the
+memory of one battery includes what the others allocated in the meantime.
+"""
+
+PROFILE = {'enabled': False, 'memory': False, 'started': None, 'records': []}
+
+# the stages that are running in this thread, for the allocated bytes of nested stages
+RUNNING = threading.local()
+
+try:
+    wall_clock = time.perf_counter
+    cpu_clock = time.process_time
+except AttributeError:
+    # Python 2: time.clock is the CPU time of the process on Linux and macOS
+    wall_clock = time.time
+    cpu_clock = time.clock
+
+
+def enable(memory=False):
+    # Starts recording, see 2. above for memory. Earlier records are thrown away.
+    PROFILE['records'] = []
+    PROFILE['started'] = wall_clock()
+    PROFILE['memory'] = bool(memory) and tracemalloc is not None
+    if PROFILE['memory'] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    PROFILE['enabled'] = True
+
+
+def disable():
+    # Stops recording. The records are kept until the next enable, so the report can still be written.
+    if PROFILE['memory'] and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    PROFILE['enabled'] = False
+
+
+def enabled():
+    return PROFILE['enabled']
+
+
+def stage(name, rows=None):
+    # with profiling.stage('tci/missing', rows): ... records the stage when profiling is on and costs next to nothing
+    # when it is off. Set .rows on the stage when the number of rows is only known at the end.
+    if not PROFILE['enabled']:
+        return NOT_PROFILING
+    return Stage(name, rows)
+
+
+class Stage(object):
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.cancelled = False
+
+    def __enter__(self):
+        if PROFILE['memory']:
+            running = getattr(RUNNING, 'stages', None)
+            if running is None:
+                running = RUNNING.stages = []
+            current, peak = tracemalloc.get_traced_memory()
+            # the peak is started over for this stage, so the stage around it keeps the peak it had so far
+            if running:
+                running[-1].peak = max(running[-1].peak, peak)
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            self.start_memory, self.peak = current, current
+            running.append(self)
+        self.start_wall, self.start_cpu = wall_clock(), cpu_clock()
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        wall, cpu = wall_clock() - self.start_wall, cpu_clock() - self.start_cpu
+        allocated = None
+        if PROFILE['memory'] and tracemalloc.is_tracing():
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            allocated = self.peak - self.start_memory
+            RUNNING.stages.pop()
+            if RUNNING.stages:
+                RUNNING.stages[-1].peak = max(RUNNING.stages[-1].peak, self.peak)
+        if not self.cancelled:
+            PROFILE['records'].append({'stage': self.name, 'started': self.start_wall - PROFILE['started'],
+                                       'wall_seconds': wall, 'cpu_seconds': cpu, 'rows': self.rows,
+                                       'allocated_bytes': allocated})
+        return False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class NotProfiling(object):
+    # The stage handed out while profiling is off: it does nothing, and setting rows on it is ignored
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, kind, error, traceback):
+        return False
+
+    def cancel(self):
+        pass
+
+
+NOT_PROFILING = NotProfiling()
+
+
+def profiled(name, rows=None):
+    # Decorator that records every call of a function as stage name. rows(result) gives the number of rows it handled.
+    def decorate(function):
+        def wrapper(*args, **kwargs):
+            if not PROFILE['enabled']:
+                return function(*args, **kwargs)
+            with Stage(name) as running:
+                result = function(*args, **kwargs)
+                if rows is not None:
+                    running.rows = rows(result)
+            return result
+        wrapper.__name__ = function.__name__
+        wrapper.__doc__ = function.__doc__
+        return wrapper
+    return decorate
+
+
+def profiled_chunks(name, chunks):
+    # Hands out the chunks one by one and records the reading of every chunk as stage name
+    chunks = iter(chunks)
+    while True:
+        with stage(name) as running:
+            try:
+                chunk = next(chunks)
+            except StopIteration:
+                running.cancel()
+                return
+            running.rows = len(chunk)
+        yield chunk
+
+
+def summary(records=None):
+    # One line per stage, in the order the stages first started (so a battery comes before the steps inside it): calls,
+    # wall and CPU seconds and rows added up, allocated bytes of the call that allocated the most
+    records = PROFILE['records'] if records is None else records
+    stages, order = {}, []
+    for record in sorted(records, key=lambda record: record['started']):
+        name = record['stage']
+        if name not in stages:
+            order.append(name)
+            stages[name] = {'stage': name, 'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0, 'rows': None,
+                            'allocated_bytes': None}
+        line = stages[name]
+        line['calls'] += 1
+        line['wall_seconds'] += record['wall_seconds']
+        line['cpu_seconds'] += record['cpu_seconds']
+        if record['rows'] is not None:
+            line['rows'] = (line['rows'] or 0) + record['rows']
+        if record['allocated_bytes'] is not None:
+            line['allocated_bytes'] = max(line['allocated_bytes'] or 0, record['allocated_bytes'])
+    for line in stages.values():
+        line['rows_per_second'] = (line['rows'] / line['wall_seconds']
+                                   if line['rows'] is not None and line['wall_seconds'] else None)
+    return [stages[name] for name in order]
+
+
+def report():
+    # Everything that goes into the .json report
+    run_seconds = wall_clock() - PROFILE['started'] if PROFILE['started'] is not None else None
+    return {'python': platform.python_version(), 'run_seconds': run_seconds, 'memory': PROFILE['memory'],
+            'stages': summary()}
+
+
+def format_report(profile=None):
+    # The report as a table. The steps inside a battery are indented under it.
+    profile = report() if profile is None else profile
+    lines = ['%-32s %6s %10s %10s %10s %12s %10s' % ('stage', 'calls', 'wall s', 'cpu s', 'rows', 'rows/second',
+                                                     'alloc MB')]
+    for line in profile['stages']:
+        name = line['stage']
+        if '/' in name:
+            name = '  ' + name.split('/', 1)[1]
+        rows = '-' if line['rows'] is None else '%d' % line['rows']
+        speed = '-' if line['rows_per_second'] is None else '%.0f' % line['rows_per_second']
+        allocated = '-' if line['allocated_bytes'] is None else '%.1f' % (line['allocated_bytes'] / 1e6)
+        lines.append('%-32s %6d %10.4f %10.4f %10s %12s %10s' % (name, line['calls'], line['wall_seconds'],
+                                                                 line['cpu_seconds'], rows, speed, allocated))
+    if profile['run_seconds'] is not None:
+        lines.append('whole run: %.4f seconds' % profile['run_seconds'])
+    return '\n'.join(lines)
+
+
+def write_report(path, report_format=None):
+    # report_format = 'json' or 'text'. Leave it out and a path ending in .json gets json, anything else the table.
+    if report_format is None:
+        report_format = 'json' if path.lower().endswith('.json') else 'text'
+    if report_format not in ['json', 'text']:
+        raise ValueError("report_format has to be 'json' or 'text', not %r" % (report_format,))
+    profile = report()
+    with open(path, 'w') as outfile:
+        if report_format == 'json':
+            json.dump(profile, outfile, indent=1, sort_keys=True)
+        else:
+            outfile.write(format_report(profile) + '\n')
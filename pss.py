@@ -9,12 +9,39 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
-import pandas as pd
-import sys
+from . import engine
 
 # input = the data you are using with with the keys listed below as headers
 
 
+# NEVER         ALMOST NEVER        SOMETIMES       FAIRLY OFTEN    VERY OFTEN
+#   0                1                  2                3               4
+# ------------------------------------------------------------------------------
+# Your 1-5 Qualtrics values are replaced with 0-4 before scoring. There is no prefer not to answer choice.
+# Reverse scores are found by subtracting the answer from 4. The reverse and forward questions are each prorated
+# on their own and then added up to get the total PSS Score.
+SPEC = {
+    'name': 'PSS',
+    'script': 'pss',
+    'nonresp': None,
+    'range': (0, 4),
+    'recode': [(1, 0), (2, 1), (3, 2), (4, 3), (5, 4)],
+    'reverse': 4,
+    'subscales': [
+        {'name': 'positive',
+         'reverse': ['pss_4', 'pss_5', 'pss_7', 'pss_8']},
+        {'name': 'negative',
+         'forward': ['pss_1', 'pss_2', 'pss_3', 'pss_6', 'pss_9', 'pss_10']},
+    ],
+    'totals': [
+        {'of': [('positive', 1), ('negative', 1)],
+         'columns': {'score': 'PSS Score', 'blank': 'PSS Left Blank'}},
+    ],
+}
+
+PLAN = engine.compile_spec(SPEC)
+
+
 def pss(input):
     # PERCEIVED STRESS SCALE
 
@@ -38,89 +65,8 @@ def pss(input):
                                         PSS Score       0       40
     """
     try:
-        # NEVER         ALMOST NEVER        SOMETIMES       FAIRLY OFTEN    VERY OFTEN
-        #   0                1                  2                3               4
-
-        # ------------------------------------------------------------------------------
-        pss_negative_keys_for =['pss_1', 'pss_2', 'pss_3', 'pss_6', 'pss_9', 'pss_10']
-        pss_positive_keys_rev =['pss_4', 'pss_5', 'pss_7', 'pss_8']
-
-
-        # ------------------------------------------------------------------------------
-        # PSS Reverse Scoring
-
-
-        # change the numbers to numeric floats
-        pss_reverse = input[pss_positive_keys_rev].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        pss_reverse_nofit = pss_reverse[(pss_reverse[pss_positive_keys_rev] > 4) | (pss_reverse[pss_positive_keys_rev] < 0)].count(axis=1)
-
-        # These count the number of questions left blank
-        pss_rev_leftblank = pss_reverse.apply(lambda x: sum(x.isnull().values), axis=1)
-
-
-        # reverse the scores by subtracting 4 from the raw data. Score of each item ranges from 0 to 4.
-        # A score of 4 is "VERY OFTEN." It will be marked as 0 after subtraction and a score of 0 will be marked as 4.
-        # sum the reversed scores together to get the PSS Reverse
-        reverse_pss_score = pss_reverse[pss_reverse[pss_positive_keys_rev] <= 4].rsub(4).sum(axis=1, skipna=True)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        reverse_pss_score = reverse_pss_score + (pss_rev_leftblank * reverse_pss_score / (len(pss_positive_keys_rev)-pss_rev_leftblank))
-
-        # ------------------------------------------------------------------------------
-        # PSS Forward Scoring
-
-
-        # change the numbers to numeric floats
-        pss_forward = input[pss_negative_keys_for].apply(pd.to_numeric, args=('raise',)).replace(to_replace=[1, 2, 3, 4, 5], value=[0, 1, 2, 3, 4])
-
-        # Are there any values that don't fit in the value parameters
-        pss_forward_nofit = pss_forward[(pss_forward[pss_negative_keys_for] > 4) | (pss_forward[pss_negative_keys_for] < 0)].count(axis=1)
-
-        # These count the number of questions left blank
-        pss_forward_leftblank = pss_forward.apply(lambda x: sum(x.isnull().values), axis=1)
-
-        # sum the forward scores together to get the PSS Forward score and keeps anything less than or equal to 5
-        forward_pss_score = pss_forward[(pss_forward[pss_negative_keys_for] >= 0) &
-                                        (pss_forward[pss_negative_keys_for] <= 4)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        forward_pss_score = forward_pss_score + (pss_forward_leftblank * forward_pss_score / (len(pss_negative_keys_for)-pss_forward_leftblank))
-
-
-        # ------------------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = pss_reverse_nofit + pss_forward_nofit
-
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your PSS dataset. "
-                         "Please make sure your values range from 1-5 (see pss script)")
-
-
-        # ------------------------------------------------------------------------------
-        # Get the total PSS Score
-        total_pss_score = reverse_pss_score + forward_pss_score
-
-
-        # TOTAL ANSWERS LEFT BLANK
-        total_pss_leftblank = pss_rev_leftblank + pss_forward_leftblank
-
-
-        pssall = pd.DataFrame({'PSS Score': total_pss_score, 'PSS Left Blank': total_pss_leftblank})
-
-        # ------------------------------------------------------------------------------
-
-        # Put the scores into one frame
-        frames = [pssall]
-        result = pd.concat(frames, axis=1)
-        return result
+        # The subscales are described in SPEC above
+        return engine.score(PLAN, engine.numeric_block(input, PLAN['items']), input.index, None)
     except KeyError:
         print("We could not find the PSS headers in your dataset. Please look at the pss function in this package and put in the correct keys.")
     except ValueError:
@@ -9,14 +9,33 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
+import numpy as np
 import pandas as pd
 import sys
 
+from . import engine
+
 
 # input = the data you are using with with the keys listed below as headers
 # nonresval = the Prefer Not To Answer Choice on your Questionnaire
 
 
+QIDS_KEYS = ['QIDS_1', 'QIDS_2', 'QIDS_3', 'QIDS_4', 'QIDS_5', 'QIDS_6', 'QIDS_7', 'QIDS_8', 'QIDS_9', 'QIDS_10',
+             'QIDS_11', 'QIDS_12', 'QIDS_13', 'QIDS_14', 'QIDS_15', 'QIDS_16']
+MEMBERSHIP = engine.membership_matrix(QIDS_KEYS, [QIDS_KEYS])
+
+# The 9 symptom domains: sleep, weight, psychomotor, then the 6 domains rated by 1 question
+# (mood, concentration, self criticism, suicidal ideation, interest, energy)
+DOMAINS = [['QIDS_1', 'QIDS_2', 'QIDS_3', 'QIDS_4'], ['QIDS_6', 'QIDS_7', 'QIDS_8', 'QIDS_9'], ['QIDS_15', 'QIDS_16'],
+           ['QIDS_5'], ['QIDS_10'], ['QIDS_11'], ['QIDS_12'], ['QIDS_13'], ['QIDS_14']]
+DOMAIN_ORDER = np.array([QIDS_KEYS.index(key) for domain in DOMAINS for key in domain])
+DOMAIN_STARTS = np.cumsum([0] + [len(domain) for domain in DOMAINS[:-1]])
+SINGLE_DOMAINS = np.array([len(domain) == 1 for domain in DOMAINS])
+
+# Qualtrics answers 1-4 are scored 0-3, anything else is not scored
+RECODE = engine.lookup_table([(1, 0), (2, 1), (3, 2), (4, 3)], other=np.nan)
+
+
 def qids(input, nonresp):
 
     # QUICK INVENTORY OF DEPRESSIVE SYMPTOMS - SELF RATED (QIDS-SR16)
@@ -51,113 +70,43 @@ def qids(input, nonresp):
     # NONE    MILD    MODERATE    SEVERE    PREFER NOT TO ANSWER
     #  0       1         2          3             YOUR #
     try:
-        qids_keys = ['QIDS_1', 'QIDS_2', 'QIDS_3', 'QIDS_4', 'QIDS_5', 'QIDS_6', 'QIDS_7', 'QIDS_8', 'QIDS_9', 'QIDS_10',
-                     'QIDS_11', 'QIDS_12', 'QIDS_13', 'QIDS_14', 'QIDS_15', 'QIDS_16']
-
-
-        sleep_keys = ['QIDS_1', 'QIDS_2', 'QIDS_3', 'QIDS_4']
-        weight_keys = ['QIDS_6', 'QIDS_7', 'QIDS_8', 'QIDS_9']
-        psychomotor_keys = ['QIDS_15', 'QIDS_16']
-        mood_key = ['QIDS_5']
-        concentration_key = ['QIDS_10']
-        self_criticism_key = ['QIDS_11']
-        suicidal_key = ['QIDS_12']
-        interest_key = ['QIDS_13']
-        energy_key = ['QIDS_14']
-
-        # ------------------------------------------------------------------------------
-        # COUNTS UP SCORES LEFT BLANK OR PREFER NOT TO ANSWER
-        qids = input[qids_keys].apply(pd.to_numeric, args=('raise',), axis=1)
-
-        # Are there any values that don't fit in the value parameters
-        qids_nofit = qids[(qids[qids_keys] != nonresp['QIDS']) &
-                                  (qids[qids_keys] > 4) |
-                                  (qids[qids_keys] < 1)].count(axis=1)
-
-        qids_leftblank = qids.apply(lambda x: sum(x.isnull().values), axis=1)
-        qids_prefernotanswer = qids[qids[qids_keys] == nonresp['QIDS']].count(axis=1)
-
-        # ------------------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = qids_nofit
-
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your QIDS dataset. "
-                         "Please make sure your values range from 1-4 (see qids script) and have only ONE prefer not to answer value.")
-        # ------------------------------------------------------------------------------
-
-
-        # For sleep, weight, and psychomotor, just gets the MAX SINGLE SCORE from each domain
-        sleep = input[sleep_keys].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
-
-        sleepvalue = sleep[(sleep[sleep_keys] >= 0) & (sleep[sleep_keys] <= 3)].max(axis=1, skipna=True)
-
-        # ---------------------------
-        weight = input[weight_keys].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
-
-        weightvalue = weight[(weight[weight_keys] >= 0) & (weight[weight_keys] <= 3)].max(axis=1, skipna=True)
-
-        # ---------------------------
-        psychomotor = input[psychomotor_keys].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
-
-        psychvalue = psychomotor[(psychomotor[psychomotor_keys] >= 0) & (psychomotor[psychomotor_keys] <= 3)].max(axis=1, skipna=True)
-
-        # ------------------------------------------------------------------------------
-        # replaces the qualtrics value with the scoring value for each domain
-        mood = input[mood_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
-
-        moodscore = mood[(mood[mood_key] >= 0) & (mood[mood_key] <= 3)].sum(axis=1, skipna=True)
-
-        # ---------------------------
-        concentration = input[concentration_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
-
-        concscore = concentration[(concentration[concentration_key] >= 0) & (concentration[concentration_key] <= 3)].sum(axis=1, skipna=True)
-
-        # ---------------------------
-        selfcrit = input[self_criticism_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
+        return score_items(engine.numeric_block(input, QIDS_KEYS), input.index, nonresp)
+    except KeyError:
+        print("We could not find the QIDS headers in your dataset. Please look at the qids function in this package and put in the correct keys.")
+    except ValueError:
+        print("We found strings in your QIDS dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
 
-        critscore = selfcrit[(selfcrit[self_criticism_key] >= 0) & (selfcrit[self_criticism_key] <= 3)].sum(axis=1,skipna=True)
 
-        # ---------------------------
-        suicidal = input[suicidal_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
+def score_items(qids, index, nonresp):
+    # qids = the QIDS_KEYS answers as numeric floats, index = the row index of your dataframe
+    leftblank, prefernotanswer, nofit = engine.count_missing(qids, MEMBERSHIP, nonresp['QIDS'], 1, 4)
+    qids_leftblank = pd.Series(leftblank[:, 0], index=index)
+    qids_prefernotanswer = pd.Series(prefernotanswer[:, 0], index=index)
 
-        suicidescore = suicidal[(suicidal[suicidal_key] >= 0) & (suicidal[suicidal_key] <= 3)].sum(axis=1, skipna=True)
+    if nofit.any():
+        sys.exit("We found values that don't match parameter values for calculation in your QIDS dataset. "
+                 "Please make sure your values range from 1-4 (see qids script) and have only ONE prefer not to answer value.")
 
-        # ---------------------------
-        interest = input[interest_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
+    # Recodes all 16 answers from 1-4 to 0-3 at once. Blanks and prefer not to answer become NaN.
+    recoded = engine.lookup(RECODE, qids)
 
-        interestscore = interest[(interest[interest_key] >= 0) & (interest[interest_key] <= 3)].sum(axis=1, skipna=True)
+    # The highest answer of every domain, with the questions put in domain order so each domain is one run of columns.
+    # fmax skips NaN, so a domain is only NaN when all of its questions are unanswered.
+    domains = np.fmax.reduceat(recoded[:, DOMAIN_ORDER], DOMAIN_STARTS, axis=1)
 
-        # ---------------------------
-        energy = input[energy_key].apply(pd.to_numeric, args=('raise',), axis=1).replace(to_replace=[1, 2, 3, 4],
-                                                                                       value=[0, 1, 2, 3])
+    # The 1 question domains count as 0 when unanswered, the domains with more questions make the total NaN
+    domains[:, SINGLE_DOMAINS] = np.nan_to_num(domains[:, SINGLE_DOMAINS])
+    qids_score = pd.Series(domains.sum(axis=1), index=index)
 
-        energyscore = energy[(energy[energy_key] >= 0) & (energy[energy_key] <= 3)].sum(axis=1, skipna=True)
+    qidsall = pd.DataFrame(
+        {'QIDS_Score': qids_score, 'QIDS_Left_Blank': qids_leftblank,
+         'QIDS_Prefer_Not_to_Answer': qids_prefernotanswer})
 
-        # ------------------------------------------------------------------------------
-        # SUMS THE SCORES UP!
-        qids_score = sleepvalue + weightvalue + psychvalue + moodscore + concscore + critscore + suicidescore + interestscore + energyscore
 
-        qidsall = pd.DataFrame(
-            {'QIDS_Score': qids_score, 'QIDS_Left_Blank': qids_leftblank,
-             'QIDS_Prefer_Not_to_Answer': qids_prefernotanswer})
+    # ------------------------------------------------------------------------------
+    frames = [qidsall]
+    result = pd.concat(frames, axis=1)
+    return result
 
 
-        # ------------------------------------------------------------------------------
-        frames = [qidsall]
-        result = pd.concat(frames, axis=1)
-        return result
-    except KeyError:
-        print "We could not find the QIDS headers in your dataset. Please look at the qids function in this package and put in the correct keys."
-    except ValueError:
-        print("We found strings in your QIDS dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
\ No newline at end of file
+PLAN = engine.custom_plan(QIDS_KEYS, score_items, range=(1, 4), nonresp='QIDS', name='qids')
@@ -9,9 +9,13 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
+import numpy as np
 import pandas as pd
 import sys
 
+from . import cache
+from . import profiling
+
 
 """
 1. This reader function converts your .csv datafile into a pandas dataframe that subsequent functions
@@ -21,15 +25,42 @@ in this package can use.
 each self-report function in your dataset in some way.
 
 3. Please check the skeleton script for further instructions.
+
+4. If your datafile is too big to fit in memory twice over, use chunked_reader instead. It reads the datafile
+a few thousand rows at a time and hands back dataframes that every self-report function can score one after the other.
+
+5. If your datafile has many more columns than the ones in your column dictionary, call either reader with compact=True.
+Only the columns named in COLUMN_NAME are read, and each self-report column is stored as the smallest whole number type
+that fits your answers (usually 1 byte per answer instead of 8). Blank answers stay blank. The raw_data_frame you get
+back then only holds the columns in your column dictionary.
+
+6. If you read the same big datafile over and over (for example every time you rerun the skeleton script), give the reader
+a folder with cache_dir='your_cache_folder'. The first run reads your datafile with compact=True and saves the dataframe
+in that folder. Every later run on the same datafile and column dictionary loads it back almost instantly instead of
+reading the csv again. Nothing is read from the datafile itself on those runs, so the raw_data_frame you get back is None.
+
+7. With profiling on, every call of the reader and every chunk of chunked_reader is recorded (see profiling.py).
 """
 
-def reader(datafilepath, columndictionary):
+@profiling.profiled('reader.reader', rows=lambda inputs: len(inputs[0]))
+def reader(datafilepath, columndictionary, compact=False, cache_dir=None):
     # Read your raw data and the column dictionary
     try:
-        raw_data_frame = pd.read_csv(datafilepath)
         question_dict = pd.read_csv(columndictionary)
+        if cache_dir is not None:
+            # Reuse the dataframe saved by an earlier run on exactly the same datafile and column dictionary
+            key = cache.cache_key(datafilepath, columndictionary)
+            df = cache.load(cache_dir, key)
+            if df is not None:
+                return df, None, question_dict, nonresponse_dict(question_dict)
+            compact = True
+        if compact:
+            raw_data_frame = compact_frame(pd.read_csv(datafilepath, **compact_options(datafilepath, question_dict)),
+                                           question_dict)
+        else:
+            raw_data_frame = pd.read_csv(datafilepath)
     except IOError:
-        print "IO ERROR: one of the pathnames for your column dictionary or datafile does not exist. Please type in a valid pathname for both."
+        print("IO ERROR: one of the pathnames for your column dictionary or datafile does not exist. Please type in a valid pathname for both.")
 
 
     # Turn the raw data frame into a pandas dataframe
@@ -37,15 +68,110 @@ def reader(datafilepath, columndictionary):
     """NOTE: If your raw dataframe has 3 rows before the actual self-report data is seen, delete the 3rd row that says {import ID: ...}
     because the df variable below will show that 3rd row if it is not deleted. Data is taken starting from row index 1 (the 2nd row after your headers)
     in the question headers, not index 0 or 2."""
-    df = pd.DataFrame(raw_data_frame, index=range(1, len(raw_data_frame)),
-                                columns=question_dict['COLUMN_NAME'])
+    if compact:
+        df = pd.DataFrame(raw_data_frame, columns=question_dict['COLUMN_NAME'])
+    else:
+        df = pd.DataFrame(raw_data_frame, index=range(1, len(raw_data_frame)),
+                                    columns=question_dict['COLUMN_NAME'])
     df.columns = question_dict['QUESTION_NAME']
 
+    nonresponse = nonresponse_dict(question_dict)
+
+    if cache_dir is not None:
+        cache.save(cache_dir, key, df)
+
+    return df, raw_data_frame, question_dict, nonresponse
+
+
+def chunked_reader(datafilepath, columndictionary, chunksize=10000, compact=False):
+    # Read the column dictionary up front. The datafile itself is only opened here and read chunk by chunk
+    # when you loop over the chunks, so only one chunk of your raw data is ever held in memory.
+    try:
+        question_dict = pd.read_csv(columndictionary)
+        if compact:
+            raw_chunks = (compact_frame(raw_chunk, question_dict) for raw_chunk in
+                          pd.read_csv(datafilepath, chunksize=chunksize, **compact_options(datafilepath, question_dict)))
+        else:
+            # pandas doesn't count the fields of the first row of every chunk, so one more column than your headers is
+            # read and renamed_chunks stops at any row that fills it
+            headers = list(pd.read_csv(datafilepath, nrows=0).columns)
+            raw_chunks = pd.read_csv(datafilepath, chunksize=chunksize, header=None, skiprows=[0],
+                                     names=headers + [EXTRA_FIELDS])
+    except IOError:
+        print("IO ERROR: one of the pathnames for your column dictionary or datafile does not exist. Please type in a valid pathname for both.")
+        return
+
+    nonresponse = nonresponse_dict(question_dict)
+
+    return renamed_chunks(raw_chunks, question_dict), question_dict, nonresponse
 
+
+# the extra column chunked_reader reads to find rows with more fields than headers
+EXTRA_FIELDS = 'batteryscores_extra_fields'
+
+
+def renamed_chunks(raw_chunks, question_dict):
+    # Same renaming as the reader above, applied to one chunk at a time.
+    # The chunks keep counting rows where the last one stopped, so the first chunk is the only one that
+    # has the row index 0 (the 2nd row after your headers) and the row numbers match what reader gives you.
+    line = 2
+    for raw_chunk in profiling.profiled_chunks('reader.chunked_reader', raw_chunks):
+        if EXTRA_FIELDS in raw_chunk.columns:
+            # A first row with even more fields is turned into row names by pandas, so the row names aren't numbers
+            extra = np.flatnonzero(raw_chunk[EXTRA_FIELDS].notnull().values)
+            if raw_chunk.index.dtype.kind not in 'iu':
+                extra = [0]
+            if len(extra):
+                raise ValueError("Line %d of your datafile has more fields than there are headers." % (line + extra[0]))
+        line += len(raw_chunk)
+        raw_chunk = raw_chunk.drop(0, errors='ignore')
+        df = pd.DataFrame(raw_chunk, columns=question_dict['COLUMN_NAME'])
+        df.columns = question_dict['QUESTION_NAME']
+        yield df
+
+
+def compact_options(datafilepath, question_dict):
+    # Only ask pandas for the columns that are both in the column dictionary and in your datafile.
+    # The 2nd row after your headers (the question text) is skipped while reading, so the answers are read as numbers
+    # instead of text. The row numbers are shifted back by compact_frame so they match what reader gives you.
+    # pandas doesn't count the fields of a row when it only reads some of the columns, so a row with more fields than
+    # headers is not found in compact mode.
+    headers = pd.read_csv(datafilepath, nrows=0).columns
+    wanted = set(question_dict['COLUMN_NAME'])
+    return {'usecols': [column for column in headers if column in wanted], 'skiprows': [1]}
+
+
+def compact_frame(raw_data_frame, question_dict):
+    # Start counting rows at 1, like the reader does after dropping the question text row
+    raw_data_frame.index = raw_data_frame.index + 1
+
+    # Every self-report column (anything that is not a SUBJ column) that only holds whole numbers is stored as
+    # the smallest nullable whole number type that fits, so blank answers stay blank. Columns with text in them are
+    # left alone so each self-report function can still tell you about the strings it found.
+    for idx, item in enumerate(question_dict['QUESTION_NAME']):
+        column = question_dict['COLUMN_NAME'][idx]
+        if item.split('_')[0] == 'SUBJ' or column not in raw_data_frame.columns:
+            continue
+        answers = raw_data_frame[column]
+        if answers.dtype.kind not in 'iuf':
+            continue
+        answered = answers.dropna()
+        if (answered % 1 != 0).any():
+            continue
+        for dtype, low, high in SMALL_INTEGER_TYPES:
+            if answered.empty or (answered.min() >= low and answered.max() <= high):
+                raw_data_frame[column] = answers.astype(dtype)
+                break
+    return raw_data_frame
+
+
+# nullable whole number types from smallest to largest, with the range of values each can hold
+SMALL_INTEGER_TYPES = [('Int8', -128, 127), ('Int16', -32768, 32767), ('Int32', -2147483648, 2147483647)]
+
+
+def nonresponse_dict(question_dict):
     # Zip Prefer Not To Answer Choices into a dictionary with the Self-Report Question Names so that functions can reference them
     scale_list = [item.split('_')[0] for item in question_dict['QUESTION_NAME'] if item.split('_')[0] != 'SUBJ']
     nonresvals = [question_dict['PreferNotToAnswerSelection'][idx] for idx, item in enumerate(question_dict['QUESTION_NAME']) if
                   item.split('_')[0] != 'SUBJ']
-    nonresponse = dict(zip(scale_list, nonresvals))
-
-    return df, raw_data_frame, question_dict, nonresponse
\ No newline at end of file
+    return dict(zip(scale_list, nonresvals))
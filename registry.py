@@ -0,0 +1,150 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import json
+import os
+
+from . import engine
+
+
+"""
+1. To score a questionnaire that is not in this package, describe it in a .json (or .toml) file with the same keys as the
+SPEC at the top of ncog.py (the keys are explained at the top of engine.py) and register it:
+
+    registry.register_file('grit.json')
+    result = scoreall.score_all(df, nonresp)
+    grit_scores = registry.score('grit', df, nonresp)
+
+The scale is compiled by engine.compile_spec into the same kind of plan as the built-in batteries, so it is scored the
+same way and just as fast. Once registered it is one of the batteries score_all, validate and the command line score.
+
+2. A .json file for a 6 item scale with one total could look like this:
+
+    {"name": "GRIT", "script": "grit", "nonresp": "grit", "range": [1, 5], "reverse": 6,
+     "subscales": [{"name": "consistency", "forward": ["grit_1", "grit_2"], "reverse": ["grit_3"]},
+                   {"name": "perseverance", "forward": ["grit_4", "grit_5", "grit_6"], "missing": "mean"}],
+     "totals": [{"of": [["consistency", 1], ["perseverance", 1]], "divisor": 2,
+                 "columns": {"score": "GRIT_Score", "blank": "GRIT_Left_Blank", "pna": "GRIT_Prefer_Not_to_Answer"}}]}
+
+'script' is the name you give score_all(batteries=[...]) and registry.score (name in lower case if you leave it out).
+'nonresp' is the key of the scale's Prefer Not To Answer choice in the reader's nonresponse dictionary, which is the
+start of its question names in your column dictionary (here grit_...), or null if the scale has none.
+
+3. register_folder registers every .json and .toml file in a folder, so a lab can keep all its own scales in one place.
+Reading .toml files needs Python 3.11 or newer, or the toml package.
+
+4. A spec that is missing a key, uses a subscale that doesn't exist in a total, or has the name of a built-in battery
+stops register with a ValueError that says what is wrong.
+"""
+
+# The registered scales: script name -> {'spec': the spec, 'plan': its compiled plan, 'source': the file it came from}
+SCALES = {}
+
+MISSING_RULES = ['prorate', 'prorate_items', 'mean', 'sum']
+
+
+def register(spec, source=None):
+    # Checks the spec, compiles it and adds it to the registered scales. Registering the same name again replaces it.
+    # Returns the script name the scale is registered under.
+    spec = dict(spec)
+    spec.setdefault('script', str(spec.get('name', '')).lower())
+    spec.setdefault('nonresp', None)
+    check_spec(spec, source)
+    SCALES[spec['script']] = {'spec': spec, 'plan': engine.compile_spec(spec), 'source': source}
+    return spec['script']
+
+
+def register_file(path):
+    return register(read_spec(path), path)
+
+
+def register_folder(folder):
+    # Registers every .json and .toml file in the folder, in alphabetical order. Returns their script names.
+    return [register_file(os.path.join(folder, file_name)) for file_name in sorted(os.listdir(folder))
+            if os.path.splitext(file_name)[1].lower() in ['.json', '.toml']]
+
+
+def unregister(name):
+    SCALES.pop(name, None)
+
+
+def names():
+    # The registered scales in alphabetical order, which is the order score_all puts them in after the built-in batteries
+    return sorted(SCALES)
+
+
+def score(name, input, nonresp=None):
+    # The self-report function of a registered scale, called like the built-in ones
+    plan = SCALES[name]['plan']
+    try:
+        return engine.score(plan, engine.numeric_block(input, plan['items']), input.index, nonresp)
+    except KeyError:
+        print("We could not find the %s headers in your dataset. Please look at the %s spec you registered and put in "
+              "the correct keys." % (name, name))
+    except ValueError:
+        print("We found strings in your %s dataset. Please make sure there are no strings/letters in your input. "
+              "Otherwise, we can't do our thang." % name)
+
+
+def read_spec(path):
+    if os.path.splitext(path)[1].lower() == '.toml':
+        return read_toml(path)
+    with open(path) as infile:
+        return json.load(infile)
+
+
+def read_toml(path):
+    try:
+        import tomllib
+        with open(path, 'rb') as infile:
+            return tomllib.load(infile)
+    except ImportError:
+        pass
+    try:
+        import toml
+    except ImportError:
+        raise ImportError("Reading %s needs Python 3.11 or newer, or the toml package (pip install toml). "
+                          "You can also write the spec as a .json file." % path)
+    with open(path) as infile:
+        return toml.load(infile)
+
+
+def check_spec(spec, source=None):
+    where = ' in %s' % source if source else ''
+    for key in ['name', 'range', 'subscales']:
+        if key not in spec:
+            raise ValueError("The %s spec%s has no '%s'. See engine.py for the keys a spec needs."
+                             % (spec.get('name', 'scale'), where, key))
+    if not spec['script']:
+        raise ValueError("The spec%s needs a 'name'." % where)
+    # scoreall.py looks up the registered scales, so it is imported here instead of at the top
+    from . import scoreall
+    if spec['script'] in dict(scoreall.BATTERIES):
+        raise ValueError("%s is already a battery in this package. Please give your %s spec%s another name."
+                         % (spec['script'], spec['name'], where))
+    if len(spec['range']) != 2:
+        raise ValueError("The 'range' of the %s spec%s has to be [min, max]." % (spec['name'], where))
+
+    subscales = [subscale.get('name') for subscale in spec['subscales']]
+    for subscale in spec['subscales']:
+        if not subscale.get('forward') and not subscale.get('reverse'):
+            raise ValueError("The %s subscale %s%s has no items." % (spec['name'], subscale.get('name'), where))
+        if subscale.get('reverse') and 'reverse' not in spec:
+            raise ValueError("The %s spec%s has reverse scored items but no 'reverse' number to subtract them from."
+                             % (spec['name'], where))
+        if subscale.get('missing', 'prorate') not in MISSING_RULES:
+            raise ValueError("The 'missing' of the %s subscale %s%s has to be one of %s."
+                             % (spec['name'], subscale.get('name'), where, ', '.join(MISSING_RULES)))
+    for total in spec.get('totals', []):
+        for name, weight in total['of']:
+            if name not in subscales:
+                raise ValueError("A total of the %s spec%s adds up %s, which is not one of its subscales (%s)."
+                                 % (spec['name'], where, name, ', '.join(map(str, subscales))))
@@ -22,6 +22,10 @@ Next, download your data and input the question headers into the column dictiona
 
 5. If you use our template to prepare calling the script, to actually call the skeleton script in the terminal, do this:
     - python skeletonscript.py intputfile(your data file pathname) datadicfile(the column dictionary pathname) outputfile(whatever you want to call it)
+
+6. For scheduled batch jobs, the same thing can be done without this script from the command line, with options for
+which batteries to score, parallel jobs, chunked reading and the output format (see cli.py in the package):
+    - python -m batteryscores score inputfile datadicfile -o outputfile --batteries neoffi,tci --jobs 4
 """
 
 
@@ -0,0 +1,185 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import warnings
+
+import pandas as pd
+
+from . import synthetic
+
+try:
+    import resource
+except ImportError:
+    # Windows has no resource module, so peak memory is left out of the results
+    resource = None
+
+
+"""
+1. Measures how the whole pipeline scales: reading the datafile (reader.reader), scoring every battery, putting the
+scores together (pd.concat) and writing them with to_csv. benchmark.py times the battery functions on their own; this
+times everything a nightly run does. From the folder that holds the batteryscores package:
+
+    python -m batteryscores.scaling
+    python -m batteryscores.scaling --rows 1000,10000,100000 --extra-columns 0,1000 --jobs 1,2,4 --output curves.csv
+
+2. For every number of rows and extra columns, write_export writes a Qualtrics-shaped datafile with synthetic.py (the
+headers of the column dictionary, the row of question texts and then one row per participant) plus the matching
+column_dictionary.csv in --folder. The answers are random and in range for every battery, and extra_columns adds that
+many columns that are not in the column dictionary, like the many unrelated columns of a real Qualtrics export.
+
+3. The pipeline is run in three modes:
+
+    serial     reader.reader, then scoreall.score_all and to_csv
+    chunked    reader.chunked_reader with --chunk-size rows at a time, each chunk scored and added to the csv
+    parallel   reader.reader, then scoreall.score_all with jobs worker processes, once for every number in --jobs
+
+Give --compact to read the datafiles with compact=True in every mode (see reader.py).
+
+4. Every run happens in a fresh python process, so the peak memory (peak RSS of the process and its workers) of one run
+is never mixed up with another. The results (seconds, rows per second and peak RSS for every mode, number of rows,
+number of columns and jobs) are printed as a table and written to --output as a .csv, ready to plot as scaling curves.
+"""
+
+ROWS = [1000, 10000, 100000]
+MODES = ['serial', 'chunked', 'parallel']
+RESULT_COLUMNS = ['mode', 'rows', 'columns', 'jobs', 'seconds', 'rows_per_second', 'peak_rss_bytes']
+
+COLUMN_DICTIONARY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'sampledataset_columndict_scriptToCallFunctions', 'column_dictionary.csv')
+
+
+def run_scaling(folder, rows=None, extra_columns=None, jobs=None, modes=None, chunk_size=10000, seed=0, compact=False):
+    # Returns one result per run, see 4. above
+    rows = rows or ROWS
+    extra_columns = extra_columns or [0]
+    jobs = jobs or [2]
+    modes = modes or MODES
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+
+    results = []
+    for extra in extra_columns:
+        for count in rows:
+            datafile = os.path.join(folder, 'export_%d_rows_%d_extra.csv' % (count, extra))
+            dictionary = os.path.join(folder, 'column_dictionary.csv')
+            columns = write_export(datafile, dictionary, count, extra, seed)
+            for mode in modes:
+                for workers in (jobs if mode == 'parallel' else [1]):
+                    result = measure(mode, datafile, dictionary, workers, chunk_size, folder, compact)
+                    result.update({'mode': mode, 'rows': count, 'columns': columns, 'jobs': workers})
+                    result['rows_per_second'] = count / result['seconds'] if result['seconds'] else None
+                    results.append(result)
+            os.remove(datafile)
+    return results
+
+
+def write_export(datafile, dictionary, rows, extra_columns=0, seed=0, chunk_rows=10000):
+    # Writes the datafile (with synthetic.py, a chunk of rows at a time so big files never sit in memory) and the column
+    # dictionary, see 2. above. Returns the number of columns in the datafile.
+    question_dict = pd.read_csv(COLUMN_DICTIONARY)
+    question_dict.to_csv(dictionary, index=False)
+    return synthetic.write_export(datafile, question_dict, rows, seed=seed, extra_columns=extra_columns,
+                                  block_rows=chunk_rows)
+
+
+def measure(mode, datafile, dictionary, jobs=1, chunk_size=10000, folder='.', compact=False):
+    # Runs one pipeline in a fresh python process and returns its seconds and peak RSS
+    package_folder = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join([package_folder] + [path for path in
+                                                                    [os.environ.get('PYTHONPATH')] if path])
+    command = [sys.executable, '-m', __package__ + '.scaling', '--run', mode, datafile, dictionary, str(jobs),
+               str(chunk_size), os.path.join(folder, 'scores.csv'), str(int(compact))]
+    output = subprocess.check_output(command, env=environment)
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def run_pipeline(mode, datafile, dictionary, jobs, chunk_size, scoresfile, compact=False):
+    # The pipeline itself, see 3. above. Runs inside the fresh process started by measure.
+    from . import reader
+    from . import scoreall
+
+    # The row of question texts makes pandas warn about mixed types in every column when reading without compact=True
+    warnings.simplefilter('ignore', pd.errors.DtypeWarning)
+    start = time.time()
+    if mode == 'chunked':
+        chunks, question_dict, nonresp = reader.chunked_reader(datafile, dictionary, chunk_size, compact)
+        for number, df in enumerate(chunks):
+            result = scoreall.score_all(df, nonresp)
+            result.to_csv(scoresfile, mode='w' if number == 0 else 'a', header=(number == 0))
+    else:
+        df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, dictionary, compact)
+        del raw_data_frame
+        if mode == 'parallel':
+            result = scoreall.score_all(df, nonresp, jobs=jobs, pool='process')
+        else:
+            result = scoreall.score_all(df, nonresp)
+        result.to_csv(scoresfile)
+    return {'seconds': time.time() - start, 'peak_rss_bytes': peak_rss()}
+
+
+def peak_rss():
+    # The most memory this process and its (finished) worker processes ever held
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux counts kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def format_results(results):
+    lines = ['%-9s %9s %8s %5s %10s %12s %12s' % ('mode', 'rows', 'columns', 'jobs', 'seconds', 'rows/second', 'peak MB')]
+    for result in results:
+        peak = '-' if result['peak_rss_bytes'] is None else '%.1f' % (result['peak_rss_bytes'] / 1e6)
+        speed = '-' if result['rows_per_second'] is None else '%.0f' % result['rows_per_second']
+        lines.append('%-9s %9d %8d %5d %10.3f %12s %12s' % (result['mode'], result['rows'], result['columns'],
+                                                            result['jobs'], result['seconds'], speed, peak))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['--run']:
+        mode, datafile, dictionary, jobs, chunk_size, scoresfile, compact = argv[1:8]
+        print(json.dumps(run_pipeline(mode, datafile, dictionary, int(jobs), int(chunk_size), scoresfile,
+                                      compact == '1')))
+        return 0
+
+    parser = argparse.ArgumentParser(prog='batteryscores.scaling', description='Time the whole scoring pipeline.')
+    parser.add_argument('--rows', default=','.join(map(str, ROWS)), help='comma separated numbers of participants')
+    parser.add_argument('--extra-columns', default='0', help='comma separated numbers of columns to add')
+    parser.add_argument('--jobs', default='2', help='comma separated numbers of workers for the parallel mode')
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compact', action='store_true', help='read the datafiles with compact=True')
+    parser.add_argument('--folder', default='batteryscores_scaling', help='where the datafiles are written')
+    parser.add_argument('--output', default=None, help='write the results to this .csv')
+    args = parser.parse_args(argv)
+
+    results = run_scaling(args.folder, [int(count) for count in args.rows.split(',')],
+                          [int(count) for count in args.extra_columns.split(',')],
+                          [int(count) for count in args.jobs.split(',')], args.modes.split(','), args.chunk_size,
+                          args.seed, args.compact)
+    print(format_results(results))
+    if args.output:
+        pd.DataFrame(results, columns=RESULT_COLUMNS).to_csv(args.output, index=False)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
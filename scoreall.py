@@ -0,0 +1,282 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import importlib
+import multiprocessing
+import sys
+from multiprocessing.pool import ThreadPool
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from . import profiling
+from . import registry
+from . import subjectid
+
+
+"""
+1. score_all scores many self-report batteries with one call, instead of calling every battery function yourself and
+concatenating the results:
+
+    result = scoreall.score_all(df, nonresp)
+    result = scoreall.score_all(df, nonresp, batteries=['neoffi', 'tci'])
+
+2. The columns of every battery you ask for are pulled out of the dataframe and turned into numbers ONCE, and every
+battery is scored straight from that one array. Leave batteries out and all of them are scored, in the order of
+BATTERIES below (the same order as the skeleton script).
+
+3. The result starts with the SUBJ_ID column from subjectid and has the same row index as your dataframe, followed by
+the columns of each battery in the order you asked for them. It is exactly what you get from concatenating the
+single battery functions.
+
+4. If a battery's headers are missing from your dataset, or its answers have strings in them, that battery is scored by
+its own function instead, which prints the usual message and is left out of the result.
+
+5. Give jobs=4 (or any number of workers) to score that many batteries at the same time. The result is exactly the same,
+columns in the same order, only faster when you have more than one core and many participants:
+
+    result = scoreall.score_all(df, nonresp, jobs=4)
+    result = scoreall.score_all(df, nonresp, jobs=4, pool='process')
+
+Threads (pool='thread', the default) share the converted answers without copying them, and most of the work happens
+inside numpy, which lets other threads run in the meantime. Processes (pool='process') sidestep Python's global lock
+altogether for the parts that run in pure Python (ddq, qids), at the cost of sending each battery's answers to its worker.
+
+6. For millions of participants, score_sharded splits the participants into blocks of rows instead and scores every
+block in its own process. The answers are put in shared memory once, so the workers read them without a copy being
+sent to each one, and the blocks are put back together in the original row order:
+
+    result = scoreall.score_sharded(df, nonresp, batteries=['tci'], jobs=8)
+    result = scoreall.score_sharded(df, nonresp, jobs=8, shard_rows=100000)
+
+7. Give plans=columndict.compile_plans(question_dict) to either function to score the batteries the way your column
+dictionary describes them instead of the way their .py files do (see columndict.py).
+
+8. Scales registered with registry.py are scored like the batteries of the package. Leave batteries out and they come
+after the batteries in BATTERIES, in alphabetical order.
+
+9. With profiling on, the conversion of the answers, every battery and the final concat are recorded (see profiling.py).
+"""
+
+# battery name, and whether its function takes the Prefer Not To Answer values (nonresp)
+BATTERIES = [('bisbas', True), ('stai', True), ('barratt', True), ('bapq', True), ('neoffi', True), ('dospert', True),
+             ('poms', True), ('pss', False), ('shipley', False), ('tci', True), ('teps', False), ('snaith', False),
+             ('ddq', False), ('qids', True), ('ncog', True)]
+
+
+def score_all(input, nonresp, batteries=None, jobs=1, pool='thread', quarantine=False, plans=None):
+    # input = the dataframe from the reader, nonresp = the Prefer Not To Answer values from the reader
+    # jobs = how many batteries are scored at the same time, pool = 'thread' or 'process' (see 5. above)
+    # quarantine = True puts participants with bad answers aside and returns (result, rejects), see validate.py
+    # plans = {battery name: plan} used instead of the batteries' own plans, see 7. above
+    if batteries is None:
+        batteries = battery_names()
+    if quarantine:
+        # validate.py uses the battery list above, so it is imported here instead of at the top
+        from . import validate
+        input, rejects = validate.quarantine(input, nonresp, batteries, plans)
+        return score_all(input, nonresp, batteries, jobs, pool, plans=plans), rejects
+    plans = battery_plans(batteries, plans)
+
+    values, start = shared_block(input, batteries, plans)
+
+    names = [name for name in batteries if name in start]
+    tasks = [(plans[name], values[:, start[name]:start[name] + len(plans[name]['items'])], input.index, nonresp)
+             for name in names]
+    scored = dict(zip(names, run_tasks(tasks, jobs, pool)))
+
+    frames = [subjectid.subjectid(input)]
+    for name in batteries:
+        frame, stop = scored.get(name, (None, None))
+        if stop is not None:
+            # values out of range stop the program, the same way (and for the same battery) as scoring one at a time
+            sys.exit(stop)
+        if frame is None:
+            # no headers, strings in the answers, or no Prefer Not To Answer value: its own function says so
+            frame = battery_function(name)(input, nonresp)
+        frames.append(frame)
+
+    with profiling.stage('scoreall.concat', len(input)):
+        return pd.concat([frame for frame in frames if frame is not None], axis=1)
+
+
+def score_sharded(input, nonresp, batteries=None, jobs=2, shard_rows=None, quarantine=False, plans=None):
+    # Same result as score_all, for cohorts so big that even one battery is slow (see 6. above).
+    # shard_rows = participants per block, by default the rows are split evenly over the jobs
+    if jobs < 1:
+        raise ValueError("jobs has to be 1 or more, not %r" % (jobs,))
+    if batteries is None:
+        batteries = battery_names()
+    if quarantine:
+        # validate.py uses the battery list above, so it is imported here instead of at the top
+        from . import validate
+        input, rejects = validate.quarantine(input, nonresp, batteries, plans)
+        return score_sharded(input, nonresp, batteries, jobs, shard_rows, plans=plans), rejects
+    plans = battery_plans(batteries, plans)
+    values, start = shared_block(input, batteries, plans)
+    scored = dict((name, None) for name in start)
+
+    if start and not len(values):
+        # No participants (for example all of them were put aside), so there are no rows to split: every battery is
+        # scored on the empty block here and gives its columns with no rows, just like score_all
+        for name in start:
+            plan = plans[name]
+            scored[name] = score_battery((plan, values[:, start[name]:start[name] + len(plan['items'])], input.index,
+                                          nonresp))
+    elif start:
+        rows, width = values.shape
+        if shard_rows is None:
+            shard_rows = -(-rows // jobs)
+        shards = [(first, min(first + shard_rows, rows)) for first in range(0, rows, max(shard_rows, 1))]
+        names = [name for name in batteries if name in start]
+        blocks = [(plans[name], start[name], start[name] + len(plans[name]['items'])) for name in names]
+
+        # The answers are copied once into shared memory. The workers get it when they start, so the dataframe is never
+        # sent to them, and each shard is only told which rows to score.
+        shared = multiprocessing.RawArray('d', max(rows * width, 1))
+        np.frombuffer(shared)[:rows * width] = values.ravel()
+        del values
+        workers = multiprocessing.Pool(jobs, initializer=attach_shared, initargs=(shared, rows, width))
+        try:
+            results = workers.map(score_shard, [(first, last, blocks, nonresp) for first, last in shards], chunksize=1)
+        finally:
+            workers.close()
+            workers.join()
+
+        # Stitch every battery back together in the original row order
+        for position, name in enumerate(names):
+            pieces = [result[position] for result in results]
+            stops = [stop for frame, stop in pieces if stop is not None]
+            if stops:
+                scored[name] = (None, stops[0])
+            elif any(frame is None for frame, stop in pieces):
+                scored[name] = (None, None)
+            else:
+                frame = pd.concat([frame for frame, stop in pieces], axis=0)
+                frame.index = input.index
+                scored[name] = (frame, None)
+
+    frames = [subjectid.subjectid(input)]
+    for name in batteries:
+        frame, stop = scored.get(name) or (None, None)
+        if stop is not None:
+            sys.exit(stop)
+        if frame is None:
+            frame = battery_function(name)(input, nonresp)
+        frames.append(frame)
+
+    with profiling.stage('scoreall.concat', len(input)):
+        return pd.concat([frame for frame in frames if frame is not None], axis=1)
+
+
+# The shared answers, as seen from inside one worker process of score_sharded
+SHARED = {}
+
+
+def attach_shared(shared, rows, width):
+    SHARED['values'] = np.frombuffer(shared)[:rows * width].reshape(rows, width)
+
+
+def score_shard(task):
+    # Scores rows first to last of every battery. The scores get a plain row index here, which is swapped for your
+    # dataframe's index once all shards are back.
+    first, last, blocks, nonresp = task
+    values = SHARED['values'][first:last]
+    index = pd.RangeIndex(first, last)
+    return [score_battery((plan, values[:, start:stop], index, nonresp)) for plan, start, stop in blocks]
+
+
+def battery_names():
+    # Every battery of the package followed by the registered scales (see 8. above)
+    return [name for name, takes_nonresp in BATTERIES] + registry.names()
+
+
+def battery_plans(batteries, plans=None):
+    # The plan of every battery: the one in plans if it is there, otherwise the registered scale's or the one in the
+    # battery's .py file
+    plans = plans or {}
+    return dict((name, plans[name] if name in plans else battery_plan(name)) for name in batteries)
+
+
+def battery_plan(name):
+    if name in registry.SCALES:
+        return registry.SCALES[name]['plan']
+    return battery_module(name).PLAN
+
+
+def shared_block(input, batteries, plans):
+    # One list of every column the batteries need, each battery's columns next to each other so the batteries get views
+    # of the shared array instead of copies. Batteries whose headers are not all in the dataset are scored on their own.
+    # Returns the converted answers and where each battery's columns start in them.
+    columns, start = [], {}
+    for name in batteries:
+        items = plans[name]['items']
+        if name in start or not all(item in input.columns for item in items):
+            continue
+        start[name] = len(columns)
+        columns.extend(items)
+
+    try:
+        with profiling.stage('scoreall.numeric_block', len(input)):
+            return engine.numeric_block(input, columns), start
+    except ValueError:
+        # There are strings somewhere, so let every battery convert and report its own columns
+        return None, {}
+
+
+def run_tasks(tasks, jobs, pool):
+    # Scores the batteries one after the other, or on a pool of jobs workers. Either way the results come back
+    # in the order of tasks, so the columns of the result never depend on which battery finished first.
+    if jobs == 1 or len(tasks) < 2:
+        return [score_battery(task) for task in tasks]
+    if pool == 'thread':
+        workers = ThreadPool(jobs)
+    elif pool == 'process':
+        workers = multiprocessing.Pool(jobs)
+    else:
+        raise ValueError("pool has to be 'thread' or 'process', not %r" % (pool,))
+    try:
+        return workers.map(score_battery, tasks, chunksize=1)
+    finally:
+        workers.close()
+        workers.join()
+
+
+def score_battery(task):
+    # Runs in the workers, so it only gets things that can be sent to another process: the battery's plan, its answers,
+    # the row index and nonresp. Returns (scores, None), (None, None) if the battery has to be scored by its own
+    # function, or (None, message) if the battery found values out of range.
+    plan, values, index, nonresp = task
+    try:
+        return engine.score(plan, values, index, nonresp), None
+    except KeyError:
+        return None, None
+    except SystemExit as stop:
+        return None, stop.code
+
+
+def battery_module(name):
+    # The battery's .py file in this package, e.g. 'tci' gives tci.py
+    if name not in dict(BATTERIES):
+        raise ValueError("We don't have a battery called %s. Please choose from: %s"
+                         % (name, ', '.join(battery_names())))
+    return importlib.import_module('.' + name, __package__)
+
+
+def battery_function(name):
+    # The single battery function, called the same way whether or not it takes nonresp
+    if name in registry.SCALES:
+        return lambda input, nonresp: registry.score(name, input, nonresp)
+    function = getattr(battery_module(name), name)
+    if dict(BATTERIES)[name]:
+        return function
+    return lambda input, nonresp: function(input)
@@ -10,14 +10,24 @@ Battery Scores Package for Processing Qualtrics CSV Files
 """
 
 
+import numpy as np
 import pandas as pd
 import sys
 
+from . import engine
+
 
 # input = the data you are using with with the keys listed below as headers
 
 
-def shipley(input):
+# -----------------------------------------------------------------------
+# The correct choice (1-4) of every question, the same as the Correct Answer column of the column dictionary
+SHIPLEY_KEYS = ['Shipley2_%d' % number for number in range(1, 41)]
+ANSWER_KEY = np.array([3, 3, 2, 1, 4, 2, 1, 4, 4, 2, 4, 3, 1, 3, 3, 3, 1, 2, 1, 3,
+                       2, 1, 1, 4, 4, 2, 4, 2, 3, 4, 1, 2, 3, 1, 1, 4, 3, 1, 4, 2], dtype=np.float64)
+
+
+def shipley(input, answer_key=None):
     # SHIPLEY INSTITUTE OF LIVING SCALE (SHIPLEY VOCABULARY) - (SHIPLEY 2)
 
     # RESOURCES USED:
@@ -32,87 +42,82 @@ def shipley(input):
 
     3. Raw Score = number correct + (items left blank/4)
 
+    4. The answers are compared with ANSWER_KEY above. To use the Correct Answer column of your column dictionary
+    instead, call shipley(df, shipley.answer_key(question_dict)).
+
     """
     try:
-        # If there is a Prefer Not Answer, use it
-        # -----------------------------------------------------------------------
-        choice1 = ['Shipley2_4', 'Shipley2_7', 'Shipley2_13', 'Shipley2_17', 'Shipley2_19', 'Shipley2_22', 'Shipley2_23', 'Shipley2_31', 'Shipley2_34', 'Shipley2_35', 'Shipley2_38']
-        choice2 = ['Shipley2_3', 'Shipley2_6', 'Shipley2_10', 'Shipley2_18', 'Shipley2_21', 'Shipley2_26', 'Shipley2_28', 'Shipley2_32', 'Shipley2_40']
-        choice3 = ['Shipley2_1', 'Shipley2_2', 'Shipley2_12', 'Shipley2_14', 'Shipley2_15', 'Shipley2_16', 'Shipley2_20',
-                   'Shipley2_29', 'Shipley2_33', 'Shipley2_37']
-        choice4 = ['Shipley2_5', 'Shipley2_8', 'Shipley2_9', 'Shipley2_11', 'Shipley2_24', 'Shipley2_25', 'Shipley2_27', 'Shipley2_30', 'Shipley2_36', 'Shipley2_39']
-
-
-
-        # CREATE A COUNT FOR EACH ITEM GUESSED CORRECTLY
+        # change the numbers to numeric floats
+        return score_items(engine.numeric_block(input, SHIPLEY_KEYS), input.index, None, answer_key)
+    except KeyError:
+        print("We could not find the SHIPLEY headers in your dataset. Please look at the shipley function in this package and put in the correct keys.")
+    except ValueError:
+        print("We found strings in your SHIPLEY dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
 
-        # -----------------------------------------------------------------------
-        # COUNTS # OF QUESTIONS IN choice 1 WITH FIRST CHOICE AS CORRECT ANSWER
-        c1 = input[choice1].apply(pd.to_numeric, args=('raise',))
 
-        # Are there any values that don't fit in the value parameters
-        c1_nofit = c1[(c1[choice1] > 4) | (c1[choice1] < 1)].count(axis=1)
+def score_items(shipley_answers, index, nonresp, answer_key=None):
+    # shipley_answers = the SHIPLEY_KEYS answers as numeric floats, index = the row index of your dataframe
+    if answer_key is None:
+        answer_key = ANSWER_KEY
 
-        c1_leftblank = c1.apply(lambda x: sum(x.isnull().values), axis=1)
-        c1_score = c1[c1[choice1] == 1].count(axis=1)
+    leftblank = check_answers(shipley_answers)
 
+    # Every answer is compared with the answer key at once, and the right answers and blanks are added up per participant
+    correct = shipley_answers == answer_key
+    return score_counts(correct.sum(axis=1), leftblank.sum(axis=1), index)
 
-        # -----------------------------------------------------------------------
-        # COUNTS # OF QUESTIONS IN choice 2 WITH SECOND CHOICE AS CORRECT ANSWER
-        c2 = input[choice2].apply(pd.to_numeric, args=('raise',))
 
-        # Are there any values that don't fit in the value parameters
-        c2_nofit = c2[(c2[choice2] > 4) | (c2[choice2] < 1)].count(axis=1)
+def check_answers(shipley_answers):
+    # If there are any values that do not fit parameters, exit the code and make client find the values that did not work.
+    # Returns True for every answer left blank.
+    leftblank, prefernotanswer, nofit = engine.mark_cells(shipley_answers, None, 1, 4)
+    if nofit.any():
+        sys.exit("We found values that don't match parameter values for calculation in your SHIPLEY dataset. "
+                 "Please make sure your values range from 1-5 (see shipley script) and have only ONE prefer not to answer value.")
+    return leftblank
 
-        c2_leftblank = c2.apply(lambda x: sum(x.isnull().values), axis=1)
-        c2_score = c2[c2[choice2] == 2].count(axis=1)
 
-        # -----------------------------------------------------------------------
-        # COUNTS # OF QUESTIONS IN choice 3 WITH SECOND CHOICE AS CORRECT ANSWER
-        c3 = input[choice3].apply(pd.to_numeric, args=('raise',))
+def score_counts(correct, leftblank_all, index):
+    # Adds up the overall score, with left blank / 4
+    overall_score = correct + leftblank_all / 4.0
 
-        # Are there any values that don't fit in the value parameters
-        c3_nofit = c3[(c3[choice3] > 4) | (c3[choice3] < 1)].count(axis=1)
+    shipleyresult = pd.DataFrame({'Shipley2_Score': overall_score, 'Shipley2_Left_Blank': leftblank_all}, index=index)
 
-        c3_leftblank = c3.apply(lambda x: sum(x.isnull().values), axis=1)
-        c3_score = c3[c3[choice3] == 3].count(axis=1)
+    # Put the scores into one frame
+    frames = [shipleyresult]
+    result = pd.concat(frames, axis=1)
+    return result
 
-        # -----------------------------------------------------------------------
-        # COUNTS # OF QUESTIONS IN choice 4 WITH SECOND CHOICE AS CORRECT ANSWER
-        c4 = input[choice4].apply(pd.to_numeric, args=('raise',))
 
-        # Are there any values that don't fit in the value parameters
-        c4_nofit = c4[(c4[choice4] > 4) | (c4[choice4] < 1)].count(axis=1)
+def answer_key(question_dict):
+    # The Correct Answer column of the column dictionary as an answer key, in the order of SHIPLEY_KEYS
+    correct_answers = dict(zip(question_dict['QUESTION_NAME'], question_dict['Correct Answer']))
+    return np.array([correct_answers[key] for key in SHIPLEY_KEYS], dtype=np.float64)
 
-        c4_leftblank = c4.apply(lambda x: sum(x.isnull().values), axis=1)
-        c4_score = c4[c4[choice4] == 4].count(axis=1)
 
-        # -----------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = c1_nofit + c2_nofit + c3_nofit + c4_nofit
+# -----------------------------------------------------------------------
+# PACKED ANSWERS
+# For very big batches (millions of participants), the right answers and the blanks can be kept as bits, 40 answers
+# in 5 bytes per participant instead of 320. pack_answers does the conversion once and score_packed scores the bits by
+# counting them with a 256 entry table, e.g.
+#     correct, blank = shipley.pack_answers(engine.numeric_block(df, shipley.SHIPLEY_KEYS))
+#     scores = shipley.score_packed(correct, blank, df.index)
+# engine.numeric_block stops at strings/letters, and pack_answers stops at answers out of range like score_items does,
+# so only answers that score_items would accept are ever packed.
 
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your SHIPLEY dataset. "
-                         "Please make sure your values range from 1-5 (see shipley script) and have only ONE prefer not to answer value.")
+def pack_answers(shipley_answers, answer_key=None):
+    if answer_key is None:
+        answer_key = ANSWER_KEY
+    leftblank = check_answers(shipley_answers)
+    return np.packbits(shipley_answers == answer_key, axis=1), np.packbits(leftblank, axis=1)
 
 
-        # -----------------------------------------------------------------------
-        # Adds up all the questions that were left blank
-        leftblank_all = c1_leftblank + c2_leftblank + c3_leftblank + c4_leftblank
+def score_packed(correct_bits, blank_bits, index):
+    return score_counts(BITS_SET[correct_bits].sum(axis=1), BITS_SET[blank_bits].sum(axis=1), index)
 
-        # Adds up the overall score, with left blank / 4
-        overall_score = c1_score + c2_score + c3_score + c4_score + (leftblank_all/4)
 
-        shipleyresult = pd.DataFrame({'Shipley2_Score' : overall_score, 'Shipley2_Left_Blank' : leftblank_all})
+# how many bits are set in every byte 0-255
+BITS_SET = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1).astype(np.int64)
 
 
-        # Put the scores into one frame
-        frames = [shipleyresult]
-        result = pd.concat(frames, axis=1)
-        return result
-    except KeyError:
-        print("We could not find the SHIPLEY headers in your dataset. Please look at the shipley function in this package and put in the correct keys.")
-    except ValueError:
-        print("We found strings in your SHIPLEY dataset. Please make sure there are no strings/letters in your input. Otherwise, we can't do our thang.")
\ No newline at end of file
+PLAN = engine.custom_plan(SHIPLEY_KEYS, score_items, range=(1, 4), name='shipley')
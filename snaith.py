@@ -10,13 +10,35 @@ Battery Scores Package for Processing Qualtrics CSV Files
 """
 
 
-import pandas as pd
-import sys
+from . import engine
 
 
 # input = the data you are using with with the keys listed below as headers
 
 
+# STRONGLY DISAGREE    DISAGREE     NEUTRAL        AGREE     DEFINITELY AGREE
+#     1                  2            3              4             5
+# ------------------------------------------------------------------------------
+# ALL SNAITH SCORES ARE REVERSE CODED. Reverse scores are found by subtracting the answer from 6
+# and the Snaith Score is their plain sum (missing answers are not prorated).
+SPEC = {
+    'name': 'SNAITH',
+    'script': 'snaith',
+    'nonresp': None,
+    'range': (0, 5),
+    'reverse': 6,
+    'subscales': [
+        {'name': 'pleasure',
+         'reverse': ['snaith_1', 'snaith_2', 'snaith_3', 'snaith_4', 'snaith_5', 'snaith_6', 'snaith_7', 'snaith_8',
+                     'snaith_9', 'snaith_10', 'snaith_11', 'snaith_12', 'snaith_13', 'snaith_14'],
+         'missing': 'sum',
+         'columns': {'score': 'Snaith_Score', 'blank': 'Snaith_Left_Blank'}},
+    ],
+}
+
+PLAN = engine.compile_spec(SPEC)
+
+
 def snaith(input):
     # SNAITH-HAMILTON PLEASURE SCALE
 
@@ -53,51 +75,8 @@ def snaith(input):
     """
 
     try:
-        # STRONGLY DISAGREE    DISAGREE     NEUTRAL        AGREE     DEFINITELY AGREE
-        #     1                  2            3              4             5
-
-        # ------------------------------------------------------------------------------
-        # These are are the different headers and their corresponding questions
-        # ALL SNAITH SCORES ARE REVERSE CODED
-        snaith_headers_rev = ['snaith_1', 'snaith_2', 'snaith_3', 'snaith_4', 'snaith_5', 'snaith_6', 'snaith_7', 'snaith_8',
-                          'snaith_9', 'snaith_10', 'snaith_11', 'snaith_12', 'snaith_13', 'snaith_14']
-
-
-        # ------------------------------------------------------------------------------
-        # SNAITH SCORE - ALL REVERSE, NO FORWARD
-
-        # change the numbers in drive headers to numeric floats
-        snaith = input[snaith_headers_rev].apply(pd.to_numeric, args=('raise',))
-
-        # Are there any values that don't fit in the value parameters
-        snaith_nofit = snaith[(snaith[snaith_headers_rev] > 5) | (snaith[snaith_headers_rev] < 0)].count(axis=1)
-
-        # These count the number of drive questions left blank or answered as 5 and sums them up as drive_unanswered
-        snaith_leftblank = snaith.apply(lambda x: sum(x.isnull().values), axis=1)
-
-        # reverse the scores by subtracting 6 from the raw data. Score of each item ranges from 1 to 5.
-        snaith_answers_reversed = snaith[snaith[snaith_headers_rev] <= 5].rsub(6)
-        # sum the reversed scores together to get the drive score
-        snaith_score = snaith_answers_reversed.sum(axis=1, skipna = True)
-
-        snaithall = pd.DataFrame({'Snaith_Score' : snaith_score, 'Snaith_Left_Blank': snaith_leftblank})
-
-        # ------------------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = snaith_nofit
-
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your SNAITH dataset. "
-                         "Please make sure your values range from 1-5 (see snaith script).")
-
-
-        # ------------------------------------------------------------------------------
-        # Put the scores into one frame
-        frames = [snaithall]
-        result = pd.concat(frames, axis=1)
-        return result
+        # The subscales are described in SPEC above
+        return engine.score(PLAN, engine.numeric_block(input, PLAN['items']), input.index, None)
     except KeyError:
         print("We could not find the SNAITH headers in your dataset. Please look at the snaith function in this package and put in the correct keys.")
     except ValueError:
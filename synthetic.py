@@ -0,0 +1,221 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+"""
+1. Writes made-up Qualtrics exports for load testing, shaped exactly like your own: the columns come from the COLUMN_NAME
+column of your column dictionary, and every answer is in the range of its question (Your_Scale_Min to Your_Scale_Max)
+or its Prefer Not To Answer choice. From the folder that holds the batteryscores package:
+
+    python -m batteryscores.synthetic export.csv column_dictionary.csv --rows 1000000 --seed 7
+    python -m batteryscores.synthetic export.csv column_dictionary.csv --rows 5000 --careless-rate 0.1 --dropout-rate 0.05
+
+or from python:
+
+    synthetic.write_export('export.csv', question_dict, rows=1000000, seed=7)
+
+2. The file starts like a Qualtrics export: the row of headers, the row of question texts, and (with import_ids=True,
+--import-ids) the row of {"ImportId": ...} that Qualtrics adds as a 3rd row. The reader expects that 3rd row to be
+deleted (see reader.py), so it is left out by default and the file can be read with reader.reader straight away.
+A few Qualtrics columns that are not in the column dictionary (StartDate, EndDate, Progress, Duration, Finished) come
+first, and extra_columns adds that many more unrelated columns at the end.
+
+3. The rows are written block_rows participants at a time, so a file of any size never has to fit in memory. The same
+seed always gives exactly the same file.
+
+4. How the participants answer:
+
+    attentive     every participant has their own level on every battery and answers around it, so the answers of
+                  one battery go together like real ones do
+    blank_rate    share of answers left blank
+    pna_rate      share of answers that are the Prefer Not To Answer choice (only questions that have one)
+    dropout_rate  share of participants who stop somewhere in the survey and leave everything after that blank
+                  (their Progress and Finished columns say so)
+    careless_rate share of participants who answer carelessly, each with one of CARELESS_PATTERNS:
+                      'straightline'  the same answer to every question of a battery
+                      'random'        any answer, without looking at the question
+                      'alternating'   lowest, highest, lowest, highest, ...
+    invalid_rate  share of answers that are out of range (typos like 9 on a 1-5 scale), to test validate.py
+"""
+
+CARELESS_PATTERNS = ['straightline', 'random', 'alternating']
+
+# The Qualtrics columns written before the questions: (header, question text, ImportId)
+METADATA = [('StartDate', 'Start Date', 'startDate'), ('EndDate', 'End Date', 'endDate'),
+            ('Progress', 'Progress', 'progress'), ('Duration (in seconds)', 'Duration (in seconds)', 'duration'),
+            ('Finished', 'Finished', 'finished')]
+
+RESPONSE_ID_LETTERS = np.array(list('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'))
+
+FIRST_START = pd.Timestamp('2016-01-04 09:00:00')
+
+
+def write_export(datafile, question_dict, rows, seed=0, blank_rate=0.02, pna_rate=0.01, dropout_rate=0.0,
+                 careless_rate=0.0, careless_patterns=None, invalid_rate=0.0, import_ids=False, extra_columns=0,
+                 block_rows=10000):
+    # question_dict = your column dictionary, or its pathname. Returns the number of columns written.
+    if not isinstance(question_dict, pd.DataFrame):
+        question_dict = pd.read_csv(question_dict)
+    careless_patterns = careless_patterns or CARELESS_PATTERNS
+    for pattern in careless_patterns:
+        if pattern not in CARELESS_PATTERNS:
+            raise ValueError("careless_patterns can only have %s, not %r" % (', '.join(CARELESS_PATTERNS), pattern))
+    layout = question_layout(question_dict)
+    headers = ([header for header, text, import_id in METADATA] + layout['headers'] +
+               ['Extra_%d' % number for number in range(1, extra_columns + 1)])
+
+    with open(datafile, 'w') as outfile:
+        header_rows = [[text for header, text, import_id in METADATA] + layout['texts'] +
+                       ['Extra %d' % number for number in range(1, extra_columns + 1)]]
+        if import_ids:
+            header_rows.append(['{"ImportId":"%s"}' % import_id for header, text, import_id in METADATA] +
+                               ['{"ImportId":"%s"}' % import_id for import_id in layout['import_ids']] +
+                               ['{"ImportId":"extra%d"}' % number for number in range(1, extra_columns + 1)])
+        pd.DataFrame(header_rows, columns=headers).to_csv(outfile, index=False)
+
+        for block, first in enumerate(range(0, rows, block_rows)):
+            # Every block has its own random numbers made from the seed, so the file is the same however it is written
+            random = np.random.RandomState([seed, block])
+            count = min(block_rows, rows - first)
+            answers, progress = answer_block(random, layout, count, blank_rate, pna_rate, dropout_rate, careless_rate,
+                                             careless_patterns, invalid_rate)
+            frame = pd.DataFrame(answers, columns=layout['headers'])
+            for position in layout['subjects']:
+                frame[layout['headers'][position]] = response_ids(random, count)
+            frame = pd.concat([metadata_block(random, progress), frame], axis=1)
+            for number in range(1, extra_columns + 1):
+                frame['Extra_%d' % number] = random.randint(0, 100, size=count)
+            frame.to_csv(outfile, index=False, header=False, float_format='%.0f')
+    return len(headers)
+
+
+def question_layout(question_dict):
+    # The columns of the export and, for every one of them, its range, Prefer Not To Answer choice and battery
+    questions = question_dict[question_dict['COLUMN_NAME'].notnull()]
+    names = [str(name) for name in questions['QUESTION_NAME']]
+    low = pd.to_numeric(questions['Your_Scale_Min'], errors='coerce').fillna(1).values.astype(np.float64)
+    high = pd.to_numeric(questions['Your_Scale_Max'], errors='coerce').fillna(1).values.astype(np.float64)
+    pna = pd.to_numeric(questions['PreferNotToAnswerSelection'], errors='coerce').values.astype(np.float64)
+    # A Your_Scale_Max that is the Prefer Not To Answer choice is not an answer
+    high = np.where(high == pna, high - 1, high)
+
+    batteries = [name.split('_')[0] for name in names]
+    battery_order = sorted(set(batteries), key=batteries.index)
+    battery = np.array([battery_order.index(name) for name in batteries], dtype=np.intp)
+    # where every question is in its battery (0, 1, 2, ...), for the alternating pattern
+    within = np.zeros(len(names), dtype=np.intp)
+    for position in range(1, len(names)):
+        if battery[position] == battery[position - 1]:
+            within[position] = within[position - 1] + 1
+    # Qualtrics numbers the questions QID1, QID2, ... and calls the response id _recordId
+    import_ids = []
+    number = 0
+    for name in names:
+        if name.startswith('SUBJ'):
+            import_ids.append('_recordId')
+        else:
+            number += 1
+            import_ids.append('QID%d' % number)
+
+    return {'headers': list(questions['COLUMN_NAME']),
+            'texts': ['Response ID' if name.startswith('SUBJ') else name for name in names],
+            'import_ids': import_ids,
+            'subjects': [position for position, name in enumerate(names) if name.startswith('SUBJ')],
+            'low': low, 'high': high, 'pna': pna, 'battery': battery, 'batteries': len(battery_order),
+            'within': within}
+
+
+def answer_block(random, layout, rows, blank_rate, pna_rate, dropout_rate, careless_rate, careless_patterns,
+                 invalid_rate):
+    # The answers of rows participants (see 4. above), and how far each of them got in the survey (0-100)
+    low, high, pna, battery = layout['low'], layout['high'], layout['pna'], layout['battery']
+    width = high - low
+    questions = len(low)
+
+    # Every participant's own level (0-1) on every battery, and attentive answers around it
+    level = random.random_sample((rows, layout['batteries']))[:, battery]
+    answers = low + np.round(np.clip(level + 0.2 * random.standard_normal((rows, questions)), 0, 1) * width)
+
+    careless = random.random_sample(rows) < careless_rate
+    if careless.any():
+        pattern = np.array(careless_patterns)[random.randint(0, len(careless_patterns), size=rows)]
+        straightline = (careless & (pattern == 'straightline'))[:, np.newaxis]
+        answers = np.where(straightline, low + np.round(level * width), answers)
+        uniform = (careless & (pattern == 'random'))[:, np.newaxis]
+        answers = np.where(uniform, low + np.floor(random.random_sample((rows, questions)) * (width + 1)), answers)
+        alternating = (careless & (pattern == 'alternating'))[:, np.newaxis]
+        answers = np.where(alternating, np.where(layout['within'] % 2 == 0, low, high), answers)
+
+    roll = random.random_sample((rows, questions))
+    answers = np.where((roll < pna_rate) & ~np.isnan(pna), pna, answers)
+    # out of range: above both the highest answer and the Prefer Not To Answer choice
+    invalid = np.fmax(high, np.nan_to_num(pna)) + 3
+    answers = np.where((roll >= pna_rate) & (roll < pna_rate + invalid_rate), invalid, answers)
+    answers[random.random_sample((rows, questions)) < blank_rate] = np.nan
+
+    # Participants who drop out leave every question after the one they stopped at blank
+    progress = np.full(rows, 100.0)
+    dropout = np.nonzero(random.random_sample(rows) < dropout_rate)[0]
+    stops = random.randint(0, questions, size=len(dropout))
+    for participant, stop in zip(dropout, stops):
+        answers[participant, stop:] = np.nan
+        progress[participant] = np.floor(100.0 * stop / questions)
+    return answers, progress
+
+
+def response_ids(random, rows):
+    # Qualtrics style response ids, e.g. R_1jjEP0LeLZr2zmH
+    letters = RESPONSE_ID_LETTERS[random.randint(0, len(RESPONSE_ID_LETTERS), size=(rows, 15))]
+    return ['R_' + ''.join(row) for row in letters]
+
+
+def metadata_block(random, progress):
+    # StartDate, EndDate, Progress, Duration (in seconds) and Finished of every participant
+    rows = len(progress)
+    start = FIRST_START + pd.to_timedelta(np.sort(random.randint(0, 365 * 24 * 3600, size=rows)), unit='s')
+    duration = random.randint(300, 3600, size=rows)
+    end = start + pd.to_timedelta(duration, unit='s')
+    return pd.DataFrame({'StartDate': start.strftime('%Y-%m-%d %H:%M:%S'), 'EndDate': end.strftime('%Y-%m-%d %H:%M:%S'),
+                         'Progress': progress.astype(np.int64), 'Duration (in seconds)': duration,
+                         'Finished': (progress == 100).astype(np.int64)},
+                        columns=[header for header, text, import_id in METADATA])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='batteryscores.synthetic', description='Write a made-up Qualtrics export.')
+    parser.add_argument('datafile', help='the export to write')
+    parser.add_argument('columndictionary')
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--blank-rate', type=float, default=0.02)
+    parser.add_argument('--pna-rate', type=float, default=0.01)
+    parser.add_argument('--dropout-rate', type=float, default=0.0)
+    parser.add_argument('--careless-rate', type=float, default=0.0)
+    parser.add_argument('--careless-patterns', default=','.join(CARELESS_PATTERNS))
+    parser.add_argument('--invalid-rate', type=float, default=0.0)
+    parser.add_argument('--import-ids', action='store_true', help='write the 3rd ImportId row of a Qualtrics export')
+    parser.add_argument('--extra-columns', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    write_export(args.datafile, args.columndictionary, args.rows, args.seed, args.blank_rate, args.pna_rate,
+                 args.dropout_rate, args.careless_rate, args.careless_patterns.split(','), args.invalid_rate,
+                 args.import_ids, args.extra_columns)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,11 +9,35 @@ Battery Scores Package for Processing Qualtrics CSV Files
 @date: 2016.12.06
 """
 
-import pandas as pd
-import sys
+from . import engine
 
 # input = the data you are using with with the keys listed below as headers
 
+
+# Very false for me   moderately false for me   Slightly false for me   Slightly true for me   Moderately true for me   Very true for me
+#          1                      2                       3                      4                      5                      6
+# ------------------------------------------------------------------------------
+# There is no prefer not to answer choice. Reverse scores are found by subtracting the answer from 7.
+SPEC = {
+    'name': 'TEPS',
+    'script': 'teps',
+    'nonresp': None,
+    'range': (1, 6),
+    'reverse': 7,
+    'subscales': [
+        {'name': 'anticipatory',
+         'forward': ['TEPS_1', 'TEPS_4', 'TEPS_6', 'TEPS_8', 'TEPS_10', 'TEPS_11', 'TEPS_15', 'TEPS_16', 'TEPS_18'],
+         'reverse': ['TEPS_13'],
+         'columns': {'score': 'TEPS_Anticipatory_Score', 'blank': 'TEPS_Anticipatory_Left_Blank'}},
+        {'name': 'consummatory',
+         'forward': ['TEPS_2', 'TEPS_3', 'TEPS_5', 'TEPS_7', 'TEPS_9', 'TEPS_12', 'TEPS_14', 'TEPS_17'],
+         'columns': {'score': 'TEPS_Consummatory_Score', 'blank': 'TEPS_Consummatory_Left_Blank'}},
+    ],
+}
+
+PLAN = engine.compile_spec(SPEC)
+
+
 def teps(input):
     # TEMPORAL EXPERIENCE OF PLEASURE SCALE
 
@@ -37,101 +61,8 @@ def teps(input):
     """
 
     try:
-        # Very false for me   moderately false for me   Slightly false for me   Slightly true for me   Moderately true for me   Very true for me
-        #          1                      2                       3                      4                      5                      6
-
-        # ------------------------------------------------------------------------------
-        anticipatory_keys = ['TEPS_1', 'TEPS_4', 'TEPS_6', 'TEPS_8', 'TEPS_10', 'TEPS_11', 'TEPS_15', 'TEPS_16', 'TEPS_18']
-        anticipatory_keys_rev = ['TEPS_13']
-        consummatory_keys = ['TEPS_2', 'TEPS_3', 'TEPS_5', 'TEPS_7', 'TEPS_9', 'TEPS_12', 'TEPS_14', 'TEPS_17']
-
-        # ------------------------------------------------------------------------------
-        # ANTICIPATORY SCORE
-
-        # FORWARD SCORES AND FORWARD QUESTIONS UNANSWERED
-        anticipatory_forward = input[anticipatory_keys].apply(pd.to_numeric, args=('raise',))
-
-        # Are there any values that don't fit in the value parameters
-        anticipatory_forward_nofit = anticipatory_forward[(anticipatory_forward[anticipatory_keys] > 6) |
-                                                          (anticipatory_forward[anticipatory_keys] < 1)].count(axis=1)
-
-        anticipatory_forward_leftblank = anticipatory_forward.apply(lambda x: sum(x.isnull().values), axis=1)
-
-        # sum all the forward scores
-        anticipatory_forward_score = anticipatory_forward[(anticipatory_forward[anticipatory_keys] >= 1) &
-                                                          (anticipatory_forward[anticipatory_keys] <= 6)].sum(axis=1)
-
-        # REVERSE SCORES AND REVERSE QUESTIONS UNANSWERED
-        anticipatory_rev = input[anticipatory_keys_rev].apply(pd.to_numeric, args=('raise',))
-
-        # Are there any values that don't fit in the value parameters
-        anticipatory_rev_nofit = anticipatory_rev[(anticipatory_rev[anticipatory_keys_rev] > 6) |
-                                                          (anticipatory_rev[anticipatory_keys_rev] < 1)].count(axis=1)
-
-        # sum the number of reverse questions left blank or preferred not to answer
-        anticipatory_reverse_leftblank = anticipatory_rev.apply(lambda x: sum(x.isnull().values), axis=1)
-
-        # sum all the reverse scores
-        anticipatory_rev_score = anticipatory_rev[anticipatory_rev[anticipatory_keys_rev] <= 6].rsub(7).sum(axis=1, skipna=True)
-
-        # Total SCORE
-        total_anticipatory_score = anticipatory_forward_score + anticipatory_rev_score
-
-        # TOTAL ANSWERS LEFT BLANK
-        total_anticipatory_leftblank = anticipatory_forward_leftblank + anticipatory_reverse_leftblank
-
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        total_anticipatory_score = total_anticipatory_score + (total_anticipatory_leftblank * total_anticipatory_score /
-                                                               (len(anticipatory_keys) + len(anticipatory_keys_rev)-total_anticipatory_leftblank))
-
-        anticall = pd.DataFrame(
-            {'TEPS_Anticipatory_Score': total_anticipatory_score, 'TEPS_Anticipatory_Left_Blank': total_anticipatory_leftblank})
-
-
-        # ------------------------------------------------------------------------------
-        # CONSUMMATORY SCORE
-
-        # FORWARD SCORES AND FORWARD QUESTIONS UNANSWERED
-        consummatory_forward = input[consummatory_keys].apply(pd.to_numeric, args=('raise',))
-
-        # Are there any values that don't fit in the value parameters
-        consummatory_forward_nofit = consummatory_forward[(consummatory_forward[consummatory_keys] > 6) |
-                                                          (consummatory_forward[consummatory_keys] < 1)].count(axis=1)
-
-        consummatory_forward_leftblank = consummatory_forward.apply(lambda x: sum(x.isnull().values), axis=1)
-
-        # sum all the forward scores
-        consummatory_forward_score = consummatory_forward[(consummatory_forward[consummatory_keys] >= 1) &
-                                                          (consummatory_forward[consummatory_keys] <= 6)].sum(axis=1)
-
-        # If there are values missing, multiply the number of unanswered questions by the total subscale score.
-        # Then divide that by the (total number of questions in the subscale - number of unanswered questions).
-        # Add all of this to to the original score.
-        consummatory_forward_score = consummatory_forward_score + (consummatory_forward_leftblank * consummatory_forward_score /
-                                                                   (len(consummatory_keys)-consummatory_forward_leftblank))
-
-        consumall = pd.DataFrame(
-            {'TEPS_Consummatory_Score': consummatory_forward_score, 'TEPS_Consummatory_Left_Blank': consummatory_forward_leftblank})
-
-        # ------------------------------------------------------------------------------
-        # Count the number of values that do not fit parameter values
-        nofit = anticipatory_forward_nofit + anticipatory_rev_nofit + consummatory_forward_nofit
-
-        # If there are any values that do not fit parameters, exit the code and make client find the values that did not work
-        for x in nofit:
-            if x >= 1:
-                sys.exit("We found values that don't match parameter values for calculation in your TEPS dataset. "
-                         "Please make sure your values range from 1-6 (see teps script).")
-
-
-        # ------------------------------------------------------------------------------
-        # Put the scores into one frame
-        frames = [anticall, consumall]
-        result = pd.concat(frames, axis=1)
-        return result
+        # The subscales are described in SPEC above
+        return engine.score(PLAN, engine.numeric_block(input, PLAN['items']), input.index, None)
     except KeyError:
         print("We could not find the TEPS headers in your dataset. Please look at the teps function in this package and put in the correct keys.")
     except ValueError:
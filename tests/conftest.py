@@ -0,0 +1,32 @@
+"""
+The tests import the package as batteryscores, the name of the folder it is meant to live in (see README.md), no matter
+what the folder of this checkout is called. Run them from the package folder with:
+
+    python -m pytest tests
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PACKAGE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(PACKAGE, 'sampledataset_columndict_scriptToCallFunctions')
+
+if 'batteryscores' not in sys.modules:
+    spec = importlib.util.spec_from_file_location('batteryscores', os.path.join(PACKAGE, '__init__.py'),
+                                                  submodule_search_locations=[PACKAGE])
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['batteryscores'] = module
+    spec.loader.exec_module(module)
+
+
+@pytest.fixture
+def datafile():
+    return os.path.join(SAMPLE, 'sampledata.csv')
+
+
+@pytest.fixture
+def columndictionary():
+    return os.path.join(SAMPLE, 'column_dictionary.csv')
@@ -0,0 +1,148 @@
+"""
+Pins the output of every battery on the sample dataset. tests/data/before_specs holds what the battery scripts gave on
+sampledata.csv before they were rewritten onto engine.py (the first commit of the package, run with Python 2). Every
+battery has to give exactly the same scores, apart from the changes listed in CHANGED and NEW_COLUMNS.
+"""
+
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batteryscores import columndict
+from batteryscores import engine
+from batteryscores import ncog
+from batteryscores import poms
+from batteryscores import reader
+from batteryscores import scoreall
+from batteryscores import subjectid
+from batteryscores import synthetic
+
+BEFORE_SPECS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'before_specs')
+
+BATTERIES = [name for name, takes_nonresp in scoreall.BATTERIES]
+
+nan = np.nan
+
+# Columns whose scores changed on purpose, with their new values on the sample dataset
+CHANGED = {
+    # Discarded DDQ k-values are NaN instead of the string 'DISCARD' (see the DISCARD rule in same_scores), and so is the
+    # Total_k-value of a participant with a discarded magnitude, which was 0.
+    'ddq': {'Total_k-value': [nan, nan, nan, nan, nan]},
+}
+
+# Columns the batteries didn't have before, with their values on the sample dataset
+NEW_COLUMNS = {
+    'ddq': {'DDQ_Discarded': [1, 1, 1, 1, 1],
+            'Small_Reward_Consistency': [nan, nan, nan, nan, nan],
+            'Small_Reward_Switch_k-value': [nan, nan, nan, nan, nan],
+            'Medium_Reward_Consistency': [200 / 3.0, 100.0, 200 / 3.0, 800 / 9.0, 800 / 9.0],
+            'Medium_Reward_Switch_k-value': [0.009968, 0.00016, 0.009968, 0.00063, 0.00063],
+            'Large_Reward_Consistency': [nan, nan, nan, nan, nan],
+            'Large_Reward_Switch_k-value': [nan, nan, nan, nan, nan]},
+}
+
+
+@pytest.fixture(scope='module')
+def sample():
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    folder = os.path.join(here, 'sampledataset_columndict_scriptToCallFunctions')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df, raw_data_frame, question_dict, nonresp = reader.reader(os.path.join(folder, 'sampledata.csv'),
+                                                                   os.path.join(folder, 'column_dictionary.csv'))
+    return df, question_dict, nonresp
+
+
+@pytest.fixture(scope='module')
+def synthetic_sample(tmp_path_factory):
+    # 300 made-up participants with blanks, prefer not to answer and careless answers, so every subscale has answers
+    here = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    dictionary = os.path.join(here, 'sampledataset_columndict_scriptToCallFunctions', 'column_dictionary.csv')
+    datafile = str(tmp_path_factory.mktemp('synthetic') / 'export.csv')
+    synthetic.write_export(datafile, dictionary, 300, seed=4, blank_rate=0.05, pna_rate=0.03, careless_rate=0.1)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, dictionary)
+    return df, question_dict, nonresp
+
+
+def same_scores(result, expected):
+    # Compares one column, with 'DISCARD' read as NaN
+    expected = pd.to_numeric(pd.Series(expected).replace('DISCARD', nan)).values.astype(np.float64)
+    return np.allclose(pd.to_numeric(result).values.astype(np.float64), expected, rtol=1e-4, equal_nan=True)
+
+
+@pytest.mark.parametrize('name', BATTERIES)
+def test_battery_matches_the_scores_before_specs(sample, name):
+    df, question_dict, nonresp = sample
+    result = scoreall.battery_function(name)(df, nonresp)
+    before = pd.read_csv(os.path.join(BEFORE_SPECS, name + '.csv'), index_col=0)
+    changed, new = CHANGED.get(name, {}), NEW_COLUMNS.get(name, {})
+
+    assert sorted(result.columns) == sorted(list(before.columns) + list(new))
+    assert list(result.index) == list(before.index)
+    for column in before.columns:
+        expected = changed.get(column, before[column])
+        assert same_scores(result[column], expected), column
+    for column, expected in new.items():
+        assert same_scores(result[column], expected), column
+
+
+def test_prorating_divides_by_the_answered_items():
+    # One of the 5 POMS Depression/Dejection answers blank: the sum of the answered items is scaled up to all items,
+    # sum + unanswered * sum / answered
+    answers = dict((item, 3) for item in poms.PLAN['items'])
+    del answers['poms_7']
+    scores = engine.score_participant(poms.PLAN, answers, {'poms': 6})
+    assert scores['POMS_Depresssion/Dejection_Score'] == 8 + 1 * 8 / 4.0
+    assert scores['POMS_Depresssion/Dejection_Left_Blank'] == 1
+
+
+def test_prorating_items_divides_by_all_items():
+    # POMS Tension/Anxiety and NCOG keep their old rule ('prorate_items'): sum + unanswered * sum / number of items, and
+    # 0 when nothing was answered
+    answers = dict((item, 3) for item in poms.PLAN['items'])
+    del answers['poms_6']
+    scores = engine.score_participant(poms.PLAN, answers, {'poms': 6})
+    assert scores['POMS_Tension/Anxiety_Score'] == 8 + 1 * 8 / 5.0
+    assert scores['POMS_Tension/Anxiety_Left_Blank'] == 1
+
+    answers = dict((item, 4) for item in ncog.PLAN['items'])
+    answers['ncog_1'] = 6
+    scores = engine.score_participant(ncog.PLAN, answers, {'ncog': 6})
+    # 9 forward answers of 4 and 8 reverse answers of 6 - 4
+    answered = 9 * 4 + 8 * 2
+    assert scores['ncog_Score'] == pytest.approx(answered + 1 * answered / 18.0)
+    assert scores['ncog_Prefer_Not_to_Answer'] == 1
+
+    scores = engine.score_participant(ncog.PLAN, {}, {'ncog': 6})
+    assert scores['ncog_Score'] == 0
+    assert scores['ncog_Left_Blank'] == 18
+
+
+def single_batteries(df, nonresp):
+    # What the skeleton script does: every battery function on its own, concatenated after the subject ids
+    frames = [subjectid.subjectid(df)] + [scoreall.battery_function(name)(df, nonresp) for name in BATTERIES]
+    return pd.concat(frames, axis=1)
+
+
+@pytest.mark.parametrize('data', ['sample', 'synthetic_sample'])
+def test_score_all_matches_the_single_batteries(request, data):
+    df, question_dict, nonresp = request.getfixturevalue(data)
+    pd.testing.assert_frame_equal(scoreall.score_all(df, nonresp), single_batteries(df, nonresp))
+
+
+@pytest.mark.parametrize('data', ['sample', 'synthetic_sample'])
+def test_score_sharded_matches_score_all(request, data):
+    df, question_dict, nonresp = request.getfixturevalue(data)
+    pd.testing.assert_frame_equal(scoreall.score_sharded(df, nonresp, jobs=2), scoreall.score_all(df, nonresp))
+
+
+@pytest.mark.parametrize('data', ['sample', 'synthetic_sample'])
+def test_dictionary_plans_match_the_batteries(request, data):
+    df, question_dict, nonresp = request.getfixturevalue(data)
+    plans = columndict.compile_plans(question_dict)
+    pd.testing.assert_frame_equal(scoreall.score_all(df, nonresp, plans=plans), scoreall.score_all(df, nonresp))
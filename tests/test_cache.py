@@ -0,0 +1,18 @@
+import warnings
+
+import pandas as pd
+
+from batteryscores import reader
+
+
+def test_reader_saves_and_loads_through_cache_dir(tmp_path, datafile, columndictionary):
+    cache_dir = str(tmp_path / 'cache')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, columndictionary, cache_dir=cache_dir)
+        cached, cached_raw, cached_question_dict, cached_nonresp = reader.reader(datafile, columndictionary,
+                                                                                 cache_dir=cache_dir)
+    assert raw_data_frame is not None
+    assert cached_raw is None
+    pd.testing.assert_series_equal(pd.Series(cached_nonresp), pd.Series(nonresp))
+    pd.testing.assert_frame_equal(cached, df)
@@ -0,0 +1,104 @@
+"""
+Every exit code of the command line (see the EXIT_ numbers in cli.py), with and without --chunk-size.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from batteryscores import cli
+from batteryscores import synthetic
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    # The row of question texts makes pandas warn about mixed types
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+def sample_lines(datafile):
+    # The lines of the sample datafile, which ends its lines with a carriage return only
+    with open(datafile, newline='') as infile:
+        text = infile.read()
+    return text.replace('\r\n', '\n').replace('\r', '\n').rstrip('\n').split('\n')
+
+
+def write_lines(path, lines):
+    path.write_text('\n'.join(lines) + '\n')
+    return str(path)
+
+
+def score(*argv):
+    return cli.main(['score'] + [str(arg) for arg in argv])
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_scores_are_written(tmp_path, datafile, columndictionary, chunk_size):
+    output = tmp_path / 'scores.csv'
+    chunked = ['--chunk-size', chunk_size] if chunk_size else []
+    assert score(datafile, columndictionary, '-o', output, *chunked) == cli.EXIT_OK
+    assert score(datafile, columndictionary, '-o', tmp_path / 'whole.csv') == cli.EXIT_OK
+    assert output.read_text() == (tmp_path / 'whole.csv').read_text()
+    assert len(pd.read_csv(str(output), index_col=0)) == len(sample_lines(datafile)) - 2
+
+
+def test_unknown_battery_is_a_usage_error(tmp_path, datafile, columndictionary):
+    assert score(datafile, columndictionary, '-o', tmp_path / 'scores.csv', '--batteries', 'nope') == cli.EXIT_USAGE
+
+
+def test_quarantine_needs_a_rejects_file(tmp_path, datafile, columndictionary):
+    assert score(datafile, columndictionary, '-o', tmp_path / 'scores.csv', '--invalid', 'quarantine') == cli.EXIT_USAGE
+
+
+def test_cache_dir_is_not_for_chunks(tmp_path, datafile, columndictionary):
+    assert score(datafile, columndictionary, '-o', tmp_path / 'scores.csv', '--chunk-size', 2,
+                 '--cache-dir', tmp_path / 'cache') == cli.EXIT_USAGE
+    assert not (tmp_path / 'scores.csv').exists()
+
+
+def test_missing_datafile_is_an_input_error(tmp_path, columndictionary):
+    assert score(tmp_path / 'nope.csv', columndictionary, '-o', tmp_path / 'scores.csv') == cli.EXIT_INPUT
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2, 4])
+@pytest.mark.parametrize('broken', ['quote', 'extra'])
+@pytest.mark.parametrize('line', [1, 2, 3, 4, 5])
+def test_broken_datafile_is_an_input_error(tmp_path, capsys, datafile, columndictionary, chunk_size, broken, line):
+    # line 0 is the headers, line 1 the question texts and the rest are participants
+    lines = sample_lines(datafile)
+    if broken == 'quote':
+        # an opening quote that is never closed
+        lines[line] = '"' + lines[line]
+    else:
+        lines[line] = lines[line] + ',1,2'
+    path = write_lines(tmp_path / 'broken.csv', lines)
+    chunked = ['--chunk-size', chunk_size] if chunk_size else []
+
+    assert score(path, columndictionary, '-o', tmp_path / 'scores.csv', *chunked) == cli.EXIT_INPUT
+    assert 'Traceback' not in capsys.readouterr().err
+
+
+def test_answers_out_of_range_are_invalid(tmp_path, columndictionary):
+    path = str(tmp_path / 'export.csv')
+    synthetic.write_export(path, columndictionary, 20, seed=1, invalid_rate=0.05)
+    assert score(path, columndictionary, '-o', tmp_path / 'scores.csv') == cli.EXIT_INVALID
+    assert score(path, columndictionary, '-o', tmp_path / 'scores.csv', '--chunk-size', 5) == cli.EXIT_INVALID
+    assert score(path, columndictionary, '-o', tmp_path / 'scores.csv', '--invalid', 'null') == cli.EXIT_OK
+
+
+def test_battery_without_headers_is_missing(tmp_path, datafile, columndictionary):
+    question_dict = pd.read_csv(columndictionary)
+    dictionary = str(tmp_path / 'column_dictionary.csv')
+    question_dict[~question_dict['QUESTION_NAME'].astype(str).str.startswith('tci_')].to_csv(dictionary, index=False)
+    scores = tmp_path / 'scores.csv'
+    assert score(datafile, dictionary, '-o', scores, '--batteries', 'tci') == cli.EXIT_MISSING
+    # Scoring all batteries leaves tci out instead
+    assert score(datafile, dictionary, '-o', scores) == cli.EXIT_OK
+    assert not any(column.startswith('TCI') for column in pd.read_csv(str(scores), nrows=0).columns)
+
+
+def test_unwritable_output_is_an_output_error(tmp_path, datafile, columndictionary):
+    assert score(datafile, columndictionary, '-o', tmp_path / 'nope' / 'scores.csv') == cli.EXIT_OUTPUT
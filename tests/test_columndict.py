@@ -0,0 +1,46 @@
+"""
+Questions of the column dictionary that are not in a battery's SPEC.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batteryscores import columndict
+from batteryscores import tci
+
+
+@pytest.fixture
+def question_dict(columndictionary):
+    return pd.read_csv(columndictionary)
+
+
+def tci_rows(question_dict):
+    return question_dict['QUESTION_NAME'].astype(str).str.startswith('tci_')
+
+
+def with_question(question_dict, name, subscale):
+    # A copy of the dictionary with one more tci question
+    row = question_dict[question_dict['QUESTION_NAME'] == 'tci_1'].copy()
+    row['QUESTION_NAME'], row['COLUMN_NAME'], row['SUBSCALE_NAME'] = name, name, subscale
+    return pd.concat([question_dict, row], ignore_index=True)
+
+
+def test_new_question_is_scored_in_its_subscale(question_dict):
+    plan = columndict.compile_plans(with_question(question_dict, 'tci_141', 'novelty'))['tci']
+    assert 'tci_141' in plan['items']
+    assert len(plan['items']) == len(tci.PLAN['items']) + 1
+
+
+def test_without_subscale_names_the_spec_subscales_are_used(question_dict):
+    question_dict.loc[tci_rows(question_dict), ['SUBSCALE_NAME', 'SUBSCALE_NAME_2']] = np.nan
+    plan = columndict.compile_plans(question_dict)['tci']
+    assert plan['items'] == tci.PLAN['items']
+
+
+def test_without_subscale_names_new_questions_are_rejected(question_dict):
+    question_dict = with_question(question_dict, 'tci_141', np.nan)
+    question_dict.loc[tci_rows(question_dict), ['SUBSCALE_NAME', 'SUBSCALE_NAME_2']] = np.nan
+    with pytest.raises(ValueError) as error:
+        columndict.compile_plans(question_dict)
+    assert 'tci_141' in str(error.value)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from batteryscores import ddq
+
+
+def switch_patterns():
+    # One participant per switch point: immediate (1) for the questions with the lowest indifference k's, delayed (2)
+    # for the rest, from always delayed to never delayed
+    order = np.argsort(ddq.INDIFFERENCE_K)
+    answers = np.full((len(order) + 1, len(order)), 2.0)
+    for switch in range(len(order) + 1):
+        answers[switch, order[:switch]] = 1.0
+    return pd.DataFrame(answers, columns=ddq.DDQ_KEYS), np.sort(ddq.INDIFFERENCE_K)
+
+
+def test_every_consistent_pattern_is_fully_consistent():
+    input, indifference = switch_patterns()
+    result = ddq.ddq_ml(input)
+    assert (result['ML_Consistency'] == 100).all()
+
+
+def test_k_is_inside_the_interval_of_the_switch():
+    input, indifference = switch_patterns()
+    k = ddq.ddq_ml(input)['ML_k-value'].values
+    for switch in range(1, len(indifference)):
+        assert indifference[switch - 1] < k[switch] < indifference[switch]
+    assert k[0] == indifference[0]
+    assert k[-1] == indifference[-1]
+
+
+def test_one_inconsistent_answer_keeps_k_near_the_switch():
+    input, indifference = switch_patterns()
+    # switch in the middle, with the delayed reward turned down once at a much higher indifference k
+    participant = input.iloc[[13]].copy()
+    participant.iloc[0, np.argsort(ddq.INDIFFERENCE_K)[20]] = 1.0
+    result = ddq.ddq_ml(participant)
+    assert indifference[8] < result['ML_k-value'].iloc[0] < indifference[20]
+    assert result['ML_Consistency'].iloc[0] < 100
@@ -0,0 +1,50 @@
+"""
+The stand-ins of `from batteryscores import *` (see __init__.py) have to behave like the modules they stand in for.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PACKAGE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def fresh():
+    # A fresh copy of the package under another name, so none of its modules have been imported yet
+    name = 'fresh_batteryscores'
+    spec = importlib.util.spec_from_file_location(name, os.path.join(PACKAGE, '__init__.py'),
+                                                  submodule_search_locations=[PACKAGE])
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[name] = package
+    spec.loader.exec_module(package)
+    yield name
+    for module in [module for module in sys.modules if module == name or module.startswith(name + '.')]:
+        del sys.modules[module]
+
+
+def test_star_import_resolves_the_modules(fresh):
+    namespace = {}
+    exec('from %s import *' % fresh, namespace)
+    assert sorted(name for name in namespace if name != '__builtins__') == sorted(sys.modules[fresh].__all__)
+    assert fresh + '.cache' not in sys.modules
+    assert repr(namespace['cache']) == "<lazy module '%s.cache'>" % fresh
+
+    # cache.load is the function of cache.py, not the loading of the stand-in
+    assert namespace['cache'].load is sys.modules[fresh + '.cache'].load
+    assert namespace['reader'].reader is sys.modules[fresh + '.reader'].reader
+    assert 'reader' in dir(namespace['reader'])
+    assert namespace['tci'].PLAN['items'][0] == 'tci_1'
+
+
+def test_setting_a_variable_sets_it_on_the_module(fresh):
+    namespace = {}
+    exec('from %s import *' % fresh, namespace)
+    registry = namespace['registry']
+    registry.SCALES = {'grit': None}
+    assert sys.modules[fresh + '.registry'].SCALES == {'grit': None}
+    assert 'SCALES' not in vars(registry)
+    del registry.SCALES
+    assert not hasattr(sys.modules[fresh + '.registry'], 'SCALES')
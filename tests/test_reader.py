@@ -0,0 +1,84 @@
+"""
+chunked_reader and compact=True have to give exactly the answers reader gives.
+"""
+
+import warnings
+
+import pandas as pd
+import pytest
+
+from batteryscores import reader
+from batteryscores import synthetic
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    # The row of question texts makes pandas warn about mixed types
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+@pytest.fixture
+def synthetic_datafile(tmp_path, columndictionary):
+    # 12 made-up participants with blank and prefer not to answer answers in every battery
+    datafile = str(tmp_path / 'export.csv')
+    synthetic.write_export(datafile, columndictionary, 12, seed=2, blank_rate=0.1, pna_rate=0.05)
+    return datafile
+
+
+def answers(df):
+    # Every answer as a number, blank answers as NaN
+    return df.drop('SUBJ_ID', axis=1).apply(pd.to_numeric, errors='coerce').astype('float64')
+
+
+def read_chunks(datafile, columndictionary, chunksize, compact=False):
+    chunks, question_dict, nonresp = reader.chunked_reader(datafile, columndictionary, chunksize, compact)
+    return list(chunks), question_dict, nonresp
+
+
+@pytest.mark.parametrize('chunksize', [1, 2, 4, 100])
+@pytest.mark.parametrize('data', ['datafile', 'synthetic_datafile'])
+def test_chunks_add_up_to_the_reader(request, columndictionary, chunksize, data):
+    datafile = request.getfixturevalue(data)
+    df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, columndictionary)
+    chunks, chunk_question_dict, chunk_nonresp = read_chunks(datafile, columndictionary, chunksize)
+
+    # the row of question texts is left out of the first chunk, so it has one row less
+    assert [len(chunk) for chunk in chunks[1:-1]] == [chunksize] * (len(chunks) - 2)
+    assert len(chunks[0]) == min(chunksize - 1, len(df))
+    combined = pd.concat(chunks)
+    assert list(combined.index) == list(range(1, len(df) + 1))
+    # The question texts make reader read every answer as text, while the chunks after the first read them as numbers
+    pd.testing.assert_frame_equal(answers(combined), answers(df))
+    assert list(combined['SUBJ_ID']) == list(df['SUBJ_ID'])
+    pd.testing.assert_frame_equal(chunk_question_dict, question_dict)
+    pd.testing.assert_series_equal(pd.Series(chunk_nonresp), pd.Series(nonresp))
+
+
+@pytest.mark.parametrize('data', ['datafile', 'synthetic_datafile'])
+def test_compact_reads_the_same_answers(request, columndictionary, data):
+    datafile = request.getfixturevalue(data)
+    df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, columndictionary)
+    compact, compact_raw, compact_question_dict, compact_nonresp = reader.reader(datafile, columndictionary,
+                                                                                 compact=True)
+    assert list(compact.index) == list(df.index) == list(range(1, len(df) + 1))
+    assert list(compact.columns) == list(df.columns)
+    pd.testing.assert_frame_equal(answers(compact), answers(df))
+    assert list(compact['SUBJ_ID']) == list(df['SUBJ_ID'])
+    assert set(compact_raw.columns) <= set(question_dict['COLUMN_NAME'])
+
+    # Whole number answers are stored as nullable whole numbers, with the blank answers still blank
+    whole = [column for column in compact.columns if str(compact[column].dtype).startswith('Int')]
+    assert len(whole) > 500
+    assert compact[whole].isnull().values.sum() > 0
+    assert (compact[whole].isnull().values == answers(df)[whole].isnull().values).all()
+
+
+@pytest.mark.parametrize('chunksize', [2, 5, 100])
+@pytest.mark.parametrize('data', ['datafile', 'synthetic_datafile'])
+def test_compact_chunks_add_up_to_the_compact_reader(request, columndictionary, chunksize, data):
+    datafile = request.getfixturevalue(data)
+    compact = reader.reader(datafile, columndictionary, compact=True)[0]
+    chunks = read_chunks(datafile, columndictionary, chunksize, compact=True)[0]
+    pd.testing.assert_frame_equal(pd.concat(chunks), compact)
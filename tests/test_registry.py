@@ -0,0 +1,131 @@
+"""
+Registering scales from .json and .toml specs, and the specs register turns down.
+"""
+
+import copy
+import json
+
+import pandas as pd
+import pytest
+
+from batteryscores import registry
+from batteryscores import scoreall
+
+GRIT = {'name': 'GRIT', 'script': 'grit', 'nonresp': 'grit', 'range': [1, 5], 'reverse': 6,
+        'subscales': [{'name': 'consistency', 'forward': ['grit_1', 'grit_2'], 'reverse': ['grit_3']},
+                      {'name': 'perseverance', 'forward': ['grit_4', 'grit_5', 'grit_6'], 'missing': 'mean'}],
+        'totals': [{'of': [['consistency', 1], ['perseverance', 1]], 'divisor': 2,
+                    'columns': {'score': 'GRIT_Score', 'blank': 'GRIT_Left_Blank',
+                                'pna': 'GRIT_Prefer_Not_to_Answer'}}]}
+
+GRIT_TOML = """
+name = "GRIT"
+script = "grit"
+nonresp = "grit"
+range = [1, 5]
+reverse = 6
+
+[[subscales]]
+name = "consistency"
+forward = ["grit_1", "grit_2"]
+reverse = ["grit_3"]
+
+[[subscales]]
+name = "perseverance"
+forward = ["grit_4", "grit_5", "grit_6"]
+missing = "mean"
+
+[[totals]]
+of = [["consistency", 1], ["perseverance", 1]]
+divisor = 2
+columns = {score = "GRIT_Score", blank = "GRIT_Left_Blank", pna = "GRIT_Prefer_Not_to_Answer"}
+"""
+
+
+@pytest.fixture(autouse=True)
+def registered():
+    # Every test starts and ends with only the scales that were registered before it
+    before = dict(registry.SCALES)
+    yield
+    registry.SCALES.clear()
+    registry.SCALES.update(before)
+
+
+@pytest.fixture
+def answers():
+    # Participant 1 answers 3 everywhere, participant 2 leaves grit_5 blank and prefers not to answer grit_6
+    return pd.DataFrame({'grit_1': [3, 4], 'grit_2': [3, 4], 'grit_3': [3, 2], 'grit_4': [3, 5], 'grit_5': [3, None],
+                         'grit_6': [3, 7]}, index=[1, 2])
+
+
+def write_json(path, spec):
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+
+def test_register_json(tmp_path, answers):
+    assert registry.register_file(write_json(tmp_path / 'grit.json', GRIT)) == 'grit'
+    assert 'grit' in scoreall.battery_names()
+    result = registry.score('grit', answers, {'grit': 7})
+    # consistency 3 + 3 + (6 - 3), perseverance (3 + 3 + 3) / 3, total (9 + 3) / 2
+    assert result.loc[1, 'GRIT_Score'] == 6
+    # perseverance is the sum of the answered items divided by all 3: 5 / 3
+    assert result.loc[2, 'GRIT_Score'] == pytest.approx((4 + 4 + 4 + 5 / 3.0) / 2)
+    assert result.loc[2, 'GRIT_Left_Blank'] == 1
+    assert result.loc[2, 'GRIT_Prefer_Not_to_Answer'] == 1
+    pd.testing.assert_frame_equal(scoreall.score_all(answers, {'grit': 7}, batteries=['grit']), result)
+
+
+def test_register_toml_is_the_same_as_json(tmp_path, answers):
+    pytest.importorskip('tomllib')
+    (tmp_path / 'grit.toml').write_text(GRIT_TOML)
+    assert registry.register_file(str(tmp_path / 'grit.toml')) == 'grit'
+    assert registry.SCALES['grit']['spec'] == dict(GRIT)
+    from_toml = registry.score('grit', answers, {'grit': 7})
+    registry.register_file(write_json(tmp_path / 'grit.json', GRIT))
+    pd.testing.assert_frame_equal(from_toml, registry.score('grit', answers, {'grit': 7}))
+
+
+def test_register_folder(tmp_path):
+    pytest.importorskip('tomllib')
+    other = copy.deepcopy(GRIT)
+    other['name'], other['script'] = 'GRITS', 'grits'
+    write_json(tmp_path / 'b.json', other)
+    (tmp_path / 'a.toml').write_text(GRIT_TOML)
+    (tmp_path / 'notes.txt').write_text('not a spec')
+    assert registry.register_folder(str(tmp_path)) == ['grit', 'grits']
+    assert registry.names()[-2:] == ['grit', 'grits']
+    registry.unregister('grit')
+    assert 'grit' not in registry.names()
+
+
+def broken(change):
+    spec = copy.deepcopy(GRIT)
+    change(spec)
+    return spec
+
+
+@pytest.mark.parametrize('spec, message', [
+    (broken(lambda spec: spec.pop('range')), "has no 'range'"),
+    (broken(lambda spec: spec.pop('subscales')), "has no 'subscales'"),
+    (broken(lambda spec: spec.update(name='', script='')), "needs a 'name'"),
+    (broken(lambda spec: spec.update(script='tci')), 'already a battery'),
+    (broken(lambda spec: spec.update(range=[1, 3, 5])), '[min, max]'),
+    (broken(lambda spec: spec['subscales'][0].update(forward=[], reverse=[])), 'has no items'),
+    (broken(lambda spec: spec.pop('reverse')), "no 'reverse' number"),
+    (broken(lambda spec: spec['subscales'][1].update(missing='median')), 'has to be one of'),
+    (broken(lambda spec: spec['totals'][0].update(of=[['grit', 1]])), 'not one of its subscales'),
+])
+def test_malformed_specs_are_rejected(tmp_path, spec, message):
+    path = write_json(tmp_path / 'grit.json', spec)
+    with pytest.raises(ValueError) as error:
+        registry.register_file(path)
+    assert message in str(error.value)
+    assert path in str(error.value)
+    assert 'grit' not in registry.names()
+
+
+def test_file_that_is_not_json(tmp_path):
+    (tmp_path / 'grit.json').write_text('{"name": "GRIT",')
+    with pytest.raises(ValueError):
+        registry.register_file(str(tmp_path / 'grit.json'))
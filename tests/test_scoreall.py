@@ -0,0 +1,38 @@
+import warnings
+
+import pytest
+
+from batteryscores import reader
+from batteryscores import scoreall
+
+
+@pytest.fixture
+def sample(datafile, columndictionary):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, columndictionary)
+    return df, nonresp
+
+
+def test_score_sharded_without_participants_matches_score_all(sample):
+    df, nonresp = sample
+    empty = df.iloc[:0]
+    expected = scoreall.score_all(empty, nonresp)
+    result = scoreall.score_sharded(empty, nonresp, jobs=2)
+    assert result.shape == expected.shape == (0, expected.shape[1])
+    assert list(result.columns) == list(expected.columns)
+
+
+def test_score_sharded_when_everyone_is_quarantined(sample):
+    df, nonresp = sample
+    df = df.copy()
+    df['tci_1'] = 9
+    result, rejects = scoreall.score_sharded(df, nonresp, batteries=['tci'], jobs=2, quarantine=True)
+    assert len(result) == 0
+    assert len(rejects) == len(df)
+
+
+def test_score_sharded_needs_a_worker(sample):
+    df, nonresp = sample
+    with pytest.raises(ValueError):
+        scoreall.score_sharded(df, nonresp, jobs=0)
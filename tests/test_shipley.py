@@ -0,0 +1,47 @@
+"""
+The packed Shipley answers have to give the same scores as score_items, and stop at the same bad answers.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batteryscores import engine
+from batteryscores import shipley
+
+
+@pytest.fixture
+def answers():
+    # 30 participants answering 1-4 with some blanks, and everything right or blank for the last one
+    random = np.random.RandomState(3)
+    values = random.randint(1, 5, size=(30, 40)).astype(np.float64)
+    values[random.random_sample(values.shape) < 0.1] = np.nan
+    values[-1] = shipley.ANSWER_KEY
+    values[-1, :5] = np.nan
+    return pd.DataFrame(values, columns=shipley.SHIPLEY_KEYS, index=range(1, 31))
+
+
+def test_packed_scores_match_score_items(answers):
+    values = engine.numeric_block(answers, shipley.SHIPLEY_KEYS)
+    correct, blank = shipley.pack_answers(values)
+    assert correct.shape == blank.shape == (30, 5)
+    result = shipley.score_packed(correct, blank, answers.index)
+    pd.testing.assert_frame_equal(result, shipley.score_items(values, answers.index, None))
+    assert result.loc[30, 'Shipley2_Score'] == 35 + 5 / 4.0
+
+
+@pytest.mark.parametrize('bad', [0, 5, 9])
+def test_packing_stops_at_answers_out_of_range(answers, bad):
+    answers.loc[4, 'Shipley2_7'] = bad
+    values = engine.numeric_block(answers, shipley.SHIPLEY_KEYS)
+    with pytest.raises(SystemExit):
+        shipley.score_items(values, answers.index, None)
+    with pytest.raises(SystemExit):
+        shipley.pack_answers(values)
+
+
+def test_strings_stop_before_packing(answers):
+    answers = answers.astype(object)
+    answers.loc[4, 'Shipley2_7'] = 'b'
+    with pytest.raises(ValueError):
+        engine.numeric_block(answers, shipley.SHIPLEY_KEYS)
@@ -0,0 +1,111 @@
+"""
+What validate does with the bad answers under every policy, and what quarantine puts aside.
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from batteryscores import reader
+from batteryscores import scoreall
+from batteryscores import validate
+
+
+@pytest.fixture
+def sample(datafile, columndictionary):
+    # Participants 2 and 4 have bad answers: tci runs from 1 to 5 with 6 for prefer not to answer, barratt from 1 to 4
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        df, raw_data_frame, question_dict, nonresp = reader.reader(datafile, columndictionary)
+    df = df.copy()
+    df['tci_1'] = 3.0
+    df.loc[2, 'tci_1'] = 9
+    df.loc[2, 'barratt_1'] = 0
+    df['tci_2'] = df['tci_2'].astype(object)
+    df.loc[4, 'tci_2'] = 'x'
+    df.loc[5, 'tci_3'] = 6
+    return df, nonresp
+
+
+def test_report_lists_every_bad_answer(sample):
+    df, nonresp = sample
+    cleaned, report = validate.validate(df, nonresp, policy='null')
+    assert list(report.columns) == validate.REPORT_COLUMNS
+    assert sorted(map(tuple, report.values.tolist())) == [('barratt', 'barratt_1', 2, 0), ('tci', 'tci_1', 2, 9),
+                                                          ('tci', 'tci_2', 4, 'x')]
+
+
+def test_abort_stops_with_every_bad_answer(sample):
+    df, nonresp = sample
+    with pytest.raises(SystemExit) as stop:
+        validate.validate(df, nonresp)
+    assert 'We found 3 values' in str(stop.value.code)
+    for column in ['barratt_1', 'tci_1', 'tci_2']:
+        assert column in str(stop.value.code)
+
+
+def test_abort_without_bad_answers_changes_nothing(sample):
+    df, nonresp = sample
+    cleaned, report = validate.validate(df, nonresp, batteries=['bisbas'])
+    assert cleaned is df
+    assert len(report) == 0
+
+
+def test_null_blanks_only_the_bad_answers(sample):
+    df, nonresp = sample
+    before = df.copy()
+    cleaned, report = validate.validate(df, nonresp, policy='null')
+    pd.testing.assert_frame_equal(df, before)
+    assert list(cleaned.index) == list(df.index)
+    assert np.isnan(cleaned.loc[2, 'tci_1']) and np.isnan(cleaned.loc[2, 'barratt_1'])
+    assert pd.isnull(cleaned.loc[4, 'tci_2'])
+    # prefer not to answer is not a bad answer
+    assert cleaned.loc[5, 'tci_3'] == 6
+    # and nothing else changed
+    same = (cleaned == df) | (cleaned.isnull() & df.isnull())
+    changed = same.stack()
+    assert sorted(changed.index[~changed.values]) == [(2, 'barratt_1'), (2, 'tci_1'), (4, 'tci_2')]
+
+
+def test_drop_takes_out_the_participants(sample):
+    df, nonresp = sample
+    cleaned, report = validate.validate(df, nonresp, policy='drop')
+    assert list(cleaned.index) == [1, 3, 5]
+    pd.testing.assert_frame_equal(cleaned, df.loc[[1, 3, 5]])
+    assert len(report) == 3
+
+
+def test_unknown_policy(sample):
+    df, nonresp = sample
+    with pytest.raises(ValueError):
+        validate.validate(df, nonresp, policy='ignore')
+
+
+def test_quarantine_puts_the_participants_aside(sample):
+    df, nonresp = sample
+    kept, rejects = validate.quarantine(df, nonresp)
+    assert list(kept.index) == [1, 3, 5]
+    pd.testing.assert_frame_equal(kept, df.loc[[1, 3, 5]])
+    assert list(rejects.index) == [2, 4]
+    pd.testing.assert_frame_equal(rejects.drop('REJECT_REASONS', axis=1), df.loc[[2, 4]])
+    # in the order of the batteries, then the questions
+    assert list(rejects['REJECT_REASONS']) == ['barratt_1 = 0.0 (barratt); tci_1 = 9.0 (tci)', 'tci_2 = x (tci)']
+
+
+def test_quarantine_without_bad_answers(sample):
+    df, nonresp = sample
+    kept, rejects = validate.quarantine(df, nonresp, batteries=['bisbas'])
+    assert list(kept.index) == list(df.index)
+    assert len(rejects) == 0
+    assert 'REJECT_REASONS' in rejects.columns
+
+
+def test_score_all_with_quarantine(sample):
+    df, nonresp = sample
+    result, rejects = scoreall.score_all(df, nonresp, batteries=['barratt', 'tci'], quarantine=True)
+    kept, expected_rejects = validate.quarantine(df, nonresp, batteries=['barratt', 'tci'])
+    pd.testing.assert_frame_equal(result, scoreall.score_all(kept, nonresp, batteries=['barratt', 'tci']))
+    pd.testing.assert_frame_equal(rejects, expected_rejects)
+    assert list(result.index) == [1, 3, 5]
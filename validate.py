@@ -0,0 +1,149 @@
+#!/usr/bin/python
+
+"""
+Battery Scores Package for Processing Qualtrics CSV Files
+
+@author: Bradley Wise
+@email: bradley.wise@yale.edu
+@version: 1.1
+@date: 2026.10.17
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from . import scoreall
+
+
+"""
+1. Every self-report function stops the whole program (sys.exit) as soon as it finds an answer that is out of range,
+so a big batch job can die after hours of work because of one typo. validate looks at the batteries you are about to
+score BEFORE scoring them and finds every bad answer at once:
+
+    df, report = validate.validate(df, nonresp, policy='null')
+    result = scoreall.score_all(df, nonresp)
+
+2. The report is a dataframe with one row per bad answer:
+
+    battery     the battery's script, e.g. 'tci'
+    column      the question, e.g. 'tci_36'
+    row         the row index of the participant in your dataframe
+    value       the answer that was found
+
+An answer is bad when it is out of the battery's range and not the Prefer Not To Answer choice (exactly the answers
+that would stop the program), or when it has strings/letters in it.
+
+3. policy says what to do with the bad answers:
+
+    'abort'  stop the program like the self-report functions do, but with every bad answer listed (the default)
+    'null'   make every bad answer blank, so it is counted as left blank and the rest of the participant is still scored
+    'drop'   take every participant with a bad answer out of the dataframe
+
+The dataframe you get back has the bad answers nulled or dropped. Your own dataframe is never changed.
+
+4. Batteries whose headers are missing from your dataset are skipped here. Their self-report function tells you about it.
+Give plans=columndict.compile_plans(question_dict) to check the ranges and Prefer Not To Answer choices of your column
+dictionary instead of the batteries' own (see columndict.py).
+
+5. For nightly batch jobs, quarantine puts every participant with a bad answer aside instead of stopping:
+
+    df, rejects = validate.quarantine(df, nonresp)
+    rejects.to_csv(file_name_for_rejects)
+
+rejects holds those participants' rows of your dataframe plus a REJECT_REASONS column, e.g.
+'tci_36 = 9 (tci); QIDS_2 = 7 (qids)'. Everyone else can then be scored at full speed, and nobody is scored with a bad
+answer. score_all(df, nonresp, quarantine=True) does both steps for you and returns (result, rejects).
+"""
+
+POLICIES = ['abort', 'null', 'drop']
+
+REPORT_COLUMNS = ['battery', 'column', 'row', 'value']
+
+
+def validate(input, nonresp, batteries=None, policy='abort', plans=None):
+    # input = the dataframe from the reader, nonresp = the Prefer Not To Answer values from the reader
+    if policy not in POLICIES:
+        raise ValueError("policy has to be one of %s, not %r" % (', '.join(POLICIES), policy))
+    report, found, badrows = find_invalid(input, nonresp, batteries, plans)
+    report = report[REPORT_COLUMNS]
+
+    if policy == 'abort' and len(report):
+        sys.exit("We found %d values that don't match parameter values for calculation in your dataset "
+                 "(see each battery's script for its values):\n%s" % (len(report), report.to_string(index=False)))
+    if policy == 'drop':
+        return input[~badrows], report
+    if policy == 'null' and found:
+        cleaned = input.copy()
+        for items, invalid in found:
+            for column in np.nonzero(invalid.any(axis=0))[0]:
+                cleaned[items[column]] = cleaned[items[column]].where(~invalid[:, column])
+        return cleaned, report
+    return input, report
+
+
+def quarantine(input, nonresp, batteries=None, plans=None):
+    # Splits your dataframe in two (see 5. above): the participants without bad answers, and the rejects with a
+    # REJECT_REASONS column that lists every bad answer as question = value (battery)
+    report, found, badrows = find_invalid(input, nonresp, batteries, plans)
+    rejects = input[badrows].copy()
+
+    reasons = [[] for position in range(len(input))]
+    for battery, column, position, value in zip(report['battery'], report['column'], report['position'],
+                                                report['value']):
+        reasons[position].append('%s = %s (%s)' % (column, value, battery))
+    rejects['REJECT_REASONS'] = ['; '.join(reasons[position]) for position in np.nonzero(badrows)[0]]
+
+    return input[~badrows], rejects
+
+
+def find_invalid(input, nonresp, batteries=None, plans=None):
+    # Returns the report (plus the position of each bad answer's row), the (items, True/False for every bad answer) of
+    # every battery that has bad answers, and True/False for every participant that has at least one bad answer
+    if batteries is None:
+        batteries = scoreall.battery_names()
+
+    report, found = [], []
+    badrows = np.zeros(len(input), dtype=bool)
+    plans = scoreall.battery_plans(batteries, plans)
+    for name in batteries:
+        plan = plans[name]
+        items = plan['items']
+        if not all(item in input.columns for item in items):
+            continue
+        invalid = invalid_answers(plan, input[items], nonresp)
+        if invalid is None or not invalid.any():
+            continue
+
+        rows, columns = np.nonzero(invalid)
+        raw = input[items].values
+        report.append(pd.DataFrame({'battery': name,
+                                    'column': [items[column] for column in columns],
+                                    'row': input.index[rows],
+                                    'value': raw[rows, columns],
+                                    'position': rows}, columns=REPORT_COLUMNS + ['position']))
+        found.append((items, invalid))
+        badrows |= invalid.any(axis=1)
+
+    if report:
+        report = pd.concat(report, ignore_index=True)
+    else:
+        report = pd.DataFrame([], columns=REPORT_COLUMNS + ['position'])
+    return report, found, badrows
+
+
+def invalid_answers(plan, answers, nonresp):
+    # True/False for every answer of one battery: out of range (see engine.invalid_cells) or strings/letters.
+    # None if the battery's Prefer Not To Answer value is not in nonresp, which its self-report function tells you about.
+    if all(pd.api.types.is_numeric_dtype(dtype) for dtype in answers.dtypes):
+        numeric = answers
+        strings = np.zeros(answers.shape, dtype=bool)
+    else:
+        numeric = answers.apply(pd.to_numeric, errors='coerce')
+        strings = (numeric.isnull() & answers.notnull()).values
+    try:
+        return engine.invalid_cells(plan, numeric.astype('float64').values, nonresp) | strings
+    except KeyError:
+        return None